@@ -0,0 +1,270 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Módulo que guarda las operaciones de dibujo de los párrafos de cada pregunta,
+direccionadas por su contenido, para que las versiones de un lote (y, con la
+caché en disco, los lotes siguientes) no vuelvan a dibujar los mismos bloques
+"""
+
+import json
+import sqlite3
+import hashlib
+import weakref
+import threading
+from collections import OrderedDict
+from reportlab import Version as VERSION_REPORTLAB
+from reportlab.pdfbase import pdfmetrics
+from controller.manifiesto import VERSION_MAQUETACION
+
+# Cantidad de párrafos dibujados que se conservan en memoria por proceso
+LIMITE_ENTRADAS = 50000
+
+# Cantidad de entradas nuevas a partir de la cual se escriben en el disco
+LOTE_ESCRITURA = 500
+
+_lock = threading.Lock()
+_memoria = OrderedDict()
+_huellas_estilo = weakref.WeakKeyDictionary()
+_disco = None
+
+class _CacheDisco:
+    """
+    Caché de bloques dibujados en un archivo SQLite compartido entre procesos
+    
+    Es solo un acelerador: si el archivo está ocupado por otro proceso o no se
+    puede escribir, las entradas simplemente se vuelven a dibujar.
+    
+    Las entradas se guardan como texto JSON (listas de cadenas), nunca como
+    objetos serializados: un archivo compartido o modificado por otra persona
+    solo puede aportar operaciones de dibujo, no código.
+    """
+    
+    def __init__(self, ruta):
+        """
+        Constructor de la clase _CacheDisco
+        
+        Args:
+            ruta (str): Archivo de la caché; se crea si no existe
+        """
+        self.ruta = ruta
+        self.pendientes = {}
+        # Varios hilos pueden dibujar a la vez: uno protege las entradas pendientes
+        # y otro la conexión, que todos comparten
+        self._lock = threading.Lock()
+        self._lock_conexion = threading.Lock()
+        self._conexion = sqlite3.connect(ruta, timeout=5, check_same_thread=False)
+        self._conexion.execute(
+            "CREATE TABLE IF NOT EXISTS bloques_json (clave TEXT PRIMARY KEY, datos TEXT NOT NULL)"
+        )
+        self._conexion.commit()
+    
+    def leer(self, clave):
+        """
+        Busca una entrada en el archivo
+        
+        Returns:
+            tuple: Entrada guardada o None si no existe
+        """
+        with self._lock:
+            entrada = self.pendientes.get(clave)
+        if entrada is not None:
+            return entrada
+        try:
+            with self._lock_conexion:
+                fila = self._conexion.execute(
+                    "SELECT datos FROM bloques_json WHERE clave = ?", (clave,)
+                ).fetchone()
+        except sqlite3.Error:
+            return None
+        return _decodificar(fila[0]) if fila else None
+    
+    def agregar(self, clave, entrada):
+        """
+        Anota una entrada nueva; se escribe junto con las demás en guardar()
+        """
+        with self._lock:
+            self.pendientes[clave] = entrada
+            lleno = len(self.pendientes) >= LOTE_ESCRITURA
+        if lleno:
+            self.guardar()
+    
+    def guardar(self):
+        """
+        Escribe las entradas pendientes en una sola transacción
+        """
+        with self._lock:
+            if not self.pendientes:
+                return
+            pendientes, self.pendientes = self.pendientes, {}
+        filas = [(clave, json.dumps(entrada)) for clave, entrada in pendientes.items()]
+        try:
+            with self._lock_conexion, self._conexion:
+                self._conexion.executemany(
+                    "INSERT OR IGNORE INTO bloques_json (clave, datos) VALUES (?, ?)", filas
+                )
+        except sqlite3.Error as e:
+            print(f"No se pudo actualizar la caché de bloques: {e}")
+    
+    def cerrar(self):
+        """
+        Escribe lo pendiente y cierra el archivo
+        """
+        self.guardar()
+        with self._lock_conexion:
+            self._conexion.close()
+
+def _decodificar(datos):
+    """
+    Reconstruye una entrada guardada en el disco, verificando que solo tenga texto
+    
+    Args:
+        datos (str): Entrada en JSON: [operaciones, [[fuente, nombre], ...]]
+    
+    Returns:
+        tuple: (operaciones, fuentes) o None si la entrada no tiene ese formato
+    """
+    try:
+        operaciones, fuentes = json.loads(datos)
+    except (TypeError, ValueError):
+        return None
+    if not (isinstance(operaciones, list) and isinstance(fuentes, list)
+            and all(isinstance(operacion, str) for operacion in operaciones)
+            and all(isinstance(pareja, list) and len(pareja) == 2
+                    and all(isinstance(valor, str) for valor in pareja) for pareja in fuentes)):
+        return None
+    return tuple(operaciones), tuple(tuple(pareja) for pareja in fuentes)
+
+def huella_estilo(estilo):
+    """
+    Huella de los atributos de un estilo, para que cambiar un estilo invalide sus entradas
+    
+    Dos estilos con los mismos atributos tienen la misma huella, así que las cachés
+    que la usan sobreviven a que cada documento cree sus propios estilos (ver
+    controller.recursos_render.obtener_estilos). La huella se calcula una vez por
+    objeto y se olvida cuando el estilo deja de usarse.
+    
+    Returns:
+        str: Huella del estilo
+    """
+    huella = _huellas_estilo.get(estilo)
+    if huella is None:
+        atributos = sorted((nombre, repr(valor)) for nombre, valor in estilo.__dict__.items()
+                           if nombre != 'parent')
+        huella = hashlib.sha256(repr(atributos).encode('utf-8')).hexdigest()[:16]
+        _huellas_estilo[estilo] = huella
+    return huella
+
+def clave_bloque(texto, prefijo, estilo, ancho_lineas, ancho, alto):
+    """
+    Clave de un párrafo dibujado, que depende solo de lo que se ve en el papel
+    
+    El texto se direcciona por su contenido, así que la misma pregunta en otra
+    posición del banco o con otro id reutiliza la entrada. El prefijo es la letra
+    de la alternativa (o el número de la pregunta), que junto con el texto
+    identifica en qué posición de la permutación quedó cada alternativa.
+    
+    Args:
+        texto (str): Texto del párrafo sin el prefijo
+        prefijo (str): Número de la pregunta o letra de la alternativa
+        estilo (ParagraphStyle): Estilo del párrafo
+        ancho_lineas: Ancho (o anchos) con que se dividió en líneas
+        ancho (float): Ancho del párrafo maquetado
+        alto (float): Alto del párrafo maquetado
+    
+    Returns:
+        str: Clave SHA-256 en hexadecimal
+    """
+    clave = repr((VERSION_MAQUETACION, VERSION_REPORTLAB, huella_estilo(estilo), prefijo, texto,
+                  ancho_lineas, ancho, alto))
+    return hashlib.sha256(clave.encode('utf-8')).hexdigest()
+
+def fuentes_reutilizables(fuentes):
+    """
+    Indica si las operaciones dibujadas con estas fuentes pueden copiarse a otro documento
+    
+    Las fuentes TrueType se incrustan en subconjuntos que dependen de lo que ya
+    dibujó cada documento, así que esos párrafos no se guardan.
+    
+    Args:
+        fuentes (iterable): Nombres de las fuentes usadas
+    
+    Returns:
+        bool: True si todas las fuentes son estándar
+    """
+    return all(not pdfmetrics.getFont(fuente)._dynamicFont for fuente in fuentes)
+
+def obtener_bloque(clave):
+    """
+    Busca un párrafo ya dibujado, primero en memoria y después en el disco
+    
+    Returns:
+        tuple: (operaciones, fuentes) o None si nunca se dibujó
+    """
+    with _lock:
+        entrada = _memoria.get(clave)
+        if entrada is not None:
+            _memoria.move_to_end(clave)
+            return entrada
+    
+    if _disco is not None:
+        entrada = _disco.leer(clave)
+        if entrada is not None:
+            _recordar(clave, entrada)
+        return entrada
+    return None
+
+def guardar_bloque(clave, operaciones, fuentes):
+    """
+    Guarda las operaciones de dibujo de un párrafo
+    
+    Args:
+        clave (str): Clave calculada con clave_bloque()
+        operaciones (list): Operaciones PDF que el párrafo agregó al canvas
+        fuentes (iterable): Parejas (fuente, nombre interno en el documento) en el
+            orden en que las operaciones las seleccionan
+    """
+    entrada = (tuple(operaciones), tuple(fuentes))
+    _recordar(clave, entrada)
+    if _disco is not None:
+        _disco.agregar(clave, entrada)
+
+def _recordar(clave, entrada):
+    """
+    Agrega una entrada a la caché en memoria descartando la usada hace más tiempo
+    """
+    with _lock:
+        _memoria[clave] = entrada
+        _memoria.move_to_end(clave)
+        if len(_memoria) > LIMITE_ENTRADAS:
+            _memoria.popitem(last=False)
+
+def configurar_disco(ruta):
+    """
+    Usa (o deja de usar) un archivo como segundo nivel de la caché
+    
+    Args:
+        ruta (str): Archivo SQLite de la caché, o None para usar solo la memoria
+    """
+    global _disco
+    with _lock:
+        if _disco is not None and _disco.ruta == ruta:
+            return
+        anterior, _disco = _disco, (_CacheDisco(ruta) if ruta else None)
+    if anterior is not None:
+        anterior.cerrar()
+
+def guardar_disco():
+    """
+    Escribe en el disco los párrafos dibujados desde la última vez
+    """
+    if _disco is not None:
+        _disco.guardar()
+
+def reiniciar_cache_bloques():
+    """
+    Descarta los párrafos dibujados que se guardan en memoria
+    """
+    with _lock:
+        _memoria.clear()
+        _huellas_estilo.clear()
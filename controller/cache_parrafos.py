@@ -0,0 +1,272 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Módulo que guarda, por proceso, el análisis del marcado de los enunciados y
+alternativas y la división en líneas de cada párrafo, para que todas las
+versiones de un lote los reutilicen
+"""
+
+import re
+import copy
+import threading
+from reportlab import Version as VERSION_REPORTLAB
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from reportlab.platypus import Paragraph
+from reportlab.platypus.paraparser import ParaParser
+from reportlab.platypus.paragraph import cleanBlockQuotedText
+from controller.cache_bloques import (
+    clave_bloque, huella_estilo, fuentes_reutilizables, obtener_bloque, guardar_bloque,
+    reiniciar_cache_bloques
+)
+
+# Cantidad de entradas a partir de la cual se vacía cada caché, para que un
+# banco muy grande no haga crecer la memoria sin límite
+LIMITE_ENTRADAS = 100000
+
+# Operador PDF que selecciona una fuente por su nombre interno ("/F1 10 Tf")
+_SELECCION_FUENTE = re.compile(r'(/F\d+) \S+ Tf')
+
+# Versiones de ReportLab en que se verificó la estructura interna del canvas
+# (canvas._code y canvas._doc) sobre la que se copian los dibujos guardados;
+# con cualquier otra, los párrafos se dibujan siempre con Paragraph.draw()
+VERSIONES_REPORTLAB_PROBADAS = ('3.5.', '3.6.')
+
+_lock = threading.Lock()
+_fragmentos = {}
+_base = {}
+_lineas = {}
+
+def _analizar(texto, estilo):
+    """
+    Analiza el mini-marcado de ReportLab de un texto, igual que Paragraph()
+
+    Returns:
+        list: Fragmentos del texto
+    """
+    parser = ParaParser()
+    _, fragmentos, _ = parser.parse(cleanBlockQuotedText(texto), estilo)
+    if fragmentos is None:
+        raise ValueError(f"Error de marcado ({parser.errors[0]}) en el texto: {texto[:30]!r}")
+    return fragmentos
+
+def _guardar(cache, clave, valor):
+    """
+    Guarda un valor en una de las cachés, vaciándola si llegó al límite
+    """
+    if len(cache) >= LIMITE_ENTRADAS:
+        with _lock:
+            cache.clear()
+    cache[clave] = valor
+
+def _atributos(fragmento):
+    """
+    Atributos de formato de un fragmento, sin su texto
+
+    Returns:
+        dict: Atributos del fragmento
+    """
+    atributos = dict(fragmento.__dict__)
+    atributos.pop('text', None)
+    return atributos
+
+def _fragmento_base(estilo):
+    """
+    Fragmento de texto sin marcado con el formato del estilo
+
+    Returns:
+        ParaFrag: Fragmento de referencia del estilo
+    """
+    clave = huella_estilo(estilo)
+    fragmento = _base.get(clave)
+    if fragmento is None:
+        fragmento = _analizar("x", estilo)[0]
+        _guardar(_base, clave, fragmento)
+    return fragmento
+
+def _fragmentos_texto(texto, estilo):
+    """
+    Fragmentos de un enunciado o alternativa, analizándolo solo la primera vez
+
+    Returns:
+        list: Fragmentos del texto (no deben modificarse)
+    """
+    clave = (texto, huella_estilo(estilo))
+    fragmentos = _fragmentos.get(clave)
+    if fragmentos is None:
+        fragmentos = _analizar(texto, estilo)
+        _guardar(_fragmentos, clave, fragmentos)
+    return fragmentos
+
+class ParrafoCacheado(Paragraph):
+    """
+    Paragraph que reutiliza la división en líneas de otro párrafo con el mismo texto
+
+    La división se guarda por texto, estilo, ancho del prefijo y anchos de columna.
+    Si el prefijo cambia pero mide lo mismo (por ejemplo "7. " y "8. "), las líneas
+    son las mismas y solo se reemplaza la primera palabra. Los trozos que resultan
+    de partir el párrafo entre columnas se dividen de la forma habitual.
+
+    El dibujo del párrafo entero también se reutiliza (ver controller.cache_bloques).
+    """
+
+    _clave_lineas = None
+    _prefijo = None
+    _ancho_lineas = None
+    _reutilizable = False
+
+    def breakLines(self, width):
+        if self._clave_lineas is None:
+            return Paragraph.breakLines(self, width)
+
+        self._ancho_lineas = tuple(width) if isinstance(width, (list, tuple)) else width
+
+        clave = (self._clave_lineas, self._ancho_lineas)
+        guardado = _lineas.get(clave)
+        if guardado is not None:
+            prefijo, blPara, ancho_maximo = guardado
+            if prefijo != self._prefijo:
+                blPara = self._cambiar_prefijo(blPara, prefijo)
+            if blPara is not None:
+                self._width_max = ancho_maximo
+                self._splitLongWordCount = self._hyphenations = 0
+                return blPara
+
+        blPara = Paragraph.breakLines(self, width)
+        _guardar(_lineas, clave, (self._prefijo, blPara, self._width_max))
+        return blPara
+
+    def draw(self):
+        canvas = self.canv
+        if self._clave_lineas is None or not self._reutilizable or self.debug or not _copia_posible(canvas):
+            return Paragraph.draw(self)
+
+        clave = clave_bloque(self._clave_lineas[0], self._prefijo, self.style,
+                             self._ancho_lineas, self.width, self.height)
+        guardado = obtener_bloque(clave)
+        if guardado is not None:
+            operaciones, fuentes = guardado
+            # Las operaciones nombran las fuentes como las numeró el documento en
+            # que se dibujaron; se registran en el mismo orden en que las usa el
+            # párrafo y solo se copian si este documento les dio los mismos nombres
+            if all(canvas._doc.getInternalFontName(fuente) == nombre for fuente, nombre in fuentes):
+                canvas._code.extend(operaciones)
+                return
+
+        inicio = len(canvas._code)
+        Paragraph.draw(self)
+
+        fuentes = {self.style.fontName}
+        fuentes.update(getattr(fragmento, 'fontName', self.style.fontName) for fragmento in self.frags)
+        if guardado is None and fuentes_reutilizables(fuentes):
+            operaciones = canvas._code[inicio:]
+            guardar_bloque(clave, operaciones, _fuentes_usadas(canvas, operaciones))
+
+    def _cambiar_prefijo(self, blPara, prefijo):
+        """
+        Copia una división en líneas reemplazando el prefijo de la primera línea
+
+        Solo es posible en párrafos de un único fragmento, cuyas líneas son listas
+        de palabras; en otro caso el párrafo se divide de nuevo.
+
+        Args:
+            blPara (ABag): División guardada
+            prefijo (str): Prefijo con el que se guardó la división
+
+        Returns:
+            ABag: División con el prefijo de este párrafo, o None si no se puede reutilizar
+        """
+        if blPara.kind != 0 or not blPara.lines:
+            return None
+
+        espacio, palabras = blPara.lines[0]
+        if not palabras or palabras[0] != prefijo.strip():
+            return None
+
+        copia = copy.copy(blPara)
+        copia.lines = [(espacio, [self._prefijo.strip()] + palabras[1:])] + blPara.lines[1:]
+        return copia
+
+def _copia_posible(canvas):
+    """
+    Indica si se pueden copiar dibujos guardados en este canvas
+
+    Los dibujos se copian directamente en las operaciones internas del canvas,
+    que no forman parte de la interfaz pública de ReportLab: solo se hace con
+    versiones probadas y si el canvas tiene la forma esperada.
+
+    Args:
+        canvas (Canvas): Canvas en que se dibuja el párrafo
+
+    Returns:
+        bool: True si se pueden copiar y guardar dibujos
+    """
+    documento = getattr(canvas, '_doc', None)
+    return (VERSION_REPORTLAB.startswith(VERSIONES_REPORTLAB_PROBADAS)
+            and isinstance(getattr(canvas, '_code', None), list)
+            and callable(getattr(documento, 'getInternalFontName', None))
+            and isinstance(getattr(documento, 'fontMapping', None), dict))
+
+def _fuentes_usadas(canvas, operaciones):
+    """
+    Fuentes que seleccionan unas operaciones de dibujo, en el orden en que se usan
+
+    Args:
+        canvas (Canvas): Canvas en que se dibujaron
+        operaciones (list): Operaciones PDF agregadas al canvas
+
+    Returns:
+        list: Parejas (fuente, nombre interno en el documento)
+    """
+    nombres = {nombre: fuente for fuente, nombre in canvas._doc.fontMapping.items()}
+    usadas = []
+    for nombre in _SELECCION_FUENTE.findall(" ".join(operaciones)):
+        pareja = (nombres[nombre], nombre)
+        if pareja not in usadas:
+            usadas.append(pareja)
+    return usadas
+
+def parrafo(prefijo, texto, estilo):
+    """
+    Crea el equivalente de Paragraph(prefijo + texto, estilo) sin volver a analizar el texto
+
+    El marcado del texto se analiza una sola vez por proceso; el prefijo (número de
+    la pregunta o letra de la alternativa) se agrega a los fragmentos ya analizados.
+
+    Args:
+        prefijo (str): Texto sin marcado que antecede al texto, terminado en espacio
+        texto (str): Enunciado o alternativa, con el mini-marcado de ReportLab
+        estilo (ParagraphStyle): Estilo del párrafo
+
+    Returns:
+        ParrafoCacheado: Párrafo listo para maquetarse
+    """
+    base = _fragmento_base(estilo)
+    fragmentos = _fragmentos_texto(texto, estilo)
+
+    if fragmentos and _atributos(fragmentos[0]) == _atributos(base):
+        # El texto empieza sin marcado: el prefijo forma parte del mismo fragmento
+        fragmentos = [fragmentos[0].clone(text=prefijo + fragmentos[0].text)] + fragmentos[1:]
+    else:
+        fragmentos = [base.clone(text=prefijo)] + fragmentos
+
+    resultado = ParrafoCacheado(prefijo + texto, estilo, frags=fragmentos)
+    resultado._prefijo = prefijo
+    # Solo se copian dibujos de texto con formato simple (sin enlaces, imágenes ni subrayados)
+    resultado._reutilizable = all(
+        fragmento.__dict__.keys() == base.__dict__.keys() for fragmento in fragmentos
+    )
+    resultado._clave_lineas = (
+        texto, huella_estilo(estilo), stringWidth(prefijo, estilo.fontName, estilo.fontSize)
+    )
+    return resultado
+
+def reiniciar_cache_parrafos():
+    """
+    Descarta los textos analizados y las divisiones en líneas guardadas
+    """
+    with _lock:
+        _fragmentos.clear()
+        _base.clear()
+        _lineas.clear()
+    reiniciar_cache_bloques()
@@ -0,0 +1,284 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Módulo que califica en bloque las hojas de respuestas de los postulantes
+contra las claves exportadas por el generador (ver controller.claves)
+
+Uso: python -m controller.calificador CLAVES RESPUESTAS [--salida RUTA]
+     [--correcta N] [--incorrecta N] [--blanco N]
+
+Las respuestas se leen en CSV (una fila por postulante: su código, el tema, como
+número o con la letra de la portada, y la letra marcada en cada pregunta, vacía
+si la dejó en blanco) o en .npy (una matriz de enteros cuya primera columna es
+el número de tema y el resto las respuestas 0-4, RESPUESTA_BLANCO o
+RESPUESTA_INVALIDA).
+"""
+
+import os
+import sys
+import csv
+import argparse
+import itertools
+from collections import namedtuple
+from model.pregunta import LETRAS_ALTERNATIVAS
+
+# Valor de una pregunta dejada en blanco
+RESPUESTA_BLANCO = -1
+
+# Valor de una marca que no es una sola alternativa (doble marca, borrón, ...)
+RESPUESTA_INVALIDA = len(LETRAS_ALTERNATIVAS)
+
+ResultadoCalificacion = namedtuple(
+    'ResultadoCalificacion',
+    ['postulantes', 'temas', 'correctas', 'incorrectas', 'blancas', 'puntajes']
+)
+
+def _codigos_letras():
+    """
+    Tabla que convierte el código Unicode de una marca en su valor de respuesta
+    
+    Returns:
+        ndarray: Valor (int8) de cada carácter ASCII; el resto son marcas inválidas
+    """
+    import numpy as np
+    
+    tabla = np.full(128, RESPUESTA_INVALIDA, dtype=np.int8)
+    tabla[0] = tabla[ord(' ')] = RESPUESTA_BLANCO
+    for indice, letra in enumerate(LETRAS_ALTERNATIVAS):
+        tabla[ord(letra)] = tabla[ord(letra.upper())] = indice
+    return tabla
+
+def leer_respuestas(ruta):
+    """
+    Lee las respuestas de los postulantes
+    
+    Args:
+        ruta (str): Archivo .csv o .npy
+    
+    Returns:
+        tuple: (postulantes, temas, respuestas) donde postulantes es un arreglo
+            con el código de cada uno (en .npy, su número de fila desde 1), temas
+            el número de tema de cada uno y respuestas una matriz (postulantes,
+            preguntas) de int8
+    """
+    import numpy as np
+    from controller.claves import numero_tema
+    
+    if ruta.lower().endswith(".npy"):
+        datos = np.load(ruta)
+        return (np.arange(1, len(datos) + 1), datos[:, 0].astype(np.int16),
+                datos[:, 1:].astype(np.int8))
+    
+    with open(ruta, newline="", encoding="utf-8") as archivo:
+        encabezado, *filas = list(csv.reader(archivo)) or [["postulante", "tema"]]
+    if not filas:
+        return (np.array([], dtype=str), np.zeros(0, dtype=np.int16),
+                np.zeros((0, len(encabezado) - 2), dtype=np.int8))
+    
+    # El código Unicode de cada marca se traduce con una tabla, sin recorrer las
+    # respuestas de cada postulante en Python; una celda con un segundo carácter
+    # (por ejemplo "ab") es una marca inválida
+    cantidad_preguntas = len(encabezado) - 2
+    if any(len(fila) != cantidad_preguntas + 2 for fila in filas):
+        raise ValueError(f"Hay filas sin las {cantidad_preguntas} respuestas del encabezado: {ruta}")
+    marcas = np.fromiter(itertools.chain.from_iterable(fila[2:] for fila in filas), dtype='U2',
+                         count=len(filas) * cantidad_preguntas)
+    marcas = marcas.view(np.uint32).reshape(len(filas), cantidad_preguntas, 2)
+    respuestas = _codigos_letras()[np.minimum(marcas[:, :, 0], 127)]
+    respuestas[(marcas[:, :, 0] > 127) | (marcas[:, :, 1] != 0)] = RESPUESTA_INVALIDA
+    
+    postulantes = np.array([fila[0] for fila in filas])
+    temas = np.array([numero_tema(fila[1]) for fila in filas], dtype=np.int16)
+    return postulantes, temas, respuestas
+
+def exportar_respuestas(temas, respuestas, ruta, postulantes=None):
+    """
+    Guarda respuestas en el formato que lee leer_respuestas()
+    
+    Args:
+        temas (ndarray): Número de tema de cada postulante
+        respuestas (ndarray): Matriz (postulantes, preguntas) de respuestas
+        ruta (str): Archivo .csv o .npy de destino
+        postulantes (sequence): Código de cada postulante (solo CSV); por
+            defecto su número de fila
+    
+    Returns:
+        str: Ruta del archivo escrito
+    """
+    import numpy as np
+    
+    temas = np.asarray(temas)
+    respuestas = np.asarray(respuestas)
+    
+    directorio = os.path.dirname(ruta)
+    if directorio and not os.path.exists(directorio):
+        os.makedirs(directorio)
+    
+    if ruta.lower().endswith(".npy"):
+        tipo = np.int8 if temas.size == 0 or temas.max() <= np.iinfo(np.int8).max else np.int16
+        np.save(ruta, np.column_stack([temas, respuestas]).astype(tipo))
+        return ruta
+    
+    if postulantes is None:
+        postulantes = range(1, len(temas) + 1)
+    letras = np.array(("",) + LETRAS_ALTERNATIVAS + ("*",))
+    with open(ruta, "w", newline="", encoding="utf-8") as archivo:
+        escritor = csv.writer(archivo)
+        escritor.writerow(["postulante", "tema"] + [str(i) for i in range(1, respuestas.shape[1] + 1)])
+        for postulante, tema, fila in zip(postulantes, temas.tolist(), letras[respuestas + 1].tolist()):
+            escritor.writerow([postulante, tema] + fila)
+    return ruta
+
+def calificar(claves, temas, respuestas, puntaje_correcta=1.0, puntaje_incorrecta=0.0,
+              puntaje_blanco=0.0, postulantes=None):
+    """
+    Califica a todos los postulantes a la vez
+    
+    Las preguntas sin clave (SIN_CLAVE) no cuentan como correctas, incorrectas
+    ni en blanco. Una marca inválida cuenta como incorrecta.
+    
+    Args:
+        claves (ndarray): Matriz (temas, preguntas) calculada con matriz_claves()
+        temas (ndarray): Número de tema (desde 1) de cada postulante
+        respuestas (ndarray): Matriz (postulantes, preguntas) de respuestas
+        puntaje_correcta (float): Puntos por respuesta correcta
+        puntaje_incorrecta (float): Puntos por respuesta incorrecta (negativo para descontar)
+        puntaje_blanco (float): Puntos por pregunta en blanco
+        postulantes (sequence): Código de cada postulante; por defecto su número de fila
+    
+    Returns:
+        ResultadoCalificacion: Conteos y puntaje de cada postulante
+    """
+    import numpy as np
+    from controller.claves import SIN_CLAVE
+    
+    claves = np.asarray(claves, dtype=np.int8)
+    temas = np.asarray(temas)
+    respuestas = np.asarray(respuestas, dtype=np.int8)
+    
+    if respuestas.ndim != 2 or respuestas.shape[1] != claves.shape[1]:
+        raise ValueError(f"Las respuestas tienen {respuestas.shape[-1]} preguntas y las claves "
+                         f"{claves.shape[1]}")
+    if len(temas) and (temas.min() < 1 or temas.max() > len(claves)):
+        raise ValueError(f"Hay postulantes con un tema fuera de las claves (1-{len(claves)})")
+    
+    # La clave de cada postulante según su tema, en una sola indexación
+    clave_postulante = claves[temas.astype(np.intp) - 1]
+    con_clave = clave_postulante != SIN_CLAVE
+    blancas = (respuestas == RESPUESTA_BLANCO) & con_clave
+    correctas = (respuestas == clave_postulante) & con_clave
+    
+    cantidad_correctas = np.count_nonzero(correctas, axis=1)
+    cantidad_blancas = np.count_nonzero(blancas, axis=1)
+    cantidad_incorrectas = np.count_nonzero(con_clave, axis=1) - cantidad_correctas - cantidad_blancas
+    
+    puntajes = (cantidad_correctas * puntaje_correcta + cantidad_incorrectas * puntaje_incorrecta
+                + cantidad_blancas * puntaje_blanco)
+    
+    if postulantes is None:
+        postulantes = np.arange(1, len(temas) + 1)
+    return ResultadoCalificacion(np.asarray(postulantes), temas, cantidad_correctas,
+                                 cantidad_incorrectas, cantidad_blancas, puntajes)
+
+def calificar_archivos(ruta_claves, ruta_respuestas, **puntajes):
+    """
+    Califica las respuestas de un archivo con las claves de otro
+    
+    Args:
+        ruta_claves (str): Claves exportadas por el generador (.csv o .npy)
+        ruta_respuestas (str): Respuestas de los postulantes (.csv o .npy)
+        **puntajes: puntaje_correcta, puntaje_incorrecta y puntaje_blanco (ver calificar())
+    
+    Returns:
+        ResultadoCalificacion: Conteos y puntaje de cada postulante
+    """
+    from controller.claves import leer_claves
+    
+    postulantes, temas, respuestas = leer_respuestas(ruta_respuestas)
+    return calificar(leer_claves(ruta_claves), temas, respuestas, postulantes=postulantes, **puntajes)
+
+def exportar_resultados(resultado, ruta):
+    """
+    Guarda el resultado de cada postulante en CSV
+    
+    Args:
+        resultado (ResultadoCalificacion): Resultado de calificar()
+        ruta (str): Archivo de destino
+    
+    Returns:
+        str: Ruta del archivo escrito
+    """
+    directorio = os.path.dirname(ruta)
+    if directorio and not os.path.exists(directorio):
+        os.makedirs(directorio)
+    
+    with open(ruta, "w", newline="", encoding="utf-8") as archivo:
+        escritor = csv.writer(archivo)
+        escritor.writerow(["postulante", "tema", "correctas", "incorrectas", "blancas", "puntaje"])
+        escritor.writerows(zip(
+            resultado.postulantes.tolist(),
+            resultado.temas.tolist(),
+            resultado.correctas.tolist(),
+            resultado.incorrectas.tolist(),
+            resultado.blancas.tolist(),
+            [round(puntaje, 4) for puntaje in resultado.puntajes.tolist()]
+        ))
+    return ruta
+
+def _crear_parser():
+    """
+    Define los argumentos de la línea de comandos
+    
+    Returns:
+        argparse.ArgumentParser: Parser de los argumentos
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m controller.calificador",
+        description="Califica las respuestas de los postulantes con las claves de un lote."
+    )
+    parser.add_argument("claves", help="Claves exportadas con --claves (.csv o .npy)")
+    parser.add_argument("respuestas", help="Respuestas de los postulantes (.csv o .npy)")
+    parser.add_argument("--salida", default=None,
+                        help="Archivo CSV donde se guarda el resultado de cada postulante")
+    parser.add_argument("--correcta", type=float, default=1.0,
+                        help="Puntos por respuesta correcta (por defecto 1)")
+    parser.add_argument("--incorrecta", type=float, default=0.0,
+                        help="Puntos por respuesta incorrecta, negativo para descontar (por defecto 0)")
+    parser.add_argument("--blanco", type=float, default=0.0,
+                        help="Puntos por pregunta en blanco (por defecto 0)")
+    return parser
+
+def main(argv=None):
+    """
+    Califica los archivos indicados en la línea de comandos
+    
+    Args:
+        argv (list): Argumentos; por defecto los del proceso
+    
+    Returns:
+        int: Código de salida (0 si se calificó a todos)
+    """
+    args = _crear_parser().parse_args(argv)
+    
+    try:
+        resultado = calificar_archivos(args.claves, args.respuestas,
+                                       puntaje_correcta=args.correcta,
+                                       puntaje_incorrecta=args.incorrecta,
+                                       puntaje_blanco=args.blanco)
+    except (OSError, ValueError) as e:
+        print(f"Error al calificar: {e}", file=sys.stderr)
+        return 1
+    
+    if args.salida:
+        exportar_resultados(resultado, args.salida)
+    
+    cantidad = len(resultado.puntajes)
+    print(f"Postulantes calificados: {cantidad}")
+    if cantidad:
+        print(f"Puntaje promedio: {resultado.puntajes.mean():.2f} "
+              f"(mínimo {resultado.puntajes.min():.2f}, máximo {resultado.puntajes.max():.2f})")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,242 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Módulo que calcula las claves de respuestas de un lote de versiones, las
+exporta juntas para la calificación masiva e informa cómo quedaron repartidas
+"""
+
+import csv
+import os
+from collections import namedtuple
+from model.pregunta import LETRAS_ALTERNATIVAS
+from model.version_examen import POSICIONES_ALTERNATIVAS
+from model.claves_balanceadas import SIN_CLAVE
+
+# Reparto de las respuestas correctas de un tema:
+# - por_letra: cantidad de preguntas con la respuesta en cada letra (a-e)
+# - fraccion_maxima: fracción de las preguntas con clave que usa la letra más repetida
+# - racha_maxima: mayor cantidad de preguntas seguidas con la respuesta en la misma letra
+# - coincidencias_maximas: mayor cantidad de preguntas con la respuesta en la misma
+#   letra que en otro tema del lote
+EstadisticaClaves = namedtuple('EstadisticaClaves', [
+    'numero_tema', 'preguntas_con_clave', 'por_letra', 'fraccion_maxima',
+    'racha_maxima', 'coincidencias_maximas'
+])
+
+def numero_tema(tema):
+    """
+    Número de un tema escrito como número o con la letra de su portada (A-Z, sin
+    distinguir mayúsculas)
+    
+    Las claves se exportan con el número, que no tiene límite de temas; la letra
+    se acepta en las hojas de respuestas y en claves exportadas con versiones anteriores.
+    
+    Args:
+        tema (str): Texto de la columna tema
+    
+    Returns:
+        int: Número del tema, desde 1
+    """
+    texto = tema.strip().upper()
+    if texto.isdigit():
+        return int(texto)
+    if len(texto) == 1 and 'A' <= texto <= 'Z':
+        return ord(texto) - 64
+    raise ValueError(f"Tema no válido: {tema!r}")
+
+def tiene_claves(preguntas):
+    """
+    Indica si alguna pregunta del banco tiene alternativa correcta
+    
+    Args:
+        preguntas (sequence): Preguntas del banco
+    
+    Returns:
+        bool: False si no hay ninguna clave que exportar
+    """
+    return any(p.alternativa_correcta is not None for p in preguntas)
+
+def correctas_banco(preguntas):
+    """
+    Alternativa correcta de cada pregunta del banco, en su orden original
+    
+    Args:
+        preguntas (sequence): Preguntas del banco
+    
+    Returns:
+        ndarray: Índices 0-4 (int8), SIN_CLAVE en las preguntas sin clave
+    """
+    import numpy as np
+    
+    return np.array(
+        [SIN_CLAVE if p.alternativa_correcta is None else p.alternativa_correcta for p in preguntas],
+        dtype=np.int8
+    )
+
+def matriz_claves(versiones, preguntas):
+    """
+    Calcula la clave de todas las versiones a la vez
+    
+    Args:
+        versiones (list): VersionExamen del lote, en orden de tema
+        preguntas (sequence): Preguntas del banco
+    
+    Returns:
+        ndarray: Matriz (temas, preguntas) de int8 con la letra correcta (0-4) de
+            cada posición de cada tema, o SIN_CLAVE
+    """
+    import numpy as np
+    
+    cantidad = len(versiones[0]) if versiones else 0
+    ordenes = np.frombuffer(b"".join(v.orden_preguntas.tobytes() for v in versiones),
+                            dtype=np.uint16).reshape(len(versiones), cantidad)
+    codigos = np.frombuffer(b"".join(v.codigos_alternativas for v in versiones),
+                            dtype=np.uint8).reshape(len(versiones), cantidad)
+    
+    correctas = correctas_banco(preguntas)[ordenes]
+    posiciones = np.array(POSICIONES_ALTERNATIVAS, dtype=np.int8)
+    return np.where(correctas >= 0, posiciones[codigos, np.maximum(correctas, 0)], SIN_CLAVE).astype(np.int8)
+
+def exportar_claves(matriz, ruta, temas=None):
+    """
+    Guarda las claves de un lote en CSV o en binario según la extensión
+    
+    Con ".npy" se guarda una matriz con una fila por tema, en orden desde el tema 1;
+    las filas de los temas que no se indican quedan en SIN_CLAVE. En CSV cada fila
+    es un tema indicado: su letra seguida de la letra correcta de cada pregunta,
+    vacía si la pregunta no tiene clave.
+    
+    Args:
+        matriz (ndarray): Matriz calculada con matriz_claves()
+        ruta (str): Archivo de destino (.csv o .npy)
+        temas (list): Número de tema de cada fila de la matriz; por defecto 1, 2, 3, ...
+    
+    Returns:
+        str: Ruta del archivo escrito
+    """
+    import numpy as np
+    
+    matriz = np.asarray(matriz, dtype=np.int8)
+    if temas is None:
+        temas = range(1, len(matriz) + 1)
+    temas = list(temas)
+    
+    directorio = os.path.dirname(ruta)
+    if directorio and not os.path.exists(directorio):
+        os.makedirs(directorio)
+    
+    if ruta.lower().endswith(".npy"):
+        completa = np.full((max(temas, default=0), matriz.shape[1]), SIN_CLAVE, dtype=np.int8)
+        completa[np.array(temas, dtype=np.intp) - 1] = matriz
+        np.save(ruta, completa)
+        return ruta
+    
+    letras = np.array(("",) + LETRAS_ALTERNATIVAS)
+    with open(ruta, "w", newline="", encoding="utf-8") as archivo:
+        escritor = csv.writer(archivo)
+        escritor.writerow(["tema"] + [str(i) for i in range(1, matriz.shape[1] + 1)])
+        for numero, fila in zip(temas, letras[matriz + 1]):
+            escritor.writerow([numero] + fila.tolist())
+    return ruta
+
+def leer_claves(ruta):
+    """
+    Lee las claves exportadas con exportar_claves()
+    
+    Args:
+        ruta (str): Archivo .csv o .npy
+    
+    Returns:
+        ndarray: Matriz (temas, preguntas) de int8, SIN_CLAVE en las preguntas sin
+            clave y en las filas de los temas que no se exportaron
+    """
+    import numpy as np
+    
+    if ruta.lower().endswith(".npy"):
+        return np.load(ruta).astype(np.int8, copy=False)
+    
+    valores = {letra: indice for indice, letra in enumerate(LETRAS_ALTERNATIVAS)}
+    with open(ruta, newline="", encoding="utf-8") as archivo:
+        encabezado, *filas = csv.reader(archivo)
+    
+    # Cada fila va en la posición de su tema; los temas que faltan quedan sin clave
+    numeros = [numero_tema(fila[0]) for fila in filas]
+    if min(numeros, default=1) < 1:
+        raise ValueError(f"Hay temas numerados desde 0: {ruta}")
+    matriz = np.full((max(numeros, default=0), len(encabezado) - 1), SIN_CLAVE, dtype=np.int8)
+    for numero, fila in zip(numeros, filas):
+        matriz[numero - 1] = [valores.get(letra.strip().lower(), SIN_CLAVE) for letra in fila[1:]]
+    return matriz
+
+def estadisticas_claves(versiones, preguntas):
+    """
+    Calcula el reparto de las respuestas correctas de cada tema del lote
+    
+    Args:
+        versiones (list): VersionExamen del lote, en orden de tema
+        preguntas (sequence): Preguntas del banco
+    
+    Returns:
+        list: Un EstadisticaClaves por tema, en orden
+    """
+    import numpy as np
+    
+    matriz = matriz_claves(versiones, preguntas).astype(np.int64)
+    temas, cantidad = matriz.shape
+    con_clave = matriz >= 0
+    
+    por_letra = (matriz[:, :, None] == np.arange(len(LETRAS_ALTERNATIVAS))).sum(axis=1)
+    preguntas_con_clave = con_clave.sum(axis=1)
+    fraccion_maxima = por_letra.max(axis=1, initial=0) / np.maximum(preguntas_con_clave, 1)
+    
+    # Largo de la racha que termina en cada posición: distancia al último corte
+    posiciones = np.arange(cantidad)
+    sigue = np.zeros_like(con_clave)
+    sigue[:, 1:] = (matriz[:, 1:] == matriz[:, :-1]) & con_clave[:, 1:]
+    cortes = np.maximum.accumulate(np.where(sigue, 0, posiciones), axis=1)
+    rachas = np.where(con_clave, posiciones - cortes + 1, 0)
+    
+    # Coincidencias por pregunta del banco, no por posición: es lo que puede copiarse
+    ordenes = np.array([v.orden_preguntas for v in versiones], dtype=np.int64).reshape(temas, cantidad)
+    por_pregunta = np.full_like(matriz, SIN_CLAVE)
+    np.put_along_axis(por_pregunta, ordenes, matriz, axis=1)
+    marcas = np.zeros((temas, cantidad, len(LETRAS_ALTERNATIVAS)), dtype=np.float32)
+    np.put_along_axis(marcas, np.maximum(por_pregunta, 0)[:, :, None], 1, axis=2)
+    marcas[por_pregunta < 0] = 0
+    marcas = marcas.reshape(temas, -1)
+    coincidencias = np.rint(marcas @ marcas.T).astype(np.int64)
+    np.fill_diagonal(coincidencias, 0)
+    
+    return [
+        EstadisticaClaves(versiones[i].numero_tema, int(preguntas_con_clave[i]),
+                          tuple(int(c) for c in por_letra[i]), float(fraccion_maxima[i]),
+                          int(rachas[i].max(initial=0)), int(coincidencias[i].max(initial=0)))
+        for i in range(temas)
+    ]
+
+def exportar_estadisticas(estadisticas, ruta):
+    """
+    Guarda en CSV el reparto de las respuestas de cada tema
+    
+    Args:
+        estadisticas (list): Resultado de estadisticas_claves()
+        ruta (str): Archivo .csv de destino
+    
+    Returns:
+        str: Ruta del archivo escrito
+    """
+    directorio = os.path.dirname(ruta)
+    if directorio and not os.path.exists(directorio):
+        os.makedirs(directorio)
+    
+    with open(ruta, "w", newline="", encoding="utf-8") as archivo:
+        escritor = csv.writer(archivo)
+        escritor.writerow(["tema", "preguntas_con_clave"] + list(LETRAS_ALTERNATIVAS)
+                          + ["fraccion_maxima", "racha_maxima", "coincidencias_maximas"])
+        for estadistica in estadisticas:
+            escritor.writerow([estadistica.numero_tema, estadistica.preguntas_con_clave]
+                              + list(estadistica.por_letra)
+                              + [f"{estadistica.fraccion_maxima:.3f}", estadistica.racha_maxima,
+                                 estadistica.coincidencias_maximas])
+    return ruta
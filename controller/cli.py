@@ -0,0 +1,165 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Punto de entrada sin interfaz gráfica para generar lotes de exámenes
+
+Uso: python -m controller.cli CANTIDAD [--formato pdf|word] [--semilla N]
+     [--procesos N] [--directorio RUTA] [--snapshot RUTA] [--claves RUTA]
+     [--sin-balancear-columnas] [--distancia-minima F] [--coincidencias-maximas F]
+     [--balancear-claves] [--estadisticas-claves RUTA] [--regenerar-todo]
+
+El avance se escribe en la salida estándar como una línea JSON por evento
+(ver controller.progreso), para que un servidor o una tarea programada puedan
+seguirlo sin pantalla.
+"""
+
+import sys
+import json
+import time
+import argparse
+import contextlib
+
+def _crear_parser():
+    """
+    Define los argumentos de la línea de comandos
+    
+    Returns:
+        argparse.ArgumentParser: Parser de los argumentos
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m controller.cli",
+        description="Genera versiones de exámenes de admisión sin interfaz gráfica."
+    )
+    parser.add_argument("cantidad", type=int, help="Cantidad de temas a generar")
+    parser.add_argument("--formato", choices=("pdf", "word"), default="pdf",
+                        help="Formato de los exámenes (por defecto pdf)")
+    parser.add_argument("--semilla", type=int, default=None,
+                        help="Semilla del lote; con la misma semilla se obtienen los mismos temas")
+    parser.add_argument("--procesos", type=int, default=1,
+                        help="Procesos en paralelo; 0 usa un proceso por núcleo (por defecto 1)")
+    parser.add_argument("--directorio", default="Examenes",
+                        help="Carpeta donde se guardan los exámenes (por defecto Examenes)")
+    parser.add_argument("--snapshot", default=None,
+                        help="Archivo binario del banco (ver model.snapshot_banco) en lugar de la base de datos")
+    parser.add_argument("--portada-precompilada", action="store_true",
+                        help="Maquetar la portada del PDF una sola vez para todo el lote")
+    parser.add_argument("--pdf-incremental", action="store_true",
+                        help="Crear los flowables del PDF a medida que se maquetan (bancos muy grandes)")
+    parser.add_argument("--sin-docx-rapido", action="store_true",
+                        help="Construir los Word con python-docx en lugar de la plantilla armada")
+    parser.add_argument("--sin-balancear-columnas", action="store_true",
+                        help="Dejar fluir las preguntas del PDF y dividir las del Word por cantidad "
+                             "en lugar de repartirlas según su altura")
+    parser.add_argument("--distancia-minima", type=float, default=None,
+                        help="Fracción mínima de pares de preguntas que dos temas cualesquiera "
+                             "deben ordenar al revés (por ejemplo 0.3)")
+    parser.add_argument("--coincidencias-maximas", type=float, default=None,
+                        help="Fracción máxima de preguntas con la respuesta en la misma letra "
+                             "entre dos temas cualesquiera (por ejemplo 0.2)")
+    parser.add_argument("--claves", default=None,
+                        help="Archivo .csv o .npy donde se exportan las claves de respuestas del lote")
+    parser.add_argument("--balancear-claves", action="store_true",
+                        help="Repartir por igual entre las cinco letras las respuestas correctas "
+                             "de cada tema y de cada pregunta entre los temas")
+    parser.add_argument("--estadisticas-claves", default=None,
+                        help="Archivo .csv donde se informa el reparto de las respuestas de cada tema")
+    parser.add_argument("--cache-bloques", default=None,
+                        help="Archivo donde se guardan los párrafos ya dibujados para los lotes siguientes")
+    parser.add_argument("--regenerar-todo", action="store_true",
+                        help="Volver a generar también los temas que no cambiaron desde el último lote")
+    return parser
+
+def _emitir(salida, evento, **datos):
+    """
+    Escribe un evento como una línea JSON y la envía de inmediato
+    
+    Args:
+        salida (file): Salida donde se escriben los eventos
+        evento (str): Nombre del evento
+        **datos: Campos adicionales del evento
+    """
+    salida.write(json.dumps(dict(evento=evento, **datos), ensure_ascii=False) + "\n")
+    salida.flush()
+
+def main(argv=None):
+    """
+    Genera el lote indicado en la línea de comandos
+    
+    Args:
+        argv (list): Argumentos; por defecto los del proceso
+    
+    Returns:
+        int: Código de salida (0 si se generaron todos los temas)
+    """
+    args = _crear_parser().parse_args(argv)
+    if args.cantidad < 1:
+        _crear_parser().error("la cantidad de temas debe ser al menos 1")
+    
+    # Los mensajes del generador van a stderr para no mezclarse con los eventos
+    salida = sys.stdout
+    inicio = time.perf_counter()
+    
+    try:
+        with contextlib.redirect_stdout(sys.stderr):
+            # Importar el generador aquí para que --help responda sin cargarlo
+            from controller.examen_generator import ExamenGenerator
+            from controller.progreso import TEMA_TERMINADO
+            
+            generador = ExamenGenerator(
+                args.directorio,
+                ruta_snapshot=args.snapshot,
+                portada_precompilada=args.portada_precompilada,
+                docx_rapido=not args.sin_docx_rapido,
+                pdf_incremental=args.pdf_incremental,
+                ruta_cache_bloques=args.cache_bloques,
+                balancear_columnas=not args.sin_balancear_columnas
+            )
+            
+            restricciones = None
+            if args.distancia_minima is not None or args.coincidencias_maximas is not None:
+                from model.permutaciones_restringidas import Restricciones
+                restricciones = Restricciones(coincidencias_maximas=args.coincidencias_maximas)
+                if args.distancia_minima is not None:
+                    restricciones = restricciones._replace(distancia_minima=args.distancia_minima)
+            
+            if generador.refrescar_banco() == 0:
+                raise RuntimeError("El banco de preguntas está vacío")
+            
+            _emitir(salida, "inicio", cantidad=args.cantidad, formato=args.formato,
+                    preguntas=len(generador.banco), directorio=args.directorio)
+            
+            def al_terminar_tema(completados, ruta):
+                _emitir(salida, "tema_terminado", completados=completados,
+                        total=args.cantidad, ruta=ruta, correcto=ruta is not None)
+            
+            def al_progresar(evento):
+                # El cierre de cada tema ya se informa con al_terminar_tema
+                if evento.tipo != TEMA_TERMINADO:
+                    _emitir(salida, evento.tipo, tema=evento.numero_tema, valor=evento.valor)
+            
+            rutas_archivos = generador.generar_examenes(
+                args.cantidad,
+                args.formato,
+                procesos=args.procesos or None,
+                semilla=args.semilla,
+                al_terminar_tema=al_terminar_tema,
+                recargar_banco=False,
+                al_progresar=al_progresar,
+                incremental=not args.regenerar_todo,
+                ruta_claves=args.claves,
+                restricciones=restricciones,
+                balancear_claves=args.balancear_claves,
+                ruta_estadisticas=args.estadisticas_claves
+            )
+    except Exception as e:
+        _emitir(salida, "error", mensaje=str(e))
+        return 1
+    
+    _emitir(salida, "fin", archivos=len(rutas_archivos), fallidos=args.cantidad - len(rutas_archivos),
+            semilla=generador.motor.semilla, claves=generador.ruta_claves_exportadas,
+            segundos=round(time.perf_counter() - inicio, 3))
+    return 0 if len(rutas_archivos) == args.cantidad else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,192 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Módulo que escribe los exámenes en Word a partir de una plantilla ya armada,
+sin construir cada documento con python-docx
+"""
+
+import io
+import re
+import zipfile
+import threading
+from xml.sax.saxutils import escape
+from model.pregunta import LETRAS_ALTERNATIVAS
+
+# Textos de marca que se reemplazan en la plantilla
+MARCA_TITULO = "@@TITULO@@"
+MARCA_TEMA = "@@TEMA@@"
+MARCA_COLUMNA_1 = "@@COL1@@"
+MARCA_COLUMNA_2 = "@@COL2@@"
+
+# Ruta del cuerpo del documento dentro del paquete
+PARTE_DOCUMENTO = 'word/document.xml'
+
+# Párrafo vacío, tal como lo escribe python-docx
+_PARRAFO_VACIO = '<w:p/>'
+
+# Caracteres que python-docx convierte en elementos propios dentro de un run
+_SEPARADORES = re.compile(r'([\t\r\n])')
+
+# Caracteres que no pueden aparecer en un documento XML
+_CARACTERES_INVALIDOS = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]')
+
+_lock = threading.Lock()
+_plantilla = None
+
+def _texto_run(texto):
+    """
+    Contenido de un run de python-docx para un texto
+    
+    Replica Run.text: las tabulaciones son <w:tab/>, los saltos de línea <w:br/>
+    y el resto se agrupa en elementos <w:t>.
+    
+    Returns:
+        str: XML del contenido del run
+    """
+    if _CARACTERES_INVALIDOS.search(texto):
+        raise ValueError(f"El texto contiene caracteres que no admite XML: {texto!r}")
+    
+    partes = []
+    for segmento in _SEPARADORES.split(texto):
+        if segmento == '\t':
+            partes.append('<w:tab/>')
+        elif segmento in ('\r', '\n'):
+            partes.append('<w:br/>')
+        elif segmento:
+            if len(segmento.strip()) < len(segmento):
+                partes.append(f'<w:t xml:space="preserve">{escape(segmento)}</w:t>')
+            else:
+                partes.append(f'<w:t>{escape(segmento)}</w:t>')
+    return ''.join(partes)
+
+def _parrafo(texto, estilo):
+    """
+    XML de un párrafo con estilo, igual al que genera cell.add_paragraph(texto, estilo)
+    
+    Returns:
+        str: XML del párrafo
+    """
+    propiedades = f'<w:pPr><w:pStyle w:val="{estilo}"/></w:pPr>'
+    if not texto:
+        return f'<w:p>{propiedades}</w:p>'
+    return f'<w:p>{propiedades}<w:r>{_texto_run(texto)}</w:r></w:p>'
+
+def _parrafo_marca(xml, marca):
+    """
+    Ubica en el XML el párrafo completo que contiene una marca
+    
+    Returns:
+        tuple: (inicio, fin) del párrafo dentro del XML
+    """
+    posicion = xml.index(marca)
+    inicio = xml.rindex('<w:p>', 0, posicion)
+    fin = xml.index('</w:p>', posicion) + len('</w:p>')
+    return inicio, fin
+
+class PlantillaWord:
+    """
+    Paquete .docx ya armado con estilos, portada y logo, listo para recibir las preguntas
+    
+    La plantilla se arma una sola vez con python-docx (con los mismos métodos que
+    usa generar_word), dejando marcas en lugar del título, la letra del tema y las
+    preguntas de cada columna. Para cada versión se copian las demás partes del
+    paquete y el cuerpo de document.xml se escribe por partes directamente dentro
+    del zip, sin crear objetos de python-docx por cada párrafo.
+    """
+    
+    def __init__(self, generador):
+        """
+        Constructor de la clase PlantillaWord
+        
+        Args:
+            generador (ExamenGenerator): Generador cuyo documento Word se usa como plantilla
+        """
+        doc, table = generador._documento_word(MARCA_TITULO, MARCA_TEMA)
+        table.cell(0, 0).add_paragraph(MARCA_COLUMNA_1)
+        table.cell(0, 1).add_paragraph(MARCA_COLUMNA_2)
+        
+        buffer = io.BytesIO()
+        doc.save(buffer)
+        
+        # Partes del paquete en el orden en que las escribe python-docx
+        self.partes = []
+        with zipfile.ZipFile(buffer) as paquete:
+            for nombre in paquete.namelist():
+                self.partes.append((nombre, paquete.read(nombre)))
+        
+        xml = dict(self.partes)[PARTE_DOCUMENTO].decode('utf-8')
+        inicio_1, fin_1 = _parrafo_marca(xml, MARCA_COLUMNA_1)
+        inicio_2, fin_2 = _parrafo_marca(xml, MARCA_COLUMNA_2)
+        
+        # El título y la letra del tema solo aparecen antes de las columnas
+        self.encabezado = xml[:inicio_1]
+        self.intermedio = xml[fin_1:inicio_2].encode('utf-8')
+        self.final = xml[fin_2:].encode('utf-8')
+        if MARCA_TITULO not in self.encabezado or MARCA_TEMA not in self.encabezado:
+            raise ValueError("La plantilla de Word no tiene las marcas del título y el tema")
+    
+    def _escribir_columna(self, archivo, preguntas, primer_numero):
+        """
+        Escribe los párrafos de las preguntas de una columna
+        
+        Args:
+            archivo (file): Parte document.xml abierta dentro del zip
+            preguntas (list): Parejas (pregunta, alternativas) de la columna
+            primer_numero (int): Número de la primera pregunta de la columna
+        """
+        for i, (pregunta, alternativas) in enumerate(preguntas, start=primer_numero):
+            bloque = [_parrafo(f"{i}. {pregunta.enunciado}", 'Pregunta')]
+            for letra, alternativa in zip(LETRAS_ALTERNATIVAS, alternativas):
+                bloque.append(_parrafo(f"{letra}) {alternativa}", 'Alternativa'))
+            bloque.append(_PARRAFO_VACIO)
+            archivo.write(''.join(bloque).encode('utf-8'))
+    
+    def escribir(self, preguntas, ruta_archivo, titulo_examen, mitad=None):
+        """
+        Escribe el examen de una versión en un archivo .docx
+        
+        Args:
+            preguntas (iterable): Parejas (pregunta, alternativas) en el orden del examen
+            ruta_archivo (str): Ruta donde se guardará el archivo Word
+            titulo_examen (str): Título del examen (Tema A, Tema B, etc.)
+            mitad (int): Preguntas de la primera columna; por defecto la mitad
+        """
+        preguntas = list(preguntas)
+        if mitad is None:
+            mitad = len(preguntas) // 2
+        
+        encabezado = self.encabezado.replace(MARCA_TITULO, escape(titulo_examen))
+        encabezado = encabezado.replace(MARCA_TEMA, escape(titulo_examen[-1]))
+        
+        with zipfile.ZipFile(ruta_archivo, 'w', compression=zipfile.ZIP_DEFLATED) as paquete:
+            for nombre, datos in self.partes:
+                if nombre != PARTE_DOCUMENTO:
+                    paquete.writestr(nombre, datos)
+                    continue
+                
+                # El cuerpo se comprime a medida que se escribe
+                with paquete.open(nombre, 'w') as archivo:
+                    archivo.write(encabezado.encode('utf-8'))
+                    self._escribir_columna(archivo, preguntas[:mitad], 1)
+                    archivo.write(self.intermedio)
+                    self._escribir_columna(archivo, preguntas[mitad:], mitad + 1)
+                    archivo.write(self.final)
+
+def obtener_plantilla_word(generador):
+    """
+    Devuelve la plantilla de Word del proceso, armándola la primera vez
+    
+    Args:
+        generador (ExamenGenerator): Generador cuyo documento Word se usa como plantilla
+    
+    Returns:
+        PlantillaWord: Plantilla lista para escribir cada tema
+    """
+    global _plantilla
+    if _plantilla is None:
+        with _lock:
+            if _plantilla is None:
+                _plantilla = PlantillaWord(generador)
+    
+    return _plantilla
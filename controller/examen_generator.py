@@ -5,36 +5,180 @@
 Módulo controlador para la generación de exámenes en PDF y WORD
 """
 
+import io
 import os
 import datetime
-from reportlab.lib.pagesizes import letter
-from reportlab.lib import colors
-from reportlab.lib.units import inch
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Image, Frame, PageTemplate, BaseDocTemplate, NextPageTemplate
-from reportlab.platypus.flowables import HRFlowable
-from docx import Document
-from docx.shared import Pt, Inches, RGBColor
-from docx.enum.text import WD_ALIGN_PARAGRAPH
-from docx.enum.style import WD_STYLE_TYPE
 from model.pregunta_dao import PreguntaDAO
+from model.banco_preguntas import BancoPreguntas
+from model.permutaciones import MotorPermutaciones
+from model.permutaciones_restringidas import MotorRestringido
+from model.claves_balanceadas import MotorClavesBalanceadas
+from model.pregunta import Pregunta, LETRAS_ALTERNATIVAS
+from model.version_examen import VersionExamen
+from controller.manifiesto import ManifiestoLote, huella_banco, huella_lote, huella_version
+from controller.progreso import (
+    EventoProgreso, TEMA_INICIADO, PAGINAS_MAQUETADAS, BYTES_ESCRITOS, TEMA_TERMINADO
+)
+
+# Párrafo que cierra la portada y fuerza el salto a la página de preguntas
+_SALTO_PORTADA = "<br clear=all style='page-break-before:always'/>"
+
+# Párrafos de cada pregunta del PDF (enunciado y alternativas); al balancear las
+# columnas, una columna solo empieza al inicio de uno de ellos, y el espacio entre
+# preguntas no se imprime arriba de una columna
+_PARRAFOS_PREGUNTA = 1 + len(LETRAS_ALTERNATIVAS)
+
+# Ancho útil (en puntos) de cada columna de la tabla del Word: 3,5 pulgadas menos
+# los márgenes predeterminados de la celda (0,08 pulgadas por lado)
+_ANCHO_COLUMNA_WORD = 72 * (3.5 - 2 * 0.08)
+
+# Alto de una línea de Arial en Word, en proporción al tamaño de la fuente
+_INTERLINEADO_WORD = 1.15
+
+# Generador propio de cada proceso del pool; se crea una sola vez por proceso
+_generador_proceso = None
+
+# Cada cuántos segundos se reenvían al proceso principal los eventos de avance del pool
+INTERVALO_EVENTOS = 0.05
+
+def _inicializar_proceso(preguntas, directorio_examenes, opciones, cola_eventos=None):
+    """
+    Prepara un proceso del pool con el banco de preguntas ya cargado
+    
+    Args:
+        preguntas (tuple): Instantánea del banco de preguntas
+        directorio_examenes (str): Carpeta donde se guardan los exámenes
+        opciones (dict): Opciones de generación del generador original
+            (portada_precompilada, docx_rapido, pdf_incremental, ruta_cache_bloques,
+            balancear_columnas)
+        cola_eventos (multiprocessing.Queue): Cola por la que se envían los eventos
+            de avance al proceso principal, o None si nadie los escucha
+    """
+    global _generador_proceso
+    _generador_proceso = ExamenGenerator(directorio_examenes, **opciones)
+    _generador_proceso.banco = BancoPreguntas.desde_preguntas(preguntas)
+    if cola_eventos is not None:
+        _generador_proceso.al_progresar = cola_eventos.put
+
+def _generar_version_en_proceso(version, formato):
+    """
+    Genera un tema dentro de un proceso del pool
+    
+    Args:
+        version (VersionExamen): Permutaciones del tema; viajan como unos pocos bytes
+        formato (str): Formato del examen ("pdf" o "word")
+        
+    Returns:
+        str: Ruta del archivo generado o None si falló
+    """
+    if formato == "pdf":
+        return _generador_proceso.generar_version_pdf(version)
+    return _generador_proceso.generar_version_word(version)
+
+def _con_alternativas(preguntas):
+    """
+    Normaliza las preguntas de un examen a parejas (pregunta, alternativas)
+    
+    Acepta tanto listas de objetos Pregunta como el resultado de VersionExamen.resolver().
+    
+    Yields:
+        tuple: (pregunta, alternativas) con las cinco alternativas en el orden a imprimir
+    """
+    for elemento in preguntas:
+        if isinstance(elemento, Pregunta):
+            yield elemento, elemento.alternativas
+        else:
+            yield elemento
 
 class ExamenGenerator:
     """
     Controlador para generar exámenes en formato PDF y Word
     """
     
-    def __init__(self):
+    def __init__(self, directorio_examenes="Examenes", pregunta_dao=None, ruta_snapshot=None,
+                 portada_precompilada=False, docx_rapido=True, pdf_incremental=False,
+                 ruta_cache_bloques=None, balancear_columnas=True):
         """
         Constructor de la clase ExamenGenerator
+        
+        Args:
+            directorio_examenes (str): Carpeta donde se guardarán los exámenes
+            pregunta_dao (PreguntaDAO): Acceso a datos a usar; por defecto el configurado
+            ruta_snapshot (str): Archivo binario del banco (ver model.snapshot_banco);
+                si se indica, las preguntas se leen de él en lugar de la base de datos
+            portada_precompilada (bool): Si es True, la portada del PDF se maqueta una
+                sola vez y se une a las preguntas de cada tema (ver controller.portada_pdf)
+            docx_rapido (bool): Si es True, los Word se escriben a partir de una plantilla
+                ya armada en lugar de construirlos con python-docx (ver controller.docx_rapido)
+            pdf_incremental (bool): Si es True, los flowables del PDF se crean a medida
+                que ReportLab los maqueta, con memoria casi constante para bancos muy
+                grandes; en este modo las columnas del PDF no se balancean
+            ruta_cache_bloques (str): Archivo donde se guardan los párrafos ya dibujados
+                para reutilizarlos en los lotes siguientes (ver controller.cache_bloques);
+                si se omite, solo se reutilizan dentro de cada proceso
+            balancear_columnas (bool): Si es True, las preguntas se reparten en las
+                columnas según su altura medida: con la menor cantidad de páginas,
+                partiendo la menor cantidad de preguntas y con la última página
+                pareja (ver controller.maquetacion); si es False, el PDF fluye de
+                una columna a otra y el Word se divide por cantidad de preguntas.
+                Medir las alturas obliga a tener todas las preguntas del PDF en
+                memoria, así que con pdf_incremental no se aplica al PDF
         """
-        self.pregunta_dao = PreguntaDAO()
-        self.directorio_examenes = "Examenes"
+        self.pregunta_dao = pregunta_dao if pregunta_dao is not None else PreguntaDAO()
+        self.banco = BancoPreguntas(self.pregunta_dao, ruta_snapshot)
+        self.motor = MotorPermutaciones()
+        self.directorio_examenes = directorio_examenes
+        self.portada_precompilada = portada_precompilada
+        self.docx_rapido = docx_rapido
+        self.pdf_incremental = pdf_incremental
+        self.ruta_cache_bloques = ruta_cache_bloques
+        self.balancear_columnas = balancear_columnas
+        
+        # Función que recibe los EventoProgreso mientras se genera un lote
+        self.al_progresar = None
+        
+        # Archivo de claves exportado por el último lote, o None si no se exportó
+        self.ruta_claves_exportadas = None
         
         # Crear directorio si no existe
         if not os.path.exists(self.directorio_examenes):
             os.makedirs(self.directorio_examenes)
     
+    def refrescar_banco(self):
+        """
+        Vuelve a cargar el banco de preguntas desde la base de datos
+        
+        Returns:
+            int: Cantidad de preguntas cargadas
+        """
+        return len(self.banco.refrescar())
+    
+    def crear_version(self, numero_tema):
+        """
+        Deriva la versión compacta de un tema a partir del motor de permutaciones
+        
+        Args:
+            numero_tema (int): Número del tema (1, 2, 3, ...)
+            
+        Returns:
+            VersionExamen: Orden de preguntas y alternativas del tema
+        """
+        return VersionExamen.desde_motor(self.motor, numero_tema, len(self.banco))
+    
+    def ruta_version(self, version, formato):
+        """
+        Ruta del archivo de una versión
+        
+        Args:
+            version (VersionExamen): Versión del examen
+            formato (str): Formato del examen ("pdf" o "word")
+            
+        Returns:
+            str: Ruta del examen dentro de la carpeta de exámenes
+        """
+        extension = "pdf" if formato == "pdf" else "docx"
+        return os.path.join(self.directorio_examenes, f"Examen_Tema_{version.letra}.{extension}")
+    
     def generar_examen_pdf(self, numero_tema):
         """
         Genera una versión de examen en formato PDF
@@ -45,17 +189,7 @@ class ExamenGenerator:
         Returns:
             str: Ruta del archivo PDF generado
         """
-        # Generar letra del tema (A, B, C, ...)
-        letra_tema = chr(64 + numero_tema)  # 65 es el código ASCII de 'A'
-        nombre_archivo = os.path.join(self.directorio_examenes, f"Examen_Tema_{letra_tema}.pdf")
-        
-        # Generar examen aleatorio
-        preguntas_examen = self.pregunta_dao.generar_examen_aleatorio()
-        
-        # Crear PDF
-        if self.generar_pdf(preguntas_examen, nombre_archivo, f"Tema {letra_tema}"):
-            return nombre_archivo
-        return None
+        return self.generar_version_pdf(self.crear_version(numero_tema))
         
     def generar_examen_word(self, numero_tema):
         """
@@ -67,201 +201,693 @@ class ExamenGenerator:
         Returns:
             str: Ruta del archivo Word generado
         """
-        # Generar letra del tema (A, B, C, ...)
-        letra_tema = chr(64 + numero_tema)  # 65 es el código ASCII de 'A'
-        nombre_archivo = os.path.join(self.directorio_examenes, f"Examen_Tema_{letra_tema}.docx")
+        return self.generar_version_word(self.crear_version(numero_tema))
+    
+    def generar_version_pdf(self, version):
+        """
+        Genera el PDF de una versión, resolviendo el texto contra el banco compartido
+        
+        Args:
+            version (VersionExamen): Versión del examen a generar
+            
+        Returns:
+            str: Ruta del archivo PDF generado
+        """
+        nombre_archivo = self.ruta_version(version, "pdf")
         
-        # Generar examen aleatorio
-        preguntas_examen = self.pregunta_dao.generar_examen_aleatorio()
+        def al_maquetar_pagina(pagina):
+            self._notificar(PAGINAS_MAQUETADAS, version.numero_tema, pagina)
+        
+        # Crear PDF
+        return self._generar_version(version, nombre_archivo, self.generar_pdf,
+                                     al_maquetar_pagina=al_maquetar_pagina)
+    
+    def generar_version_word(self, version):
+        """
+        Genera el Word de una versión, resolviendo el texto contra el banco compartido
+        
+        Args:
+            version (VersionExamen): Versión del examen a generar
+            
+        Returns:
+            str: Ruta del archivo Word generado
+        """
+        nombre_archivo = self.ruta_version(version, "word")
         
         # Crear Word
-        if self.generar_word(preguntas_examen, nombre_archivo, f"Tema {letra_tema}"):
-            return nombre_archivo
-        return None
+        return self._generar_version(version, nombre_archivo, self.generar_word)
+    
+    def _generar_version(self, version, nombre_archivo, generar, **opciones):
+        """
+        Genera el archivo de una versión informando su avance con al_progresar
+        
+        Args:
+            version (VersionExamen): Versión del examen a generar
+            nombre_archivo (str): Ruta del archivo a generar
+            generar (callable): generar_pdf o generar_word
+            **opciones: Argumentos adicionales para generar
+            
+        Returns:
+            str: Ruta del archivo generado o None si falló
+        """
+        self._notificar(TEMA_INICIADO, version.numero_tema)
+        ruta_archivo = None
+        try:
+            if generar(version.resolver(self.banco.preguntas), nombre_archivo,
+                       f"Tema {version.letra}", **opciones):
+                ruta_archivo = nombre_archivo
+                self._notificar(BYTES_ESCRITOS, version.numero_tema, os.path.getsize(ruta_archivo))
+            elif os.path.exists(nombre_archivo):
+                # No dejar un archivo a medio escribir (o de un lote anterior) con este nombre
+                os.remove(nombre_archivo)
+        finally:
+            self._notificar(TEMA_TERMINADO, version.numero_tema, ruta_archivo)
+        return ruta_archivo
     
-    def generar_examenes(self, cantidad_temas, formato="pdf"):
+    def _notificar(self, tipo, numero_tema, valor=None):
+        """
+        Envía un evento de avance a al_progresar, si alguien lo escucha
+        """
+        if self.al_progresar is not None:
+            self.al_progresar(EventoProgreso(tipo, numero_tema, valor))
+    
+    def generar_examenes(self, cantidad_temas, formato="pdf", procesos=1, semilla=None,
+                         al_terminar_tema=None, recargar_banco=True, al_progresar=None, control=None,
+                         incremental=True, ruta_claves=None, restricciones=None,
+                         balancear_claves=False, ruta_estadisticas=None):
         """
         Genera múltiples versiones de exámenes en el formato especificado
         
         Args:
             cantidad_temas (int): Número de temas diferentes a generar
             formato (str): Formato de los exámenes ("pdf" o "word")
+            procesos (int): Cantidad de procesos para generar temas en paralelo.
+                Con 1 se generan uno tras otro; con None se usa un proceso por núcleo
+            semilla (int): Semilla del lote; con la misma semilla y el mismo banco se
+                obtienen exactamente los mismos temas. Si se omite se elige al azar
+            al_terminar_tema (callable): Función opcional que recibe la cantidad de
+                temas terminados y la ruta del último archivo generado
+            recargar_banco (bool): Si es False se usa el banco ya cargado en lugar de
+                volver a leerlo al iniciar el lote
+            al_progresar (callable): Función opcional que recibe cada EventoProgreso
+                (tema iniciado, páginas maquetadas, bytes escritos, tema terminado).
+                Con varios procesos los eventos llegan a este proceso con un retraso
+                de hasta INTERVALO_EVENTOS segundos
+            control (ControlTrabajo): Control opcional para pausar o cancelar el lote
+                (ver controller.gestor_trabajos). Se consulta antes de empezar cada
+                tema; los temas que ya están en curso se terminan
+            incremental (bool): Si es True, los temas cuyo archivo ya se generó con
+                las mismas entradas (banco, semilla, diseño y formato) no se vuelven a
+                generar; ver controller.manifiesto. Se informan solo con TEMA_TERMINADO
+            ruta_claves (str): Archivo .csv o .npy donde se exportan las claves de
+                respuestas de los temas generados (ver controller.claves). No se
+                escribe si el lote se cancela o si ninguna pregunta del banco tiene
+                alternativa_correcta; la ruta escrita queda en ruta_claves_exportadas
+            restricciones (Restricciones): Distancia mínima entre el orden de preguntas
+                y máximo de respuestas en la misma letra entre cada par de temas (ver
+                model.permutaciones_restringidas). Si se omite, cada tema se baraja por
+                separado
+            balancear_claves (bool): Si es True, la respuesta correcta cae en cada letra
+                en la quinta parte de las preguntas de cada tema y, para cada pregunta,
+                en la quinta parte de los temas (ver model.claves_balanceadas)
+            ruta_estadisticas (str): Archivo .csv donde se informa, por tema generado,
+                cómo quedaron repartidas las respuestas correctas (ver controller.claves)
             
         Returns:
-            list: Lista con las rutas de los archivos generados
+            list: Lista con las rutas de los archivos generados, en orden de tema.
+                Si el lote se cancela, solo las de los temas que llegaron a generarse
         """
-        rutas_archivos = []
+        formato = formato.lower()
+        if formato not in ("pdf", "word"):
+            # Formato no soportado
+            return []
+        
+        # Cargar el banco una sola vez para todo el lote
+        if recargar_banco or not self.banco.cargado:
+            self.refrescar_banco()
+        if restricciones is not None:
+            self.motor = MotorRestringido(semilla, cantidad_temas, restricciones)
+        else:
+            self.motor = MotorPermutaciones(semilla)
+        if balancear_claves:
+            from controller.claves import correctas_banco
+            self.motor = MotorClavesBalanceadas(self.motor, correctas_banco(self.banco.preguntas), cantidad_temas)
+        
+        # Todas las versiones del lote caben en unos pocos bytes cada una
+        versiones = VersionExamen.lote_desde_motor(self.motor, cantidad_temas, len(self.banco))
         
-        for i in range(cantidad_temas):
-            if formato.lower() == "pdf":
-                ruta_archivo = self.generar_examen_pdf(i+1)
-            elif formato.lower() == "word":
-                ruta_archivo = self.generar_examen_word(i+1)
+        # Separar los temas cuyo archivo ya corresponde a estas mismas entradas
+        manifiesto = ManifiestoLote(self.directorio_examenes)
+        huella_comun = huella_lote(formato, huella_banco(self.banco.preguntas), {
+            'portada_precompilada': self.portada_precompilada,
+            'docx_rapido': self.docx_rapido,
+            'pdf_incremental': self.pdf_incremental,
+            'balancear_columnas': self.balancear_columnas
+        })
+        huellas = [huella_version(huella_comun, version) for version in versiones]
+        
+        rutas_archivos = [None] * cantidad_temas
+        pendientes = []
+        for posicion, version in enumerate(versiones):
+            ruta_archivo = self.ruta_version(version, formato)
+            if incremental and manifiesto.vigente(ruta_archivo, huellas[posicion]):
+                rutas_archivos[posicion] = ruta_archivo
             else:
-                # Formato no soportado
-                continue
-                
+                pendientes.append(posicion)
+        
+        reutilizados = 0
+        for version, ruta_archivo in zip(versiones, rutas_archivos):
             if ruta_archivo:
-                rutas_archivos.append(ruta_archivo)
+                reutilizados += 1
+                if al_progresar:
+                    al_progresar(EventoProgreso(TEMA_TERMINADO, version.numero_tema, ruta_archivo))
+                if al_terminar_tema:
+                    al_terminar_tema(reutilizados, ruta_archivo)
+        
+        # Los temas generados se cuentan a continuación de los reutilizados
+        al_terminar_generado = al_terminar_tema
+        if reutilizados and al_terminar_tema:
+            def al_terminar_generado(completados, ruta_archivo):
+                al_terminar_tema(reutilizados + completados, ruta_archivo)
+        
+        if procesos is None:
+            procesos = os.cpu_count() or 1
+        procesos = min(procesos, len(pendientes))
+        
+        a_generar = [versiones[posicion] for posicion in pendientes]
+        if procesos > 1:
+            generados = self._generar_examenes_en_paralelo(
+                a_generar, formato, procesos, al_terminar_generado, al_progresar, control)
+        else:
+            generados = []
+            self.al_progresar = al_progresar
+            try:
+                for i, version in enumerate(a_generar):
+                    # Esperar si el lote está pausado y detenerse si fue cancelado
+                    if control is not None and not control.continuar():
+                        break
+                    
+                    if formato == "pdf":
+                        ruta_archivo = self.generar_version_pdf(version)
+                    else:
+                        ruta_archivo = self.generar_version_word(version)
+                    
+                    generados.append(ruta_archivo)
+                    if al_terminar_generado:
+                        al_terminar_generado(i+1, ruta_archivo)
+            finally:
+                self.al_progresar = None
+        
+        # Registrar las entradas de los temas generados en este lote
+        for posicion, ruta_archivo in zip(pendientes, generados):
+            rutas_archivos[posicion] = ruta_archivo
+            if ruta_archivo:
+                manifiesto.registrar(ruta_archivo, huellas[posicion], self.motor.semilla)
+            else:
+                manifiesto.descartar(self.ruta_version(versiones[posicion], formato))
+        manifiesto.guardar()
+        
+        # Las claves solo incluyen los temas cuyo archivo existe; un lote cancelado
+        # no exporta nada porque sus archivos se descartan
+        escritas = [version for version, ruta in zip(versiones, rutas_archivos) if ruta]
+        if control is not None and control.cancelado:
+            escritas = []
+        
+        self.ruta_claves_exportadas = None
+        if ruta_claves and escritas:
+            from controller.claves import tiene_claves
+            if tiene_claves(self.banco.preguntas):
+                self.ruta_claves_exportadas = self.exportar_claves(escritas, ruta_claves)
+        if ruta_estadisticas and escritas:
+            self.exportar_estadisticas(escritas, ruta_estadisticas)
+        
+        return [ruta for ruta in rutas_archivos if ruta]
+    
+    def exportar_claves(self, versiones, ruta_claves):
+        """
+        Exporta la clave de respuestas de varias versiones en un solo archivo
+        
+        Args:
+            versiones (list): VersionExamen en orden de tema
+            ruta_claves (str): Archivo .csv o .npy de destino
+            
+        Returns:
+            str: Ruta del archivo escrito
+        """
+        from controller.claves import matriz_claves, exportar_claves
+        
+        return exportar_claves(matriz_claves(versiones, self.banco.preguntas), ruta_claves,
+                               [version.numero_tema for version in versiones])
+    
+    def exportar_estadisticas(self, versiones, ruta_estadisticas):
+        """
+        Exporta cómo quedaron repartidas las respuestas correctas de cada versión
+        
+        Args:
+            versiones (list): VersionExamen en orden de tema
+            ruta_estadisticas (str): Archivo .csv de destino
+            
+        Returns:
+            str: Ruta del archivo escrito
+        """
+        from controller.claves import estadisticas_claves, exportar_estadisticas
+        
+        return exportar_estadisticas(estadisticas_claves(versiones, self.banco.preguntas), ruta_estadisticas)
+    
+    def _generar_examenes_en_paralelo(self, versiones, formato, procesos, al_terminar_tema,
+                                      al_progresar=None, control=None):
+        """
+        Reparte los temas entre un pool de procesos
         
-        return rutas_archivos
+        Cada proceso recibe la instantánea del banco una sola vez al iniciar, por lo
+        que ninguno abre su propia conexión a la base de datos; si el banco es un
+        archivo binario solo viaja su ruta y cada proceso lo mapea en memoria. Por
+        cada tema solo viaja su VersionExamen compacta. Los eventos de avance vuelven
+        por una cola que este proceso vacía mientras espera.
+        
+        Solo se encargan unos pocos temas por proceso a la vez, de modo que al pausar
+        o cancelar el lote únicamente terminan los que ya están en curso.
+        
+        Returns:
+            list: Rutas generadas (o None) en orden de tema
+        """
+        import time
+        import queue
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+        
+        cola_eventos = multiprocessing.Queue() if al_progresar else None
+        temas_enviados = 0
+        temas_informados = 0
+        
+        def reenviar_eventos(hasta_terminar=False):
+            # Pasar a al_progresar los eventos que ya enviaron los procesos; al final,
+            # esperar los que siguen en camino hasta recibir el cierre de cada tema
+            nonlocal temas_informados
+            while not hasta_terminar or temas_informados < temas_enviados:
+                try:
+                    if hasta_terminar:
+                        evento = cola_eventos.get(timeout=INTERVALO_EVENTOS * 10)
+                    else:
+                        evento = cola_eventos.get_nowait()
+                except queue.Empty:
+                    return
+                if evento.tipo == TEMA_TERMINADO:
+                    temas_informados += 1
+                al_progresar(evento)
+        
+        with ProcessPoolExecutor(
+            max_workers=procesos,
+            initializer=_inicializar_proceso,
+            initargs=(self.banco.preguntas, self.directorio_examenes, {
+                'portada_precompilada': self.portada_precompilada,
+                'docx_rapido': self.docx_rapido,
+                'pdf_incremental': self.pdf_incremental,
+                'ruta_cache_bloques': self.ruta_cache_bloques,
+                'balancear_columnas': self.balancear_columnas
+            }, cola_eventos)
+        ) as executor:
+            rutas_archivos = [None] * len(versiones)
+            siguientes = iter(enumerate(versiones))
+            en_curso = {}
+            agotado = False
+            completados = 0
+            
+            while True:
+                cancelado = control is not None and control.cancelado
+                detenido = cancelado or (control is not None and control.pausado)
+                
+                if cancelado:
+                    # Descartar los temas encargados que todavía no empezaron
+                    for futuro in [futuro for futuro in en_curso if futuro.cancel()]:
+                        del en_curso[futuro]
+                        temas_enviados -= 1
+                
+                # Mantener ocupados los procesos mientras el lote no esté detenido
+                while not agotado and not detenido and len(en_curso) < procesos * 2:
+                    siguiente = next(siguientes, None)
+                    if siguiente is None:
+                        agotado = True
+                        break
+                    posicion, version = siguiente
+                    en_curso[executor.submit(_generar_version_en_proceso, version, formato)] = posicion
+                    temas_enviados += 1
+                
+                if not en_curso:
+                    if agotado or cancelado:
+                        break
+                    # Pausado sin temas en curso
+                    time.sleep(INTERVALO_EVENTOS)
+                    continue
+                
+                # Notificar el avance a medida que terminan, sin importar el orden
+                terminados, _ = wait(
+                    en_curso,
+                    timeout=INTERVALO_EVENTOS if cola_eventos or control is not None else None,
+                    return_when=FIRST_COMPLETED
+                )
+                if cola_eventos:
+                    reenviar_eventos()
+                
+                for futuro in terminados:
+                    posicion = en_curso.pop(futuro)
+                    rutas_archivos[posicion] = futuro.result()
+                    completados += 1
+                    if al_terminar_tema:
+                        al_terminar_tema(completados, rutas_archivos[posicion])
+            
+            if cola_eventos:
+                reenviar_eventos(hasta_terminar=True)
+            
+            return rutas_archivos
     
-    def generar_pdf(self, preguntas, ruta_archivo, titulo_examen):
+    def generar_pdf(self, preguntas, ruta_archivo, titulo_examen, al_maquetar_pagina=None):
         """
         Genera un archivo PDF con las preguntas del examen
         
         Args:
-            preguntas (list): Lista de objetos Pregunta para el examen
+            preguntas (iterable): Objetos Pregunta o parejas (pregunta, alternativas)
+                como las que produce VersionExamen.resolver()
             ruta_archivo (str): Ruta donde se guardará el archivo PDF
             titulo_examen (str): Título del examen (Tema A, Tema B, etc.)
+            al_maquetar_pagina (callable): Función opcional que recibe la cantidad de
+                páginas maquetadas cada vez que ReportLab termina una
             
         Returns:
             bool: True si el PDF se generó correctamente, False en caso contrario
         """
+        from controller.cache_bloques import configurar_disco
+        
         try:
-            # Configurar el documento
-            doc = BaseDocTemplate(
-                ruta_archivo,
-                pagesize=letter,
-                rightMargin=72,
-                leftMargin=72,
-                topMargin=72,
-                bottomMargin=72
-            )
-            
-            # Estilos
-            styles = getSampleStyleSheet()
-            styles.add(ParagraphStyle(
-                name='TituloPrincipal',
-                fontName='Helvetica-Bold',
-                fontSize=16,
-                alignment=1,  # Centrado
-                spaceBefore=12
-            ))
-            styles.add(ParagraphStyle(
-                name='Pregunta',
-                fontName='Helvetica-Bold',
-                fontSize=11,
-                spaceAfter=6
-            ))
-            styles.add(ParagraphStyle(
-                name='Alternativa',
-                fontName='Helvetica',
-                fontSize=10,
-                leftIndent=20,
-                spaceAfter=3
-            ))
-            
-            # Crear dos columnas para las preguntas (a partir de la segunda página)
-            frame1 = Frame(doc.leftMargin, doc.bottomMargin, doc.width/2-6, doc.height, id='col1')
-            frame2 = Frame(doc.leftMargin+doc.width/2+6, doc.bottomMargin, doc.width/2-6, doc.height, id='col2')
-            two_columns_template = PageTemplate(id='TwoColumns', frames=[frame1, frame2])
-            
-            # Plantilla de página normal (para la primera página)
-            normal_template = PageTemplate(id='Normal', frames=[Frame(doc.leftMargin, doc.bottomMargin, doc.width, doc.height, id='normal')])
-            
-            # Agregar plantillas al documento
-            doc.addPageTemplates([normal_template, two_columns_template])
-            
-            # Contenido del documento
-            contenido = []
+            # Segundo nivel de la caché de párrafos dibujados, compartido entre procesos
+            configurar_disco(self.ruta_cache_bloques)
+            portada = self._plantilla_portada()
             
-            # Agregar portada (primera página)
-            self.agregar_portada(contenido, styles, titulo_examen)
+            if portada is not None:
+                # Con la portada precompilada, las preguntas se maquetan en memoria
+                preguntas = list(preguntas)
+                datos = self._maquetar_pdf(preguntas, io.BytesIO(), titulo_examen, False,
+                                           al_maquetar_pagina).getvalue()
+                try:
+                    datos = portada.unir(datos, titulo_examen)
+                except ValueError as e:
+                    # Estructura inesperada: maquetar el tema completo en lugar de unirlo a ciegas
+                    print(f"No se pudo unir la portada precompilada, se maquetará completa: {e}")
+                    datos = self._maquetar_pdf(preguntas, io.BytesIO(), titulo_examen, True,
+                                               al_maquetar_pagina).getvalue()
+                with open(ruta_archivo, 'wb') as archivo:
+                    archivo.write(datos)
+            else:
+                self._maquetar_pdf(preguntas, ruta_archivo, titulo_examen, True, al_maquetar_pagina)
+            return True
             
+        except Exception as e:
+            print(f"Error al generar el PDF: {e}")
+            return False    
+    
+    def _maquetar_pdf(self, preguntas, destino, titulo_examen, con_portada, al_maquetar_pagina=None):
+        """
+        Maqueta el PDF de un examen con ReportLab
+        
+        Args:
+            preguntas (iterable): Objetos Pregunta o parejas (pregunta, alternativas)
+            destino (str | BytesIO): Archivo o buffer donde se escribe el PDF
+            titulo_examen (str): Título del examen (Tema A, Tema B, etc.)
+            con_portada (bool): Si es False solo se incluye el salto con que termina
+                la portada (la portada precompilada se une después)
+            al_maquetar_pagina (callable): Función opcional que recibe la cantidad de
+                páginas maquetadas cada vez que ReportLab termina una
+        
+        Returns:
+            str | BytesIO: El mismo destino, ya escrito
+        """
+        # ReportLab se carga con el primer PDF, no al importar este módulo
+        from reportlab.platypus import BaseDocTemplate
+        from controller.recursos_render import TAMANO_PAGINA, MARGEN, obtener_estilos, obtener_plantillas
+        from controller.flujo_pdf import FlujoFlowables, CanvasIncremental
+        from controller.cache_bloques import guardar_disco
+        
+        # Configurar el documento
+        doc = BaseDocTemplate(
+            destino,
+            pagesize=TAMANO_PAGINA,
+            rightMargin=MARGEN,
+            leftMargin=MARGEN,
+            topMargin=MARGEN,
+            bottomMargin=MARGEN
+        )
+        
+        # Estilos y plantillas propios de este documento
+        styles = obtener_estilos()
+        doc.addPageTemplates(obtener_plantillas())
+        
+        if al_maquetar_pagina:
+            def al_avanzar(tipo, valor):
+                if tipo == 'PAGE':
+                    al_maquetar_pagina(valor)
+            doc.setProgressCallBack(al_avanzar)
+        
+        # Contenido del documento
+        contenido = self._contenido_pdf(preguntas, styles, titulo_examen, con_portada)
+        if self.pdf_incremental:
+            # Cada flowable se crea justo antes de maquetarse
+            contenido = FlujoFlowables(contenido)
+        else:
+            contenido = list(contenido)
+        
+        # Construir el documento
+        if self.pdf_incremental:
+            doc.build(contenido, canvasmaker=CanvasIncremental)
+        else:
+            doc.build(contenido)
+        guardar_disco()
+        
+        return destino
+    
+    def _contenido_pdf(self, preguntas, styles, titulo_examen, con_portada=True):
+        """
+        Genera, en orden, los flowables del PDF de un examen
+        
+        Args:
+            preguntas (iterable): Objetos Pregunta o parejas (pregunta, alternativas)
+            styles (StyleSheet1): Estilos de ReportLab
+            titulo_examen (str): Título del examen (Tema A, Tema B, etc.)
+            con_portada (bool): Si es False solo se incluye el salto con que termina
+                la portada (la portada precompilada se une después)
+            
+        Yields:
+            Flowable: Cada elemento del documento
+        """
+        from reportlab.platypus import Paragraph, Spacer, NextPageTemplate, FrameBreak
+        
+        if con_portada:
+            # Agregar portada (primera página)
+            portada = []
+            self.agregar_portada(portada, styles, titulo_examen)
+            yield from portada
+        else:
+            yield Paragraph(_SALTO_PORTADA, styles['Normal'])
+        
+        encabezado = [
             # Cambiar a la plantilla de dos columnas para las preguntas
-            contenido.append(NextPageTemplate('TwoColumns'))
+            NextPageTemplate('TwoColumns'),
             
             # Agregar título en la segunda página
-            contenido.append(Paragraph(f"EXAMEN DE ADMISIÓN - {titulo_examen}", styles['TituloPrincipal']))
-            contenido.append(Spacer(1, 12))
+            Paragraph(f"EXAMEN DE ADMISIÓN - {titulo_examen}", styles['TituloPrincipal']),
+            Spacer(1, 12),
             
             # Agregar instrucciones
-            contenido.append(Paragraph(
+            Paragraph(
                 "Instrucciones: Marque la alternativa correcta para cada pregunta.",
                 styles['Italic']
-            ))
-            contenido.append(Spacer(1, 12))
+            ),
+            Spacer(1, 12)
+        ]
+        yield from encabezado
+        
+        preguntas = _con_alternativas(preguntas)
+        cortes = None
+        if self.balancear_columnas and not self.pdf_incremental:
+            # Las columnas se deciden antes con las alturas medidas de cada pregunta;
+            # el modo incremental no puede hacerlo sin tener todo el banco en memoria
+            preguntas = list(preguntas)
+            cortes = self._planificar_columnas(preguntas, styles, encabezado)
+        
+        # Sin plan, las preguntas fluyen de la primera columna a la segunda; con él,
+        # cada columna empieza donde se decidió y el espacio entre preguntas no
+        # queda arriba de ninguna
+        for i, (pregunta, alternativas) in enumerate(preguntas, start=1):
+            bloque = self._bloque_pdf(i, pregunta, alternativas, styles)
+            if not cortes:
+                yield from bloque
+                continue
             
-            # Dividir preguntas en dos columnas
-            mitad = len(preguntas) // 2
-            preguntas_col1 = preguntas[:mitad]
-            preguntas_col2 = preguntas[mitad:]
-            
-            # Agregar preguntas a la primera columna
-            for i, pregunta in enumerate(preguntas_col1):
-                # Número y enunciado de la pregunta
-                contenido.append(Paragraph(
-                    f"{i+1}. {pregunta.enunciado}",
-                    styles['Pregunta']
-                ))
-                
-                # Alternativas
-                contenido.append(Paragraph(f"a) {pregunta.alternativa_a}", styles['Alternativa']))
-                contenido.append(Paragraph(f"b) {pregunta.alternativa_b}", styles['Alternativa']))
-                contenido.append(Paragraph(f"c) {pregunta.alternativa_c}", styles['Alternativa']))
-                contenido.append(Paragraph(f"d) {pregunta.alternativa_d}", styles['Alternativa']))
-                contenido.append(Paragraph(f"e) {pregunta.alternativa_e}", styles['Alternativa']))
-                
-                contenido.append(Spacer(1, 12))
-            
-            # Agregar preguntas a la segunda columna
-            for i, pregunta in enumerate(preguntas_col2):
-                # Número y enunciado de la pregunta
-                contenido.append(Paragraph(
-                    f"{i+1 + mitad}. {pregunta.enunciado}",
-                    styles['Pregunta']
-                ))
-                
-                # Alternativas
-                contenido.append(Paragraph(f"a) {pregunta.alternativa_a}", styles['Alternativa']))
-                contenido.append(Paragraph(f"b) {pregunta.alternativa_b}", styles['Alternativa']))
-                contenido.append(Paragraph(f"c) {pregunta.alternativa_c}", styles['Alternativa']))
-                contenido.append(Paragraph(f"d) {pregunta.alternativa_d}", styles['Alternativa']))
-                contenido.append(Paragraph(f"e) {pregunta.alternativa_e}", styles['Alternativa']))
-                
-                contenido.append(Spacer(1, 12))
+            for indice, flowable in enumerate(bloque[:_PARRAFOS_PREGUNTA]):
+                lineas = cortes.get((i - 1) * _PARRAFOS_PREGUNTA + indice, ())
+                if 0 in lineas:
+                    yield FrameBreak()
+                elif indice == 0 and i > 1:
+                    yield bloque[-1]
+                yield from self._partir_parrafo(flowable, [linea for linea in lineas if linea])
+    
+    def _partir_parrafo(self, parrafo, lineas):
+        """
+        Reparte un párrafo del PDF entre varias columnas, según el plan de columnas
+        
+        Args:
+            parrafo (Paragraph): Párrafo a imprimir
+            lineas (list): Líneas del párrafo (desde 0) que empiezan una columna nueva,
+                en orden
             
-            # Construir el documento
-            doc.build(contenido)
-            return True
+        Yields:
+            Flowable: Trozos del párrafo separados por saltos de columna
+        """
+        if not lineas:
+            yield parrafo
+            return
+        
+        from reportlab import rl_config
+        from reportlab.platypus import FrameBreak
+        from controller.recursos_render import obtener_plantillas
+        from controller.maquetacion import marco_disponible
+        
+        ancho = marco_disponible(obtener_plantillas()[1].frames[0]).ancho
+        anterior = 0
+        for linea in lineas:
+            trozo, parrafo = parrafo.split(ancho, (linea - anterior) * parrafo.style.leading + rl_config._FUZZ)
+            yield trozo
+            yield FrameBreak()
+            anterior = linea
+        yield parrafo
+    
+    def _bloque_pdf(self, numero, pregunta, alternativas, styles):
+        """
+        Flowables de una pregunta del PDF
+        
+        Args:
+            numero (int): Número de la pregunta en el examen
+            pregunta (Pregunta): Pregunta a imprimir
+            alternativas (sequence): Alternativas en el orden a imprimir
+            styles (StyleSheet1): Estilos de ReportLab
+            
+        Returns:
+            list: Enunciado, alternativas y el espacio que la separa de la siguiente
+        """
+        from reportlab.platypus import Spacer
+        from controller.cache_parrafos import parrafo
+        
+        # Número y enunciado de la pregunta
+        bloque = [parrafo(f"{numero}. ", pregunta.enunciado, styles['Pregunta'])]
+        
+        # Alternativas
+        for letra, alternativa in zip(LETRAS_ALTERNATIVAS, alternativas):
+            bloque.append(parrafo(f"{letra}) ", alternativa, styles['Alternativa']))
+        
+        bloque.append(Spacer(1, 12))
+        return bloque
+    
+    def _planificar_columnas(self, preguntas, styles, encabezado):
+        """
+        Decide en qué párrafo de qué pregunta (y en qué línea) empieza cada columna del PDF
+        
+        Args:
+            preguntas (list): Parejas (pregunta, alternativas) en el orden del examen
+            styles (StyleSheet1): Estilos de ReportLab
+            encabezado (list): Flowables que preceden a las preguntas en su primera página
             
+        Returns:
+            dict: Líneas (desde 0) donde empieza una columna, por párrafo
+                (pregunta * _PARRAFOS_PREGUNTA + párrafo, desde 0), o None si las
+                preguntas deben fluir sin plan
+        """
+        from reportlab.platypus import Spacer
+        from reportlab.pdfbase.pdfmetrics import stringWidth
+        from controller.recursos_render import obtener_plantillas
+        from controller.maquetacion import marco_disponible, medir, medida_guardada, planificar_columnas
+        from controller.cache_bloques import huella_estilo
+        
+        normal, dos_columnas = obtener_plantillas()
+        primer_marco = marco_disponible(normal.frames[0])
+        estilo = styles['Pregunta']
+        huella_pregunta = huella_estilo(estilo)
+        huella_alternativa = huella_estilo(styles['Alternativa'])
+        
+        cantidad = len(preguntas) * _PARRAFOS_PREGUNTA
+        
+        def medir_parrafo(indice, ancho):
+            posicion, parrafo = divmod(indice, _PARRAFOS_PREGUNTA)
+            pregunta, alternativas = preguntas[posicion]
+            # La altura solo depende del estilo, del texto y de su letra (o del ancho
+            # del número), así que se reutiliza entre versiones y preguntas
+            if parrafo == 0:
+                clave = (huella_pregunta, stringWidth(f"{posicion + 1}. ", estilo.fontName, estilo.fontSize),
+                         pregunta.enunciado)
+            else:
+                clave = (huella_alternativa, LETRAS_ALTERNATIVAS[parrafo - 1], alternativas[parrafo - 1])
+            return medida_guardada(clave, ancho, lambda: self._bloque_pdf(
+                posicion + 1, pregunta, alternativas, styles)[parrafo:parrafo + 1])
+        
+        interlineados = (estilo.leading, styles['Alternativa'].leading)
+        
+        def interlineado(indice):
+            return interlineados[indice % _PARRAFOS_PREGUNTA != 0]
+        
+        # Cortar justo después de un enunciado lo deja solo al pie de la columna
+        cortes = planificar_columnas(
+            cantidad, medir_parrafo, primer_marco,
+            marco_disponible(dos_columnas.frames[0]), len(dos_columnas.frames),
+            medir(encabezado, primer_marco.ancho), set(range(0, cantidad, _PARRAFOS_PREGUNTA)),
+            medir([Spacer(1, 12)], primer_marco.ancho), set(range(1, cantidad, _PARRAFOS_PREGUNTA)),
+            interlineado
+        )
+        if cortes is None:
+            return None
+        
+        lineas = {}
+        for parrafo, linea in cortes:
+            lineas.setdefault(parrafo, []).append(linea)
+        return lineas
+    
+    def _plantilla_portada(self):
+        """
+        Devuelve la portada precompilada si este modo está activo
+        
+        Si la portada no puede prepararse, se vuelve a maquetarla en cada PDF.
+        
+        Returns:
+            PlantillaPortada: Portada lista para unirse, o None si no se usa este modo
+        """
+        if not self.portada_precompilada:
+            return None
+        
+        try:
+            from controller.portada_pdf import obtener_plantilla_portada
+            return obtener_plantilla_portada(self)
         except Exception as e:
-            print(f"Error al generar el PDF: {e}")
-            return False    
+            print(f"No se pudo precompilar la portada, se maquetará en cada tema: {e}")
+            self.portada_precompilada = False
+            return None
     
-    def agregar_portada(self, contenido, styles, titulo_examen):
+    def agregar_portada(self, contenido, styles, titulo_examen, plantilla=False):
         """
         Agrega una portada al documento PDF
+        
+        Args:
+            contenido (list): Flowables del documento
+            styles (StyleSheet1): Estilos de ReportLab
+            titulo_examen (str): Título del examen (Tema A, Tema B, etc.)
+            plantilla (bool): Si es True, se deja vacío el lugar del tema y se omite
+                el salto de página, para usar la portada como plantilla
+        
+        Returns:
+            Flowable: Párrafo del tema (o su ranura, en modo plantilla)
         """
-        # Crear estilos específicos para la portada
-        styles.add(ParagraphStyle(
-            name='UniversidadTitulo',
-            fontName='Helvetica-Bold',
-            fontSize=18,
-            leading=30,
-            alignment=1,
-            spaceAfter=30
-        ))
+        from reportlab.platypus import Paragraph, Spacer
+        from controller.recursos_render import LogoPortada, obtener_logo
+        from controller.portada_pdf import RanuraTema
+        
+        # Los estilos de la portada ya vienen en la hoja de obtener_estilos()
         
-        styles.add(ParagraphStyle(
-            name='ExamenTitulo',
-            fontName='Helvetica-Bold',
-            fontSize=26,
-            alignment=1,
-            leading=30,
-        ))
-
-        styles.add(ParagraphStyle(
-            name='Tema',
-            fontName='Helvetica-Bold',
-            fontSize=32,
-            alignment=1,
-            leading=30,
-            spaceBefore=20,
-            spaceAfter=20
-        ))
-
         # Nombre de la universidad (en dos líneas)
         contenido.append(Paragraph(
             'UNIVERSIDAD NACIONAL "SAN LUIS<br/>GONZAGA"',
@@ -278,12 +904,9 @@ class ExamenGenerator:
         contenido.append(Spacer(1, 0))
         
         # Logo
-        logo_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'images', 'logo.png')
-        if os.path.exists(logo_path):
-            img = Image(logo_path)
-            img.drawHeight = 5*inch
-            img.drawWidth = 5*inch
-            contenido.append(img)
+        logo = obtener_logo()
+        if logo is not None:
+            contenido.append(LogoPortada(logo))
         
         # Espacio después del logo
         contenido.append(Spacer(1, 0))
@@ -302,10 +925,14 @@ class ExamenGenerator:
         contenido.append(Spacer(1, 0))
         
         # Tema
-        contenido.append(Paragraph(
+        tema = Paragraph(
             f"TEMA: ({titulo_examen[-1]})",
             styles['Tema']
-        ))
+        )
+        if plantilla:
+            # Solo se reserva el lugar; la letra se dibuja en cada versión
+            tema = RanuraTema(tema)
+        contenido.append(tema)
         
         # Espacio antes del pie de página
         contenido.append(Spacer(1, 0))
@@ -313,24 +940,22 @@ class ExamenGenerator:
         # Pie de página
         contenido.append(Paragraph(
             "UNIVERSIDAD LICENCIADA POR SUNEDU",
-            ParagraphStyle(
-                'PiePagina',
-                parent=styles['Normal'],
-                alignment=1,
-                spaceBefore=14,
-                fontSize=16
-            )
+            styles['PiePagina']
         ))
         
         # Salto de página
-        contenido.append(Paragraph("<br clear=all style='page-break-before:always'/>", styles['Normal']))
+        if not plantilla:
+            contenido.append(Paragraph(_SALTO_PORTADA, styles['Normal']))
         
+        return tema
+    
     def generar_word(self, preguntas, ruta_archivo, titulo_examen):
         """
         Genera un archivo Word con las preguntas del examen
         
         Args:
-            preguntas (list): Lista de objetos Pregunta para el examen
+            preguntas (iterable): Objetos Pregunta o parejas (pregunta, alternativas)
+                como las que produce VersionExamen.resolver()
             ruta_archivo (str): Ruta donde se guardará el archivo Word
             titulo_examen (str): Título del examen (Tema A, Tema B, etc.)
             
@@ -338,94 +963,21 @@ class ExamenGenerator:
             bool: True si el Word se generó correctamente, False en caso contrario
         """
         try:
-            # Crear un nuevo documento
-            doc = Document()
-            
-            # Configurar estilos
-            styles = doc.styles
-            
-            # Estilo para título principal
-            titulo_style = styles.add_style('TituloPrincipal', WD_STYLE_TYPE.PARAGRAPH)
-            titulo_style.font.name = 'Arial'
-            titulo_style.font.size = Pt(16)
-            titulo_style.font.bold = True
-            
-            # Estilo para preguntas
-            pregunta_style = styles.add_style('Pregunta', WD_STYLE_TYPE.PARAGRAPH)
-            pregunta_style.font.name = 'Arial'
-            pregunta_style.font.size = Pt(11)
-            pregunta_style.font.bold = True
-            
-            # Estilo para alternativas
-            alternativa_style = styles.add_style('Alternativa', WD_STYLE_TYPE.PARAGRAPH)
-            alternativa_style.font.name = 'Arial'
-            alternativa_style.font.size = Pt(10)
-            alternativa_style.paragraph_format.left_indent = Inches(0.25)
+            # Dividir preguntas en dos columnas
+            preguntas = list(_con_alternativas(preguntas))
+            mitad = self._corte_word(preguntas)
             
-            # Agregar portada
-            self._agregar_portada_word(doc, titulo_examen)
+            plantilla = self._plantilla_word()
+            if plantilla is not None:
+                # Escribir directamente el paquete a partir de la plantilla
+                plantilla.escribir(preguntas, ruta_archivo, titulo_examen, mitad)
+                return True
             
-            # Agregar título en la segunda página
-            titulo = doc.add_paragraph(f"EXAMEN DE ADMISIÓN - {titulo_examen}", 'TituloPrincipal')
-            titulo.alignment = WD_ALIGN_PARAGRAPH.CENTER
-            doc.add_paragraph()
-            
-            # Agregar instrucciones
-            instrucciones = doc.add_paragraph("Instrucciones: Marque la alternativa correcta para cada pregunta.")
-            # Crear o configurar estilo Italic
-            if 'Italic' not in styles:
-                italic_style = styles.add_style('Italic', WD_STYLE_TYPE.PARAGRAPH)
-                italic_style.font.name = 'Arial'
-                italic_style.font.size = Pt(10)
-                italic_style.font.italic = True
-            else:
-                # Asegurar que el estilo tenga la propiedad italic configurada
-                styles['Italic'].font.italic = True
-                styles['Italic'].font.name = 'Arial'
-                styles['Italic'].font.size = Pt(10)
-            instrucciones.style = styles['Italic']
-            doc.add_paragraph()
-            
-            # Dividir preguntas en dos columnas
-            mitad = len(preguntas) // 2
-            preguntas_col1 = preguntas[:mitad]
-            preguntas_col2 = preguntas[mitad:]
-            
-            # Crear una tabla para las dos columnas
-            table = doc.add_table(rows=1, cols=2)
-            table.autofit = False
-            table.columns[0].width = Inches(3.5)
-            table.columns[1].width = Inches(3.5)
-            
-            # Agregar preguntas a la primera columna
-            cell = table.cell(0, 0)
-            for i, pregunta in enumerate(preguntas_col1):
-                # Número y enunciado de la pregunta
-                p = cell.add_paragraph(f"{i+1}. {pregunta.enunciado}", 'Pregunta')
-                
-                # Alternativas
-                cell.add_paragraph(f"a) {pregunta.alternativa_a}", 'Alternativa')
-                cell.add_paragraph(f"b) {pregunta.alternativa_b}", 'Alternativa')
-                cell.add_paragraph(f"c) {pregunta.alternativa_c}", 'Alternativa')
-                cell.add_paragraph(f"d) {pregunta.alternativa_d}", 'Alternativa')
-                cell.add_paragraph(f"e) {pregunta.alternativa_e}", 'Alternativa')
-                
-                cell.add_paragraph()
+            doc, table = self._documento_word(titulo_examen)
             
-            # Agregar preguntas a la segunda columna
-            cell = table.cell(0, 1)
-            for i, pregunta in enumerate(preguntas_col2):
-                # Número y enunciado de la pregunta
-                p = cell.add_paragraph(f"{i+1 + mitad}. {pregunta.enunciado}", 'Pregunta')
-                
-                # Alternativas
-                cell.add_paragraph(f"a) {pregunta.alternativa_a}", 'Alternativa')
-                cell.add_paragraph(f"b) {pregunta.alternativa_b}", 'Alternativa')
-                cell.add_paragraph(f"c) {pregunta.alternativa_c}", 'Alternativa')
-                cell.add_paragraph(f"d) {pregunta.alternativa_d}", 'Alternativa')
-                cell.add_paragraph(f"e) {pregunta.alternativa_e}", 'Alternativa')
-                
-                cell.add_paragraph()
+            # Agregar preguntas a cada columna
+            self._agregar_preguntas_word(table.cell(0, 0), preguntas[:mitad], 1)
+            self._agregar_preguntas_word(table.cell(0, 1), preguntas[mitad:], mitad + 1)
             
             # Guardar el documento
             doc.save(ruta_archivo)
@@ -435,14 +987,168 @@ class ExamenGenerator:
             print(f"Error al generar el Word: {e}")
             return False
     
-    def _agregar_portada_word(self, doc, titulo_examen):
+    def _corte_word(self, preguntas):
+        """
+        Cantidad de preguntas de la primera columna del Word
+        
+        Word reparte el texto de cada celda por su cuenta, así que la altura de cada
+        pregunta se estima con las métricas de Helvetica (iguales a las de Arial)
+        y las preguntas se dividen donde las dos columnas quedan más parejas.
+        
+        Args:
+            preguntas (list): Parejas (pregunta, alternativas) en el orden del examen
+            
+        Returns:
+            int: Preguntas de la primera columna; la mitad si no se balancean las columnas
+        """
+        if not self.balancear_columnas or len(preguntas) < 2:
+            return len(preguntas) // 2
+        
+        from controller.maquetacion import Medida, alto_texto, dividir_en_dos
+        
+        # La sangría de las alternativas es de 0,25 pulgadas
+        ancho_alternativa = _ANCHO_COLUMNA_WORD - 18
+        medidas = []
+        for i, (pregunta, alternativas) in enumerate(preguntas, start=1):
+            alto = alto_texto(f"{i}. {pregunta.enunciado}", 'Helvetica-Bold', 11,
+                              _ANCHO_COLUMNA_WORD, _INTERLINEADO_WORD)
+            for letra, alternativa in zip(LETRAS_ALTERNATIVAS, alternativas):
+                alto += alto_texto(f"{letra}) {alternativa}", 'Helvetica', 10,
+                                   ancho_alternativa, _INTERLINEADO_WORD)
+            # Párrafo vacío que separa una pregunta de la siguiente
+            alto += 11 * _INTERLINEADO_WORD
+            medidas.append(Medida(0, alto, 0))
+        
+        return dividir_en_dos(medidas)[0]
+    
+    def _plantilla_word(self):
+        """
+        Devuelve la plantilla del escritor rápido de Word si este modo está activo
+        
+        Si la plantilla no puede prepararse, se vuelve a usar python-docx.
+        
+        Returns:
+            PlantillaWord: Plantilla lista para escribir, o None si no se usa este modo
+        """
+        if not self.docx_rapido:
+            return None
+        
+        try:
+            from controller.docx_rapido import obtener_plantilla_word
+            return obtener_plantilla_word(self)
+        except Exception as e:
+            print(f"No se pudo preparar la plantilla de Word, se usará python-docx: {e}")
+            self.docx_rapido = False
+            return None
+    
+    def _documento_word(self, titulo_examen, letra_tema=None):
+        """
+        Crea el documento Word con estilos, portada, título y la tabla de dos columnas vacía
+        
+        Args:
+            titulo_examen (str): Título del examen (Tema A, Tema B, etc.)
+            letra_tema (str): Letra de la portada; por defecto la última del título
+            
+        Returns:
+            tuple: (Document, tabla de una fila y dos columnas para las preguntas)
+        """
+        # python-docx se carga con el primer Word, no al importar este módulo
+        from docx import Document
+        from docx.shared import Pt, Inches
+        from docx.enum.text import WD_ALIGN_PARAGRAPH
+        from docx.enum.style import WD_STYLE_TYPE
+        
+        # Crear un nuevo documento
+        doc = Document()
+        
+        # Configurar estilos
+        styles = doc.styles
+        
+        # Estilo para título principal
+        titulo_style = styles.add_style('TituloPrincipal', WD_STYLE_TYPE.PARAGRAPH)
+        titulo_style.font.name = 'Arial'
+        titulo_style.font.size = Pt(16)
+        titulo_style.font.bold = True
+        
+        # Estilo para preguntas
+        pregunta_style = styles.add_style('Pregunta', WD_STYLE_TYPE.PARAGRAPH)
+        pregunta_style.font.name = 'Arial'
+        pregunta_style.font.size = Pt(11)
+        pregunta_style.font.bold = True
+        
+        # Estilo para alternativas
+        alternativa_style = styles.add_style('Alternativa', WD_STYLE_TYPE.PARAGRAPH)
+        alternativa_style.font.name = 'Arial'
+        alternativa_style.font.size = Pt(10)
+        alternativa_style.paragraph_format.left_indent = Inches(0.25)
+        
+        # Agregar portada
+        self._agregar_portada_word(doc, titulo_examen, letra_tema)
+        
+        # Agregar título en la segunda página
+        titulo = doc.add_paragraph(f"EXAMEN DE ADMISIÓN - {titulo_examen}", 'TituloPrincipal')
+        titulo.alignment = WD_ALIGN_PARAGRAPH.CENTER
+        doc.add_paragraph()
+        
+        # Agregar instrucciones
+        instrucciones = doc.add_paragraph("Instrucciones: Marque la alternativa correcta para cada pregunta.")
+        # Crear o configurar estilo Italic
+        if 'Italic' not in styles:
+            italic_style = styles.add_style('Italic', WD_STYLE_TYPE.PARAGRAPH)
+            italic_style.font.name = 'Arial'
+            italic_style.font.size = Pt(10)
+            italic_style.font.italic = True
+        else:
+            # Asegurar que el estilo tenga la propiedad italic configurada
+            styles['Italic'].font.italic = True
+            styles['Italic'].font.name = 'Arial'
+            styles['Italic'].font.size = Pt(10)
+        instrucciones.style = styles['Italic']
+        doc.add_paragraph()
+        
+        # Crear una tabla para las dos columnas
+        table = doc.add_table(rows=1, cols=2)
+        table.autofit = False
+        table.columns[0].width = Inches(3.5)
+        table.columns[1].width = Inches(3.5)
+        
+        return doc, table
+    
+    def _agregar_preguntas_word(self, cell, preguntas, primer_numero):
+        """
+        Agrega las preguntas de una columna a su celda de la tabla
+        
+        Args:
+            cell (_Cell): Celda de la columna
+            preguntas (list): Parejas (pregunta, alternativas) de la columna
+            primer_numero (int): Número de la primera pregunta de la columna
+        """
+        for i, (pregunta, alternativas) in enumerate(preguntas, start=primer_numero):
+            # Número y enunciado de la pregunta
+            cell.add_paragraph(f"{i}. {pregunta.enunciado}", 'Pregunta')
+            
+            # Alternativas
+            for letra, alternativa in zip(LETRAS_ALTERNATIVAS, alternativas):
+                cell.add_paragraph(f"{letra}) {alternativa}", 'Alternativa')
+            
+            cell.add_paragraph()
+    
+    def _agregar_portada_word(self, doc, titulo_examen, letra_tema=None):
         """
         Agrega una portada al documento Word
         
         Args:
             doc (Document): Documento Word
             titulo_examen (str): Título del examen (Tema A, Tema B, etc.)
+            letra_tema (str): Letra del tema; por defecto la última del título
         """
+        from docx.shared import Pt, Inches
+        from docx.enum.text import WD_ALIGN_PARAGRAPH
+        from docx.enum.style import WD_STYLE_TYPE
+        
+        if letra_tema is None:
+            letra_tema = titulo_examen[-1]
+        
         # Crear estilos para la portada
         styles = doc.styles
         
@@ -488,7 +1194,7 @@ class ExamenGenerator:
         modalidad.alignment = WD_ALIGN_PARAGRAPH.CENTER
         
         # Tema
-        tema = doc.add_paragraph(f"TEMA: ({titulo_examen[-1]})", 'Tema')
+        tema = doc.add_paragraph(f"TEMA: ({letra_tema})", 'Tema')
         tema.alignment = WD_ALIGN_PARAGRAPH.CENTER
         
         # Espacio antes del pie de página
@@ -0,0 +1,126 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Módulo que entrega los flowables de un PDF a ReportLab a medida que los pide,
+en lugar de construir antes la lista completa
+"""
+
+from reportlab import rl_config
+from reportlab.pdfgen.canvas import Canvas
+from reportlab.pdfbase.pdfdoc import (
+    PDFStream, PDFDictionary, PDFArray, PDFName, PDFZCompress, PDFBase85Encode
+)
+
+class FlujoFlowables:
+    """
+    Lista perezosa de flowables para BaseDocTemplate.build()
+    
+    ReportLab consume la lista de contenido desde el inicio: mira el primero, lo
+    quita y, si lo parte entre columnas, vuelve a insertar los restos al inicio.
+    Esta clase ofrece esas mismas operaciones sobre un generador, de modo que
+    cada flowable se crea justo antes de maquetarse y se libera al dibujarse.
+    Así la memoria no crece con la cantidad de preguntas del examen.
+    """
+    
+    def __init__(self, flowables):
+        """
+        Constructor de la clase FlujoFlowables
+        
+        Args:
+            flowables (iterable): Generador de los flowables del documento, en orden
+        """
+        self._origen = iter(flowables)
+        self._pendientes = []
+        self._agotado = False
+    
+    def _traer(self):
+        """
+        Agrega el siguiente flowable del generador a los pendientes
+        
+        Returns:
+            bool: False si el generador ya no tiene más flowables
+        """
+        if self._agotado:
+            return False
+        try:
+            self._pendientes.append(next(self._origen))
+        except StopIteration:
+            self._agotado = True
+            return False
+        return True
+    
+    def _completar(self, cantidad):
+        """
+        Trae flowables hasta tener al menos la cantidad indicada (o agotar el generador)
+        """
+        while len(self._pendientes) < cantidad and self._traer():
+            pass
+    
+    def __len__(self):
+        # Basta con saber si queda contenido, pero una cadena de keepWithNext
+        # debe estar completa para que ReportLab la agrupe correctamente
+        self._completar(1)
+        while self._pendientes and self._pendientes[-1].getKeepWithNext() and self._traer():
+            pass
+        return len(self._pendientes)
+    
+    def __bool__(self):
+        return len(self) > 0
+    
+    def __getitem__(self, posicion):
+        if isinstance(posicion, slice):
+            self._completar(posicion.stop if posicion.stop is not None else float('inf'))
+        else:
+            self._completar(posicion + 1)
+        return self._pendientes[posicion]
+    
+    def __setitem__(self, posicion, valor):
+        self._pendientes[posicion] = valor
+    
+    def __delitem__(self, posicion):
+        if isinstance(posicion, slice):
+            self._completar(posicion.stop if posicion.stop is not None else float('inf'))
+        else:
+            self._completar(posicion + 1)
+        del self._pendientes[posicion]
+    
+    def insert(self, posicion, flowable):
+        self._pendientes.insert(posicion, flowable)
+
+class CanvasIncremental(Canvas):
+    """
+    Canvas que comprime cada página apenas se termina
+    
+    ReportLab guarda el contenido de todas las páginas como texto hasta save().
+    Aquí, al cerrar cada página su contenido se comprime con los mismos filtros
+    que aplicaría al guardar, de modo que el documento final es idéntico y lo que
+    queda en memoria por página es solo su versión comprimida.
+    """
+    
+    def showPage(self):
+        Canvas.showPage(self)
+        
+        pagina = self._doc.Pages.pages[-1]
+        if pagina.Contents or not pagina.stream:
+            return
+        
+        filtros = []
+        if pagina.compression:
+            filtros = [PDFBase85Encode, PDFZCompress] if rl_config.useA85 else [PDFZCompress]
+        
+        # Aplicar los filtros en el mismo orden que PDFStream.format()
+        contenido = pagina.stream
+        nombres = []
+        for filtro in reversed(filtros):
+            contenido = filtro.encode(contenido)
+            nombres.insert(0, PDFName(filtro.pdfname))
+        
+        diccionario = PDFDictionary()
+        if nombres:
+            diccionario["Filter"] = PDFArray(nombres)
+        
+        stream = PDFStream(diccionario, contenido)
+        stream.__Comment__ = "page stream"
+        pagina.Contents = stream
+        pagina.stream = None
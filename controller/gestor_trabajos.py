@@ -0,0 +1,300 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Módulo que administra una cola de trabajos de generación en segundo plano, que
+pueden pausarse o cancelarse mientras corren
+"""
+
+import os
+import queue
+import itertools
+import threading
+from controller.progreso import TEMA_INICIADO, TEMA_TERMINADO
+
+# Estados de un trabajo
+PENDIENTE = "pendiente"
+EN_CURSO = "en_curso"
+PAUSADO = "pausado"
+CANCELADO = "cancelado"
+TERMINADO = "terminado"
+FALLIDO = "fallido"
+
+class ControlTrabajo:
+    """
+    Señales para pausar, reanudar o cancelar un lote entre un tema y el siguiente
+    
+    ExamenGenerator.generar_examenes() lo consulta antes de empezar cada tema;
+    los temas que ya están en curso se terminan.
+    """
+    
+    def __init__(self):
+        """
+        Constructor de la clase ControlTrabajo
+        """
+        self._cancelado = threading.Event()
+        self._activo = threading.Event()
+        self._activo.set()
+    
+    @property
+    def cancelado(self):
+        """
+        Indica si se pidió cancelar el lote
+        """
+        return self._cancelado.is_set()
+    
+    @property
+    def pausado(self):
+        """
+        Indica si el lote está pausado
+        """
+        return not self._activo.is_set()
+    
+    def pausar(self):
+        """
+        Pausa el lote antes del siguiente tema
+        """
+        self._activo.clear()
+    
+    def reanudar(self):
+        """
+        Reanuda un lote pausado
+        """
+        self._activo.set()
+    
+    def cancelar(self):
+        """
+        Cancela el lote; si estaba pausado, lo libera para que termine
+        """
+        self._cancelado.set()
+        self._activo.set()
+    
+    def continuar(self):
+        """
+        Espera mientras el lote esté pausado
+        
+        Returns:
+            bool: True si debe generarse el siguiente tema, False si fue cancelado
+        """
+        self._activo.wait()
+        return not self._cancelado.is_set()
+
+class Trabajo:
+    """
+    Lote de exámenes enviado al gestor, con su estado y resultado
+    """
+    
+    def __init__(self, id_trabajo, cantidad_temas, formato, opciones, al_progresar, al_terminar):
+        """
+        Constructor de la clase Trabajo
+        
+        Args:
+            id_trabajo (int): Identificador del trabajo dentro del gestor
+            cantidad_temas (int): Cantidad de temas del lote
+            formato (str): Formato de los exámenes ("pdf" o "word")
+            opciones (dict): Argumentos adicionales para generar_examenes()
+            al_progresar (callable): Función que recibe los EventoProgreso del lote
+            al_terminar (callable): Función que recibe el trabajo al finalizar
+        """
+        self.id = id_trabajo
+        self.cantidad_temas = cantidad_temas
+        self.formato = formato
+        self.opciones = opciones
+        self.al_progresar = al_progresar
+        self.al_terminar = al_terminar
+        self.control = ControlTrabajo()
+        self.rutas = []
+        self.error = None
+        self._estado = PENDIENTE
+    
+    @property
+    def estado(self):
+        """
+        Estado actual del trabajo (PENDIENTE, EN_CURSO, PAUSADO, CANCELADO, TERMINADO o FALLIDO)
+        """
+        if self._estado == EN_CURSO and self.control.pausado:
+            return PAUSADO
+        return self._estado
+    
+    @property
+    def finalizado(self):
+        """
+        Indica si el trabajo ya no va a generar más temas
+        """
+        return self._estado in (CANCELADO, TERMINADO, FALLIDO)
+
+class GestorTrabajos:
+    """
+    Cola de lotes de generación que se ejecutan de a uno en un hilo en segundo plano
+    
+    Los lotes comparten el ExamenGenerator (y sus cachés), por eso no corren a la
+    vez; cada uno puede usar varios procesos. Cancelar un lote detiene la generación
+    antes del siguiente tema y borra los archivos que alcanzó a escribir, para no
+    dejar un lote incompleto mezclado con los exámenes válidos.
+    """
+    
+    def __init__(self, examen_generator):
+        """
+        Constructor de la clase GestorTrabajos
+        
+        Args:
+            examen_generator (ExamenGenerator): Generador con el que se ejecutan los lotes
+        """
+        self.examen_generator = examen_generator
+        self._cola = queue.Queue()
+        self._trabajos = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._hilo = None
+    
+    def enviar(self, cantidad_temas, formato="pdf", al_progresar=None, al_terminar=None, **opciones):
+        """
+        Agrega un lote a la cola
+        
+        Args:
+            cantidad_temas (int): Cantidad de temas a generar
+            formato (str): Formato de los exámenes ("pdf" o "word")
+            al_progresar (callable): Función opcional que recibe los EventoProgreso del lote
+            al_terminar (callable): Función opcional que recibe el Trabajo al finalizar
+                (terminado, cancelado o fallido); se llama desde el hilo del gestor
+            **opciones: Argumentos adicionales para generar_examenes() (procesos,
+                semilla, recargar_banco, ...)
+        
+        Returns:
+            Trabajo: Trabajo creado
+        """
+        with self._lock:
+            trabajo = Trabajo(next(self._ids), cantidad_temas, formato, opciones, al_progresar, al_terminar)
+            self._trabajos[trabajo.id] = trabajo
+            
+            if self._hilo is None or not self._hilo.is_alive():
+                self._hilo = threading.Thread(target=self._procesar_cola, daemon=True)
+                self._hilo.start()
+        
+        self._cola.put(trabajo)
+        return trabajo
+    
+    def obtener(self, id_trabajo):
+        """
+        Devuelve un trabajo por su identificador
+        
+        Returns:
+            Trabajo: Trabajo encontrado o None
+        """
+        return self._trabajos.get(id_trabajo)
+    
+    def trabajos(self):
+        """
+        Devuelve todos los trabajos enviados, en orden
+        
+        Returns:
+            list: Trabajos del gestor
+        """
+        return list(self._trabajos.values())
+    
+    def cancelar(self, id_trabajo):
+        """
+        Cancela un trabajo pendiente o en curso
+        
+        Returns:
+            bool: True si el trabajo existía y no había finalizado
+        """
+        trabajo = self.obtener(id_trabajo)
+        if trabajo is None or trabajo.finalizado:
+            return False
+        
+        trabajo.control.cancelar()
+        return True
+    
+    def pausar(self, id_trabajo):
+        """
+        Pausa un trabajo antes de su siguiente tema
+        
+        Returns:
+            bool: True si el trabajo existía y no había finalizado
+        """
+        trabajo = self.obtener(id_trabajo)
+        if trabajo is None or trabajo.finalizado:
+            return False
+        
+        trabajo.control.pausar()
+        return True
+    
+    def reanudar(self, id_trabajo):
+        """
+        Reanuda un trabajo pausado
+        
+        Returns:
+            bool: True si el trabajo existía y no había finalizado
+        """
+        trabajo = self.obtener(id_trabajo)
+        if trabajo is None or trabajo.finalizado:
+            return False
+        
+        trabajo.control.reanudar()
+        return True
+    
+    def _procesar_cola(self):
+        """
+        Ejecuta los trabajos de la cola uno tras otro
+        """
+        while True:
+            trabajo = self._cola.get()
+            try:
+                self._ejecutar(trabajo)
+            finally:
+                self._cola.task_done()
+    
+    def _ejecutar(self, trabajo):
+        """
+        Genera el lote de un trabajo y registra su resultado
+        """
+        if trabajo.control.cancelado:
+            # Cancelado mientras esperaba en la cola
+            trabajo._estado = CANCELADO
+        else:
+            trabajo._estado = EN_CURSO
+            iniciados = set()
+            generados = []
+            
+            def al_progresar(evento):
+                # Anotar los archivos escritos por este trabajo (los temas que el
+                # generador reutiliza de un lote anterior no se inician)
+                if evento.tipo == TEMA_INICIADO:
+                    iniciados.add(evento.numero_tema)
+                elif evento.tipo == TEMA_TERMINADO and evento.numero_tema in iniciados and evento.valor:
+                    generados.append(evento.valor)
+                if trabajo.al_progresar:
+                    trabajo.al_progresar(evento)
+            
+            try:
+                trabajo.rutas = self.examen_generator.generar_examenes(
+                    trabajo.cantidad_temas,
+                    trabajo.formato,
+                    al_progresar=al_progresar,
+                    control=trabajo.control,
+                    **trabajo.opciones
+                )
+            except Exception as e:
+                trabajo.error = e
+                trabajo._estado = FALLIDO
+            else:
+                if trabajo.control.cancelado:
+                    self._borrar_archivos(generados)
+                    trabajo.rutas = []
+                    trabajo._estado = CANCELADO
+                else:
+                    trabajo._estado = TERMINADO
+        
+        if trabajo.al_terminar:
+            trabajo.al_terminar(trabajo)
+    
+    def _borrar_archivos(self, rutas):
+        """
+        Borra los archivos que generó un lote cancelado
+        """
+        for ruta in rutas:
+            try:
+                os.remove(ruta)
+            except OSError as e:
+                print(f"No se pudo borrar {ruta}: {e}")
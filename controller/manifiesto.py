@@ -0,0 +1,190 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Módulo que registra con qué entradas se generó cada examen, para volver a
+generar solo los temas cuyas entradas cambiaron
+"""
+
+import os
+import json
+import hashlib
+
+# Versión del diseño de los documentos; aumentarla al cambiar la portada, los
+# estilos o la maquetación invalida todos los exámenes ya generados
+VERSION_MAQUETACION = 1
+
+# Archivo del manifiesto dentro de la carpeta de exámenes
+NOMBRE_MANIFIESTO = ".manifiesto.json"
+
+# Versión del formato del propio manifiesto
+VERSION_FORMATO = 1
+
+# Archivos que se incrustan en los exámenes; cambiarlos también invalida los ya generados
+_RECURSOS = (
+    os.path.join(os.path.dirname(os.path.dirname(__file__)), 'images', 'logo.png'),
+)
+
+def huella_banco(preguntas):
+    """
+    Calcula la huella del contenido del banco de preguntas
+    
+    Args:
+        preguntas (iterable): Preguntas del banco, en orden
+    
+    Returns:
+        str: Huella SHA-256 en hexadecimal
+    """
+    huella = hashlib.sha256()
+    for pregunta in preguntas:
+        huella.update(repr(tuple(pregunta)).encode('utf-8'))
+        huella.update(b'\n')
+    return huella.hexdigest()
+
+def huella_recursos():
+    """
+    Calcula la huella de los archivos que se incrustan en los exámenes
+    
+    Returns:
+        str: Huella SHA-256 en hexadecimal
+    """
+    huella = hashlib.sha256()
+    for ruta in _RECURSOS:
+        huella.update(os.path.basename(ruta).encode('utf-8'))
+        if os.path.exists(ruta):
+            with open(ruta, 'rb') as archivo:
+                huella.update(archivo.read())
+    return huella.hexdigest()
+
+def huella_lote(formato, huella_preguntas, opciones):
+    """
+    Calcula la huella de las entradas comunes a todos los temas de un lote
+    
+    Args:
+        formato (str): Formato de los exámenes ("pdf" o "word")
+        huella_preguntas (str): Huella del banco calculada con huella_banco()
+        opciones (dict): Opciones del generador que cambian el archivo generado
+    
+    Returns:
+        str: Huella SHA-256 en hexadecimal
+    """
+    entradas = {
+        'formato': formato,
+        'maquetacion': VERSION_MAQUETACION,
+        'banco': huella_preguntas,
+        'recursos': huella_recursos(),
+        'opciones': opciones
+    }
+    return hashlib.sha256(json.dumps(entradas, sort_keys=True).encode('utf-8')).hexdigest()
+
+def huella_version(huella_comun, version):
+    """
+    Calcula la huella de las entradas de un tema
+    
+    La semilla del lote interviene a través de las permutaciones de la versión,
+    que son lo único que la semilla decide.
+    
+    Args:
+        huella_comun (str): Huella del lote calculada con huella_lote()
+        version (VersionExamen): Versión del tema
+    
+    Returns:
+        str: Huella SHA-256 en hexadecimal
+    """
+    huella = hashlib.sha256(huella_comun.encode('ascii'))
+    huella.update(version.a_bytes())
+    return huella.hexdigest()
+
+class ManifiestoLote:
+    """
+    Manifiesto de los exámenes generados en una carpeta
+    
+    Guarda, por archivo, la huella de sus entradas y el tamaño y la fecha de
+    modificación con que quedó escrito. Un examen se considera vigente solo si
+    las tres cosas coinciden, así que un archivo borrado, reemplazado o escrito
+    por otro lote se vuelve a generar.
+    """
+    
+    def __init__(self, directorio):
+        """
+        Constructor de la clase ManifiestoLote
+        
+        Args:
+            directorio (str): Carpeta de los exámenes
+        """
+        self.ruta = os.path.join(directorio, NOMBRE_MANIFIESTO)
+        self.archivos = self._leer()
+    
+    def _leer(self):
+        """
+        Lee el manifiesto guardado; uno inexistente, dañado o de otro formato se ignora
+        
+        Returns:
+            dict: Entrada de cada archivo, por nombre
+        """
+        try:
+            with open(self.ruta, encoding='utf-8') as archivo:
+                datos = json.load(archivo)
+        except (OSError, ValueError):
+            return {}
+        
+        if not isinstance(datos, dict) or datos.get('version') != VERSION_FORMATO:
+            return {}
+        return dict(datos.get('archivos', {}))
+    
+    def vigente(self, ruta_archivo, huella):
+        """
+        Indica si un examen ya generado corresponde a las entradas indicadas
+        
+        Args:
+            ruta_archivo (str): Ruta del examen
+            huella (str): Huella de sus entradas calculada con huella_version()
+        
+        Returns:
+            bool: True si el archivo existe y no hace falta volver a generarlo
+        """
+        entrada = self.archivos.get(os.path.basename(ruta_archivo))
+        if entrada is None or entrada.get('huella') != huella:
+            return False
+        
+        try:
+            estado = os.stat(ruta_archivo)
+        except OSError:
+            return False
+        return entrada.get('tamano') == estado.st_size and entrada.get('modificado') == estado.st_mtime_ns
+    
+    def registrar(self, ruta_archivo, huella, semilla=None):
+        """
+        Registra un examen recién generado
+        
+        Args:
+            ruta_archivo (str): Ruta del examen
+            huella (str): Huella de sus entradas
+            semilla (int): Semilla del lote, a modo informativo
+        """
+        estado = os.stat(ruta_archivo)
+        self.archivos[os.path.basename(ruta_archivo)] = {
+            'huella': huella,
+            'tamano': estado.st_size,
+            'modificado': estado.st_mtime_ns,
+            'semilla': semilla
+        }
+    
+    def descartar(self, ruta_archivo):
+        """
+        Quita del manifiesto un examen que ya no es válido
+        
+        Args:
+            ruta_archivo (str): Ruta del examen
+        """
+        self.archivos.pop(os.path.basename(ruta_archivo), None)
+    
+    def guardar(self):
+        """
+        Escribe el manifiesto; se reemplaza de una vez para no dejarlo a medias
+        """
+        ruta_temporal = self.ruta + '.tmp'
+        with open(ruta_temporal, 'w', encoding='utf-8') as archivo:
+            json.dump({'version': VERSION_FORMATO, 'archivos': self.archivos}, archivo,
+                      indent=2, sort_keys=True)
+        os.replace(ruta_temporal, self.ruta)
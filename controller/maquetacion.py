@@ -0,0 +1,353 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Módulo que mide una sola vez la altura de cada párrafo de las preguntas y
+reparte las preguntas de cada versión en columnas y páginas según esa altura:
+con la menor cantidad de páginas, partiendo entre dos columnas la menor cantidad
+de preguntas y dejando pareja la última página
+"""
+
+import threading
+from collections import deque, namedtuple
+from reportlab import rl_config
+from reportlab.platypus.doctemplate import ActionFlowable
+
+# Cantidad de alturas guardadas a partir de la cual se vacía la caché
+LIMITE_ENTRADAS = 100000
+
+# Alto con que se miden los flowables; ninguno llega a ocuparlo
+_ALTO_MEDICION = 1e9
+
+# Costo de partir un párrafo entre dos columnas, frente al de cortar entre dos
+# párrafos de una misma pregunta (1) o dejar un enunciado solo al pie (2)
+_COSTO_LINEA = 3
+
+# Medida de un grupo de flowables apilados en una columna, como los apila Frame:
+# espacio que pide antes, alto desde su primera línea hasta la última y espacio
+# que deja después
+Medida = namedtuple('Medida', ['antes', 'alto', 'despues'])
+
+# Marco de una plantilla de página: ancho y alto disponibles para el contenido
+Marco = namedtuple('Marco', ['ancho', 'alto'])
+
+_lock = threading.Lock()
+_alturas = {}
+
+def marco_disponible(frame):
+    """
+    Espacio que un Frame de ReportLab deja para el contenido, sin sus márgenes internos
+    
+    Args:
+        frame (Frame): Marco de una plantilla de página
+    
+    Returns:
+        Marco: Ancho y alto disponibles
+    """
+    return Marco(frame._aW, frame._aH)
+
+def medir(flowables, ancho):
+    """
+    Mide un grupo de flowables apilados en una columna del ancho indicado
+    
+    Reproduce la aritmética de Frame: entre dos flowables queda el mayor de los
+    espacios que se piden (el de después del primero y el de antes del segundo),
+    mientras nada haya ocupado lugar no se deja espacio antes, y las acciones
+    (cambios de plantilla, saltos) no cuentan.
+    
+    Args:
+        flowables (iterable): Flowables en el orden en que se apilan
+        ancho (float): Ancho disponible de la columna
+    
+    Returns:
+        Medida: Medida del grupo
+    """
+    antes = None
+    alto = despues = 0
+    for flowable in flowables:
+        if isinstance(flowable, ActionFlowable):
+            continue
+        _, alto_flowable = flowable.wrap(ancho, _ALTO_MEDICION)
+        espacio_antes = flowable.getSpaceBefore()
+        if antes is None:
+            antes = espacio_antes
+        if alto or despues:
+            alto += max(despues, espacio_antes)
+        alto += alto_flowable
+        despues = flowable.getSpaceAfter()
+    return Medida(antes or 0, alto, despues)
+
+def medida_guardada(clave, ancho, crear_flowables):
+    """
+    Medida de un bloque, midiéndolo solo la primera vez que aparece
+    
+    Args:
+        clave (tuple): Identifica el contenido del bloque (por ejemplo el texto de la
+            pregunta y sus alternativas en el orden en que se imprimen)
+        ancho (float): Ancho de la columna
+        crear_flowables (callable): Crea los flowables del bloque si hace falta medirlo
+    
+    Returns:
+        Medida: Medida del bloque
+    """
+    medida = _alturas.get((clave, ancho))
+    if medida is None:
+        medida = medir(crear_flowables(), ancho)
+        _guardar((clave, ancho), medida)
+    return medida
+
+def alto_texto(texto, fuente, tamano, ancho, interlineado=1.2):
+    """
+    Alto aproximado de un párrafo de texto sin marcado que no maqueta ReportLab
+    (por ejemplo, en el Word), dividiéndolo en líneas con las métricas de la fuente
+    
+    Args:
+        texto (str): Texto del párrafo
+        fuente (str): Fuente de ReportLab con las mismas métricas que la del documento
+        tamano (float): Tamaño de la fuente en puntos
+        ancho (float): Ancho disponible en puntos
+        interlineado (float): Alto de cada línea en proporción al tamaño de la fuente
+    
+    Returns:
+        float: Alto del párrafo en puntos
+    """
+    clave = (('texto', texto, fuente, tamano, interlineado), ancho)
+    alto = _alturas.get(clave)
+    if alto is None:
+        from reportlab.lib.utils import simpleSplit
+        alto = max(len(simpleSplit(texto, fuente, tamano, ancho)), 1) * tamano * interlineado
+        _guardar(clave, alto)
+    return alto
+
+def _guardar(clave, valor):
+    """
+    Guarda una altura medida, vaciando antes la caché si llegó al límite
+    """
+    if len(_alturas) >= LIMITE_ENTRADAS:
+        with _lock:
+            _alturas.clear()
+    _alturas[clave] = valor
+
+def _espacio(anterior, siguiente, separador=None):
+    """
+    Espacio que queda entre dos bloques seguidos de una misma columna
+    
+    Args:
+        anterior (Medida): Bloque de arriba
+        siguiente (Medida): Bloque de abajo
+        separador (Medida): Flowable que va entre los dos, o None
+    
+    Returns:
+        float: Alto entre la última línea de uno y la primera del otro
+    """
+    if separador is None:
+        return max(anterior.despues, siguiente.antes)
+    return (max(anterior.despues, separador.antes) + separador.alto
+            + max(separador.despues, siguiente.antes))
+
+def dividir_en_dos(medidas, permitidos=None, espacios=None):
+    """
+    Reparte bloques en dos columnas de alto parecido, manteniendo su orden
+    
+    Como los bloques no cambian de orden, basta un recorrido: el alto de la
+    primera columna crece con el corte y el de la segunda decrece.
+    
+    Args:
+        medidas (list): Medidas de los bloques, en orden
+        permitidos (set): Posiciones donde se puede cortar (cantidad de bloques de
+            la primera columna); por defecto cualquiera
+        espacios (list): Espacio antes de cada bloque cuando no empieza una
+            columna; por defecto el que piden los propios bloques
+    
+    Returns:
+        tuple: (cantidad de bloques de la primera columna, alto de la más alta)
+    """
+    if espacios is None:
+        espacios = [0] + [_espacio(anterior, siguiente) for anterior, siguiente in zip(medidas, medidas[1:])]
+    total = sum(medida.alto for medida in medidas) + sum(espacios[1:])
+    
+    mejor, mejor_alto = len(medidas), total
+    primera = 0
+    for corte in range(1, len(medidas)):
+        primera += (espacios[corte - 1] if corte > 1 else 0) + medidas[corte - 1].alto
+        if permitidos is not None and corte not in permitidos:
+            continue
+        # La segunda columna empieza arriba: no lleva el espacio entre los dos bloques
+        segunda = total - primera - espacios[corte]
+        if max(primera, segunda) < mejor_alto:
+            mejor, mejor_alto = corte, max(primera, segunda)
+    return mejor, mejor_alto
+
+def planificar_columnas(cantidad, medir_bloque, primer_marco, marco_columna, columnas_por_pagina=2,
+                        ocupado_inicial=None, inicios=None, separador=None, evitar=None,
+                        interlineado=None):
+    """
+    Decide en qué bloque (o en qué línea de un párrafo) empieza cada columna del documento
+    
+    Entre todas las formas de llenar las columnas en orden se elige la que usa
+    menos columnas (y por lo tanto menos páginas) y, entre ellas, la que corta
+    menos veces fuera de un inicio de pregunta: un corte en evitar cuenta doble y
+    partir un párrafo entre dos columnas, triple. Con los altos acumulados, los
+    inicios posibles de cada columna forman una ventana que solo avanza, así que
+    el recorrido es lineal en la cantidad de líneas. Al final, lo que queda en la
+    última página se reparte entre sus columnas para que queden parejas.
+    
+    Args:
+        cantidad (int): Cantidad de bloques
+        medir_bloque (callable): Recibe el índice de un bloque y el ancho de la
+            columna y devuelve su Medida
+        primer_marco (Marco): Única columna de la página donde empiezan los bloques
+        marco_columna (Marco): Cada columna de las páginas siguientes
+        columnas_por_pagina (int): Columnas de las páginas siguientes
+        ocupado_inicial (Medida): Lo que ya ocupa la primera columna antes de los
+            bloques (título, instrucciones), o None si los bloques empiezan arriba
+        inicios (set): Bloques que empiezan una pregunta; cortar en ellos no parte
+            ninguna pregunta. Por defecto todos
+        separador (Medida): Flowable que va antes de cada inicio de pregunta
+            salvo arriba de una columna (el espacio entre preguntas), o None
+        evitar (set): Bloques delante de los cuales conviene no cortar (por
+            ejemplo, para no dejar un enunciado solo al pie de una columna)
+        interlineado (callable): Recibe el índice de un bloque y devuelve el alto
+            de cada una de sus líneas si es un párrafo que puede partirse entre
+            columnas (fuera de la primera), o None. Por defecto ninguno se parte
+    
+    Returns:
+        list: Parejas (bloque, línea) donde empieza cada columna nueva, en orden
+            (línea 0 si la columna empieza con el bloque entero), o None si algún
+            bloque no cabe en una columna vacía
+    """
+    evitar = evitar or set()
+    
+    def costo_bloque(indice):
+        if inicios is None or indice in inicios:
+            return 0
+        return 2 if indice in evitar else 1
+    
+    def espacio(medidas, indice):
+        con_separador = separador if inicios is not None and indice in inicios else None
+        return _espacio(medidas[indice - 1], medidas[indice], con_separador)
+    
+    limite = marco_columna.alto + rl_config._FUZZ
+    medidas = [medir_bloque(indice, marco_columna.ancho) for indice in range(cantidad)]
+    
+    # Cada bloque se divide en sus líneas si puede partirse y en caso contrario
+    # queda entero. Por cada unidad: su bloque y línea, su alto, el espacio que
+    # lleva antes si no empieza una columna y el costo de empezar una columna con
+    # ella (None si no se puede)
+    unidades, altos, espacios, costos = [], [], [], []
+    primera_unidad = []
+    for indice, medida in enumerate(medidas):
+        primera_unidad.append(len(unidades))
+        alto_linea = interlineado(indice) if interlineado else None
+        lineas = max(int(round(medida.alto / alto_linea)), 1) if alto_linea else 1
+        for linea in range(lineas):
+            unidades.append((indice, linea))
+            if linea == 0:
+                altos.append(medida.alto - (lineas - 1) * alto_linea if lineas > 1 else medida.alto)
+                espacios.append(espacio(medidas, indice) if indice else 0)
+                costos.append(costo_bloque(indice))
+            else:
+                # Un trozo de párrafo al pie de una columna lleva al menos dos líneas
+                altos.append(alto_linea)
+                espacios.append(0)
+                costos.append(_COSTO_LINEA if linea >= 2 else None)
+    total = len(unidades)
+    primera_unidad.append(total)
+    costos.append(0)
+    
+    # acumulado[k]: alto de las primeras k unidades apiladas; una columna con las
+    # unidades inicio..fin-1 mide acumulado[fin] - arranque[inicio], porque arriba
+    # no lleva el espacio que va antes de la unidad inicio
+    acumulado = [0] * (total + 1)
+    arranque = [0] * total
+    for indice in range(total):
+        arranque[indice] = acumulado[indice] + espacios[indice]
+        acumulado[indice + 1] = arranque[indice] + altos[indice]
+    
+    # mejor[paridad][k]: (columnas, costo de los cortes) para dejar las primeras k
+    # unidades en una cantidad par o impar de columnas completas; desde[paridad][k]:
+    # unidad donde empieza la última de esas columnas. Se separan por paridad
+    # porque una columna más puede caber en la misma página con cortes más baratos
+    mejor = ([None] * (total + 1), [None] * (total + 1))
+    desde = ([0] * (total + 1), [0] * (total + 1))
+    mejor[0][0] = (0, 0)
+    
+    # La primera columna tiene otro ancho, puede empezar con el encabezado y no
+    # parte ningún párrafo
+    primeras = []
+    alto = ocupado_inicial.alto if ocupado_inicial else 0
+    for fin in range(cantidad):
+        primeras.append(medir_bloque(fin, primer_marco.ancho))
+        if fin:
+            alto += espacio(primeras, fin)
+        elif ocupado_inicial:
+            alto += _espacio(ocupado_inicial, primeras[0])
+        alto += primeras[fin].alto
+        if alto > primer_marco.alto + rl_config._FUZZ:
+            break
+        mejor[1][primera_unidad[fin + 1]] = (1, costos[primera_unidad[fin + 1]])
+    
+    # Las demás columnas: los inicios posibles de la columna que termina en fin
+    # forman una ventana que solo avanza, y su mínimo se lleva en una cola
+    cortables = [indice for indice in range(1, total + 1) if costos[indice] is not None]
+    ventanas = (deque(), deque())
+    primero = 1
+    for inicio, fin in zip(cortables, cortables[1:]):
+        while primero < fin and acumulado[fin] - arranque[primero] > limite:
+            primero += 1
+        for paridad, ventana in enumerate(ventanas):
+            anteriores, siguientes = mejor[paridad], mejor[1 - paridad]
+            if anteriores[inicio] is not None:
+                while ventana and anteriores[ventana[-1]] >= anteriores[inicio]:
+                    ventana.pop()
+                ventana.append(inicio)
+            while ventana and ventana[0] < primero:
+                ventana.popleft()
+            if ventana:
+                columnas, costo = anteriores[ventana[0]]
+                candidato = (columnas + 1, costo + costos[fin])
+                if siguientes[fin] is None or candidato < siguientes[fin]:
+                    siguientes[fin], desde[1 - paridad][fin] = candidato, ventana[0]
+    
+    def paginas(paridad):
+        columnas, costo = mejor[paridad][total]
+        return (1 + -(-(columnas - 1) // columnas_por_pagina), costo)
+    
+    finales = [paridad for paridad in (0, 1) if mejor[paridad][total] is not None]
+    if not finales:
+        return None
+    paridad = min(finales, key=paginas)
+    
+    cortes = []
+    posicion = desde[paridad][total]
+    while posicion:
+        cortes.append(posicion)
+        paridad = 1 - paridad
+        posicion = desde[paridad][posicion]
+    cortes.reverse()
+    
+    # Repartir la última página entre sus columnas; la primera página tiene otra
+    # forma, así que solo se equilibra una página de las siguientes
+    if cortes and columnas_por_pagina == 2:
+        primera_columna = (len(cortes) - 1) // 2 * 2
+        inicio = cortes[primera_columna]
+        del cortes[primera_columna + 1:]
+        pagina = [Medida(0, alto, 0) for alto in altos[inicio:]]
+        
+        # Se prefieren los cortes más baratos con los que también cabe
+        for tope in (0, 1, 2, _COSTO_LINEA):
+            permitidos = {corte for corte in range(1, len(pagina))
+                          if costos[inicio + corte] is not None and costos[inicio + corte] <= tope}
+            corte, alto = dividir_en_dos(pagina, permitidos, espacios[inicio:])
+            if alto <= limite:
+                break
+        if corte < len(pagina):
+            cortes.append(inicio + corte)
+    return [unidades[corte] for corte in cortes]
+
+def reiniciar_maquetacion():
+    """
+    Descarta las alturas medidas (por ejemplo, tras cambiar los estilos)
+    """
+    with _lock:
+        _alturas.clear()
@@ -0,0 +1,322 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Módulo que maqueta la portada del PDF una sola vez y la une a las páginas de
+preguntas de cada tema
+"""
+
+import io
+import re
+import threading
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from reportlab.platypus import BaseDocTemplate
+from reportlab.platypus.flowables import Flowable
+from controller.recursos_render import TAMANO_PAGINA, MARGEN, obtener_estilos, obtener_plantillas
+
+_lock = threading.Lock()
+_plantilla = None
+
+# Expresiones para leer la estructura de los PDF que escribe ReportLab
+_REFERENCIA = re.compile(rb'(\d+) 0 R')
+_INICIO_STREAM = re.compile(rb'stream\r?\n')
+_FUENTE = re.compile(rb'/BaseFont (/[\w-]+) [^>]*/Type /Font\b')
+
+class RanuraTema(Flowable):
+    """
+    Reserva en la portada el lugar del párrafo "TEMA: (X)" sin dibujarlo
+    
+    Ocupa exactamente lo mismo que el párrafo y, al maquetarse, anota en qué
+    posición de la página quedó para dibujar allí la letra de cada versión.
+    """
+    
+    def __init__(self, parrafo):
+        """
+        Constructor de la clase RanuraTema
+        
+        Args:
+            parrafo (Paragraph): Párrafo del tema cuyo lugar se reserva
+        """
+        Flowable.__init__(self)
+        self.parrafo = parrafo
+        self.estilo = parrafo.style
+        self.posicion = None
+    
+    def wrap(self, availWidth, availHeight):
+        self.ancho, self.alto = self.parrafo.wrap(availWidth, availHeight)
+        return self.ancho, self.alto
+    
+    def getSpaceBefore(self):
+        return self.parrafo.getSpaceBefore()
+    
+    def getSpaceAfter(self):
+        return self.parrafo.getSpaceAfter()
+    
+    def draw(self):
+        self.posicion = self.canv.absolutePosition(0, 0)
+
+def _leer_objetos(datos):
+    """
+    Separa un PDF de ReportLab en sus objetos usando la tabla xref
+    
+    Solo se aceptan PDF con la forma exacta que escribe ReportLab: una única tabla
+    xref clásica, sin actualizaciones incrementales, sin cifrado, sin xref ni
+    objetos comprimidos en streams, y cada objeto en la posición que indica la
+    tabla. Cualquier otra estructura lanza ValueError, para que el tema se maquete
+    completo en lugar de unir la portada a ciegas.
+    
+    Returns:
+        tuple: (diccionario número -> cuerpo del objeto, texto del trailer, posición de la xref)
+    """
+    try:
+        if datos.count(b'startxref') != 1:
+            raise ValueError("el PDF tiene actualizaciones incrementales")
+        inicio_xref = int(datos[datos.rindex(b'startxref') + 9:].split()[0])
+        if not datos.startswith(b'xref', inicio_xref):
+            raise ValueError("la tabla xref está comprimida o fuera de lugar")
+        trailer = datos[datos.index(b'trailer', inicio_xref):datos.rindex(b'startxref')]
+        if re.search(rb'/(Prev|XRefStm|Encrypt)\b', trailer):
+            raise ValueError("el trailer no es el de un PDF simple")
+        
+        lineas = datos[inicio_xref:datos.index(b'trailer', inicio_xref)].split(b'\n')
+        primero, cantidad = (int(x) for x in lineas[1].split())
+        if len(lineas[2:]) < cantidad or lineas[2 + cantidad:].count(b'') != len(lineas[2 + cantidad:]):
+            raise ValueError("la tabla xref tiene más de una sección")
+        posiciones = {}
+        for numero, linea in enumerate(lineas[2:2 + cantidad], start=primero):
+            if linea.endswith(b'n ') or linea.endswith(b'n'):
+                posiciones[numero] = int(linea[:10])
+        
+        # ReportLab escribe los objetos en orden, así que cada uno termina donde empieza el siguiente
+        orden = sorted(posiciones, key=posiciones.get)
+        limites = [posiciones[n] for n in orden[1:]] + [inicio_xref]
+        objetos = {}
+        for numero, fin in zip(orden, limites):
+            cuerpo = datos[posiciones[numero]:fin]
+            if not cuerpo.startswith(b'%d 0 obj' % numero):
+                raise ValueError(f"el objeto {numero} no está donde indica la tabla xref")
+            cuerpo = cuerpo[cuerpo.index(b'obj') + 3:cuerpo.rindex(b'endobj')].strip(b'\r\n')
+            if re.search(rb'/Type /(ObjStm|XRef)\b', _diccionario(cuerpo)):
+                raise ValueError("el PDF tiene objetos comprimidos en streams")
+            objetos[numero] = cuerpo
+    except (IndexError, TypeError) as e:
+        raise ValueError(f"estructura del PDF no reconocida ({e})") from e
+    
+    return objetos, trailer, inicio_xref
+
+def _valor_referencia(cuerpo, clave):
+    """
+    Devuelve el número de objeto al que apunta una clave de un diccionario PDF
+    """
+    encontrado = re.search(rb'/' + clave + rb' (\d+) 0 R', cuerpo)
+    if encontrado is None:
+        raise ValueError(f"El PDF no tiene la clave /{clave.decode()}")
+    return int(encontrado.group(1))
+
+def _diccionario(cuerpo):
+    """
+    Parte del objeto anterior a su stream (la única donde puede haber referencias)
+    """
+    encontrado = _INICIO_STREAM.search(cuerpo)
+    return cuerpo if encontrado is None else cuerpo[:encontrado.start()]
+
+def _escapar(texto):
+    """
+    Convierte un texto en una cadena literal de PDF con la codificación WinAnsi
+    """
+    datos = texto.encode('cp1252', errors='replace')
+    return b'(' + datos.replace(b'\\', b'\\\\').replace(b'(', b'\\(').replace(b')', b'\\)') + b')'
+
+class PlantillaPortada:
+    """
+    Portada ya maquetada, lista para unirse a las páginas de preguntas de cada tema
+    
+    La portada se maqueta una sola vez con ReportLab, dejando vacía la ranura del
+    tema, y sus objetos (página, textos, fuentes y logo) se guardan ya codificados.
+    Para cada versión se agregan al PDF de preguntas como una actualización
+    incremental: se copian los objetos, se dibuja la letra del tema en la ranura y
+    se reescribe el árbol de páginas con la portada al inicio. Así ninguna versión
+    vuelve a maquetar la portada ni a comprimir el logo.
+    """
+    
+    def __init__(self, generador):
+        """
+        Constructor de la clase PlantillaPortada
+        
+        Args:
+            generador (ExamenGenerator): Generador cuya portada se usa como plantilla
+        """
+        buffer = io.BytesIO()
+        doc = BaseDocTemplate(
+            buffer,
+            pagesize=TAMANO_PAGINA,
+            rightMargin=MARGEN,
+            leftMargin=MARGEN,
+            topMargin=MARGEN,
+            bottomMargin=MARGEN
+        )
+        doc.addPageTemplates(obtener_plantillas()[:1])
+        
+        contenido = []
+        ranura = generador.agregar_portada(contenido, obtener_estilos(), "Tema", plantilla=True)
+        doc.build(contenido)
+        
+        if ranura.posicion is None:
+            raise ValueError("La ranura del tema no quedó en la portada")
+        
+        objetos, trailer, _ = _leer_objetos(buffer.getvalue())
+        catalogo = objetos[_valor_referencia(trailer, b'Root')]
+        paginas = objetos[_valor_referencia(catalogo, b'Pages')]
+        self.pagina = int(_REFERENCIA.search(paginas[paginas.index(b'/Kids'):]).group(1))
+        
+        # Conservar solo lo que usa la primera página (sin subir a su /Parent)
+        pendientes = [self.pagina]
+        self.objetos = {}
+        while pendientes:
+            numero = pendientes.pop()
+            if numero in self.objetos:
+                continue
+            cuerpo = objetos[numero]
+            if numero == self.pagina:
+                # El árbol de páginas al que pertenece se fija en cada versión
+                cuerpo = re.sub(rb'/Parent \d+ 0 R ?', b'', cuerpo)
+            self.objetos[numero] = cuerpo
+            pendientes.extend(int(n) for n in _REFERENCIA.findall(_diccionario(cuerpo)))
+        
+        # Nombre interno de la fuente del tema dentro de la portada
+        fuente = self.objetos[_valor_referencia(self.objetos[self.pagina], b'Font')]
+        self.nombre_fuente = None
+        for numero in _REFERENCIA.findall(fuente):
+            cuerpo = self.objetos[int(numero)]
+            if b'/BaseFont /' + ranura.estilo.fontName.encode() + b' ' in cuerpo:
+                self.nombre_fuente = re.search(rb'/Name (/\w+)', cuerpo).group(1)
+        if self.nombre_fuente is None:
+            raise ValueError("La portada no incluye la fuente del tema")
+        
+        x, y = ranura.posicion
+        self.estilo = ranura.estilo
+        self.centro = x + ranura.ancho / 2
+        # ReportLab ubica la primera línea a fontSize por debajo del borde superior
+        self.linea_base = y + ranura.alto - ranura.estilo.fontSize
+    
+    def _stream_tema(self, titulo_examen):
+        """
+        Contenido PDF que dibuja "TEMA: (X)" centrado en la ranura
+        
+        Returns:
+            bytes: Objeto stream con la letra del tema
+        """
+        texto = f"TEMA: ({titulo_examen[-1]})"
+        x = self.centro - stringWidth(texto, self.estilo.fontName, self.estilo.fontSize) / 2
+        contenido = b'q 0 0 0 rg BT %s %g Tf %.3f %.3f Td %s Tj ET Q' % (
+            self.nombre_fuente, self.estilo.fontSize, x, self.linea_base, _escapar(texto))
+        return b'<<\n/Length %d\n>>\nstream\n%s\nendstream' % (len(contenido) + 1, contenido)
+    
+    def unir(self, datos, titulo_examen):
+        """
+        Antepone la portada con la letra del tema a un PDF de preguntas
+        
+        Si el PDF de preguntas no tiene la estructura que escribe ReportLab se
+        lanza ValueError (ver _leer_objetos) y el tema debe maquetarse completo.
+        
+        Args:
+            datos (bytes): PDF de ReportLab con las páginas de preguntas
+            titulo_examen (str): Título del examen (Tema A, Tema B, etc.)
+            
+        Returns:
+            bytes: PDF completo, con la portada como primera página
+        """
+        objetos, trailer, inicio_xref = _leer_objetos(datos)
+        tamano = int(re.search(rb'/Size (\d+)', trailer).group(1))
+        catalogo_num = _valor_referencia(trailer, b'Root')
+        paginas_num = _valor_referencia(objetos[catalogo_num], b'Pages')
+        paginas = objetos[paginas_num]
+        
+        # Las fuentes que ya tiene el PDF de preguntas se reutilizan
+        fuentes = {}
+        for numero, cuerpo in objetos.items():
+            encontrado = _FUENTE.search(cuerpo)
+            if encontrado:
+                fuentes[encontrado.group(1)] = numero
+        
+        # Numerar los demás objetos de la portada a continuación de los existentes
+        numeros = {}
+        copiar = []
+        for viejo, cuerpo in self.objetos.items():
+            encontrado = _FUENTE.search(cuerpo)
+            if encontrado and encontrado.group(1) in fuentes:
+                numeros[viejo] = fuentes[encontrado.group(1)]
+            else:
+                numeros[viejo] = tamano + len(copiar)
+                copiar.append(viejo)
+        tema_num = tamano + len(copiar)
+        
+        def renumerar(encontrado):
+            return b'%d 0 R' % numeros[int(encontrado.group(1))]
+        
+        nuevos = []
+        for viejo in copiar:
+            cuerpo = self.objetos[viejo]
+            diccionario = _diccionario(cuerpo)
+            resto = cuerpo[len(diccionario):]
+            diccionario = _REFERENCIA.sub(renumerar, diccionario)
+            if viejo == self.pagina:
+                # Colgar la portada del árbol de páginas y sumarle la letra del tema
+                diccionario = diccionario.replace(b'<<', b'<<\n/Parent %d 0 R' % paginas_num, 1)
+                diccionario = re.sub(
+                    rb'/Contents (\d+) 0 R',
+                    lambda m: b'/Contents [ %s 0 R %d 0 R ]' % (m.group(1), tema_num),
+                    diccionario)
+            nuevos.append((numeros[viejo], diccionario + resto))
+        nuevos.append((tema_num, self._stream_tema(titulo_examen)))
+        
+        # Nueva versión del árbol de páginas con la portada primero
+        cantidad = int(re.search(rb'/Count (\d+)', paginas).group(1))
+        paginas = re.sub(rb'/Count \d+', b'/Count %d' % (cantidad + 1), paginas)
+        paginas = paginas.replace(b'/Kids [', b'/Kids [ %d 0 R' % numeros[self.pagina], 1)
+        
+        salida = io.BytesIO()
+        salida.write(datos)
+        if not datos.endswith(b'\n'):
+            salida.write(b'\n')
+        
+        posiciones = {}
+        for numero, cuerpo in nuevos + [(paginas_num, paginas)]:
+            posiciones[numero] = salida.tell()
+            salida.write(b'%d 0 obj\n%s\nendobj\n' % (numero, cuerpo))
+        
+        # Tabla xref de la actualización: el árbol de páginas y los objetos nuevos
+        inicio_nueva_xref = salida.tell()
+        salida.write(b'xref\n0 1\n0000000000 65535 f \n')
+        salida.write(b'%d 1\n%010d 00000 n \n' % (paginas_num, posiciones[paginas_num]))
+        salida.write(b'%d %d\n' % (tamano, len(nuevos)))
+        for numero, _ in nuevos:
+            salida.write(b'%010d 00000 n \n' % posiciones[numero])
+        
+        identificador = re.search(rb'/ID\s*(\[.*?\])', trailer, re.S)
+        salida.write(b'trailer\n<<\n')
+        if identificador:
+            salida.write(b'/ID %s\n' % identificador.group(1))
+        salida.write(b'/Info %d 0 R\n/Prev %d\n/Root %d 0 R\n/Size %d\n>>\n' % (
+            _valor_referencia(trailer, b'Info'), inicio_xref, catalogo_num, tema_num + 1))
+        salida.write(b'startxref\n%d\n%%%%EOF\n' % inicio_nueva_xref)
+        
+        return salida.getvalue()
+
+def obtener_plantilla_portada(generador):
+    """
+    Devuelve la portada precompilada del proceso, maquetándola la primera vez
+    
+    Args:
+        generador (ExamenGenerator): Generador cuya portada se usa como plantilla
+    
+    Returns:
+        PlantillaPortada: Portada lista para unirse a cada tema
+    """
+    global _plantilla
+    if _plantilla is None:
+        with _lock:
+            if _plantilla is None:
+                _plantilla = PlantillaPortada(generador)
+    
+    return _plantilla
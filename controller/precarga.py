@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Módulo que prepara en paralelo lo que el generador necesita antes del primer lote
+(banco de preguntas, bibliotecas de PDF y Word, estilos, logo y plantillas)
+"""
+
+import time
+import threading
+
+def _cargar_banco(generador):
+    """
+    Abre la conexión (o el archivo binario) y carga el banco de preguntas
+    
+    Returns:
+        str: Resumen del paso
+    """
+    cantidad = generador.refrescar_banco()
+    return f"{cantidad} preguntas cargadas"
+
+def _preparar_permutaciones(generador):
+    """
+    Carga NumPy calculando una permutación de prueba
+    
+    Returns:
+        str: Resumen del paso
+    """
+    from model.permutaciones import MotorPermutaciones
+    MotorPermutaciones(0).permutacion_tema(1, 1)
+    return "Motor de permutaciones listo"
+
+def _preparar_pdf(generador):
+    """
+    Carga ReportLab y deja en caché los estilos, el logo y la portada precompilada
+    
+    Returns:
+        str: Resumen del paso
+    """
+    from controller.recursos_render import obtener_estilos, obtener_logo
+    import controller.cache_parrafos
+    import controller.flujo_pdf
+    
+    obtener_estilos()
+    obtener_logo()
+    generador._plantilla_portada()
+    return "Estilos y logo del PDF listos"
+
+def _preparar_word(generador):
+    """
+    Carga python-docx y arma la plantilla de Word
+    
+    Returns:
+        str: Resumen del paso
+    """
+    generador._plantilla_word()
+    return "Plantilla de Word lista"
+
+# Pasos de la precarga y la descripción con que se informa si fallan
+PASOS_PRECARGA = (
+    ("Cargando banco de preguntas", _cargar_banco),
+    ("Preparando motor de permutaciones", _preparar_permutaciones),
+    ("Preparando estilos y logo del PDF", _preparar_pdf),
+    ("Preparando plantilla de Word", _preparar_word),
+)
+
+def precargar(generador, al_avanzar=None, pasos=PASOS_PRECARGA):
+    """
+    Ejecuta todos los pasos de la precarga a la vez, cada uno en su propio hilo
+    
+    Un paso que falla (por ejemplo, sin conexión a la base de datos) no detiene a
+    los demás; el error se vuelve a producir y se informa al generar el primer lote.
+    
+    Args:
+        generador (ExamenGenerator): Generador a preparar
+        al_avanzar (callable): Función opcional que recibe un mensaje y el progreso
+            (0-100) cada vez que termina un paso; se llama desde los hilos de la precarga
+        pasos (tuple): Parejas (descripción, función) a ejecutar; cada función recibe
+            el generador y devuelve el resumen que se muestra al terminar
+    
+    Returns:
+        dict: Mensaje de cada paso y su resultado (resumen o excepción)
+    """
+    resultados = {}
+    lock = threading.Lock()
+    
+    def ejecutar(mensaje, paso):
+        inicio = time.perf_counter()
+        try:
+            resultado = paso(generador)
+        except Exception as e:
+            resultado = e
+        
+        with lock:
+            resultados[mensaje] = resultado
+            progreso = len(resultados) * 100 / len(pasos)
+            if al_avanzar:
+                if isinstance(resultado, Exception):
+                    al_avanzar(f"{mensaje}: no disponible ({resultado})", progreso)
+                else:
+                    al_avanzar(f"{resultado} ({time.perf_counter() - inicio:.1f} s)", progreso)
+    
+    hilos = [
+        threading.Thread(target=ejecutar, args=(mensaje, paso), daemon=True)
+        for mensaje, paso in pasos
+    ]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    
+    return resultados
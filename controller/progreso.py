@@ -0,0 +1,28 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Módulo que define los eventos de avance que informa ExamenGenerator mientras
+genera un lote
+"""
+
+from collections import namedtuple
+
+# Tipos de evento, en el orden en que ocurren para cada tema
+TEMA_INICIADO = "tema_iniciado"
+PAGINAS_MAQUETADAS = "paginas_maquetadas"
+BYTES_ESCRITOS = "bytes_escritos"
+TEMA_TERMINADO = "tema_terminado"
+
+EventoProgreso = namedtuple('EventoProgreso', ['tipo', 'numero_tema', 'valor'])
+EventoProgreso.__doc__ = """
+Evento de avance de un tema
+
+Según el tipo, valor es:
+    TEMA_INICIADO: None
+    PAGINAS_MAQUETADAS: páginas del PDF ya maquetadas (los Word no se paginan al generarse)
+    BYTES_ESCRITOS: tamaño del archivo terminado
+    TEMA_TERMINADO: ruta del archivo, o None si no se pudo generar
+
+Es una tupla simple para poder enviarse desde los procesos del pool.
+"""
@@ -0,0 +1,210 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Módulo con los recursos de ReportLab de los PDF: los estilos y las plantillas de
+página de cada documento, y el logo, que se decodifica una sola vez por proceso
+"""
+
+import os
+import threading
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.units import inch
+from reportlab.lib.utils import ImageReader
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.platypus import Frame, PageTemplate
+from reportlab.platypus.flowables import Flowable
+
+# Página y márgenes de todos los exámenes
+TAMANO_PAGINA = letter
+MARGEN = 72
+
+# Tamaño con el que se dibuja el logo en la portada
+TAMANO_LOGO = 5 * inch
+
+# Resolución máxima del logo incrustado; uno más grande se reduce al cargarlo
+RESOLUCION_LOGO = 150
+
+RUTA_LOGO = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'images', 'logo.png')
+
+_lock = threading.Lock()
+_logo = None
+
+def _crear_estilos():
+    """
+    Construye la hoja de estilos con todos los estilos propios del examen
+    
+    Returns:
+        StyleSheet1: Estilos de ReportLab
+    """
+    styles = getSampleStyleSheet()
+    styles.add(ParagraphStyle(
+        name='TituloPrincipal',
+        fontName='Helvetica-Bold',
+        fontSize=16,
+        alignment=1,  # Centrado
+        spaceBefore=12
+    ))
+    styles.add(ParagraphStyle(
+        name='Pregunta',
+        fontName='Helvetica-Bold',
+        fontSize=11,
+        spaceAfter=6
+    ))
+    styles.add(ParagraphStyle(
+        name='Alternativa',
+        fontName='Helvetica',
+        fontSize=10,
+        leftIndent=20,
+        spaceAfter=3
+    ))
+    
+    # Estilos de la portada
+    styles.add(ParagraphStyle(
+        name='UniversidadTitulo',
+        fontName='Helvetica-Bold',
+        fontSize=18,
+        leading=30,
+        alignment=1,
+        spaceAfter=30
+    ))
+    styles.add(ParagraphStyle(
+        name='ExamenTitulo',
+        fontName='Helvetica-Bold',
+        fontSize=26,
+        alignment=1,
+        leading=30,
+    ))
+    styles.add(ParagraphStyle(
+        name='Tema',
+        fontName='Helvetica-Bold',
+        fontSize=32,
+        alignment=1,
+        leading=30,
+        spaceBefore=20,
+        spaceAfter=20
+    ))
+    styles.add(ParagraphStyle(
+        'PiePagina',
+        parent=styles['Normal'],
+        alignment=1,
+        spaceBefore=14,
+        fontSize=16
+    ))
+    
+    return styles
+
+def obtener_estilos():
+    """
+    Devuelve una hoja de estilos nueva para un documento
+    
+    Crear la hoja cuesta menos de un milisegundo, así que no se comparte entre
+    documentos: cada uno puede usarla sin afectar a los demás. Las cachés de
+    párrafos usan la huella de cada estilo (ver controller.cache_bloques.huella_estilo),
+    de modo que dos hojas iguales reutilizan las mismas entradas.
+    
+    Returns:
+        StyleSheet1: Estilos de ReportLab
+    """
+    return _crear_estilos()
+
+def _cargar_logo():
+    """
+    Decodifica el logo y lo reduce a la resolución con la que se imprime
+    
+    Returns:
+        ImageReader: Logo listo para dibujar, o None si no existe el archivo
+    """
+    if not os.path.exists(RUTA_LOGO):
+        return None
+    
+    # Pillow solo se necesita al dibujar la portada
+    from PIL import Image as PILImage
+    
+    with PILImage.open(RUTA_LOGO) as imagen:
+        # La paleta se convierte una sola vez (conservando la transparencia)
+        imagen = imagen.convert('RGBA')
+    
+    pixeles = int(TAMANO_LOGO / inch * RESOLUCION_LOGO)
+    if max(imagen.size) > pixeles:
+        imagen.thumbnail((pixeles, pixeles), PILImage.LANCZOS)
+    
+    lector = ImageReader(imagen)
+    # Dejar los datos RGB y la máscara ya separados para todos los documentos
+    lector.getRGBData()
+    return lector
+
+def obtener_logo():
+    """
+    Devuelve el logo decodificado del proceso, cargándolo la primera vez
+    
+    Returns:
+        ImageReader: Logo listo para dibujar, o None si no existe el archivo
+    """
+    global _logo
+    if _logo is None:
+        with _lock:
+            if _logo is None:
+                _logo = _cargar_logo() or False
+    
+    return _logo or None
+
+class LogoPortada(Flowable):
+    """
+    Flowable que dibuja el logo ya decodificado con el tamaño de la portada
+    """
+    
+    def __init__(self, lector, ancho=TAMANO_LOGO, alto=TAMANO_LOGO):
+        """
+        Constructor de la clase LogoPortada
+        
+        Args:
+            lector (ImageReader): Logo obtenido con obtener_logo()
+            ancho (float): Ancho con el que se dibuja, en puntos
+            alto (float): Alto con el que se dibuja, en puntos
+        """
+        Flowable.__init__(self)
+        self.lector = lector
+        self.ancho = ancho
+        self.alto = alto
+        self.hAlign = 'CENTER'
+    
+    def wrap(self, availWidth, availHeight):
+        return self.ancho, self.alto
+    
+    def draw(self):
+        self.canv.drawImage(self.lector, 0, 0, self.ancho, self.alto, mask='auto')
+
+def obtener_plantillas():
+    """
+    Crea las plantillas de página de un documento
+    
+    Los marcos guardan su posición mientras se maqueta un documento, así que cada
+    documento tiene los suyos.
+    
+    Returns:
+        list: Plantillas 'Normal' (portada) y 'TwoColumns' (preguntas)
+    """
+    ancho = TAMANO_PAGINA[0] - 2 * MARGEN
+    alto = TAMANO_PAGINA[1] - 2 * MARGEN
+    
+    # Crear dos columnas para las preguntas (a partir de la segunda página)
+    frame1 = Frame(MARGEN, MARGEN, ancho/2-6, alto, id='col1')
+    frame2 = Frame(MARGEN+ancho/2+6, MARGEN, ancho/2-6, alto, id='col2')
+    two_columns_template = PageTemplate(id='TwoColumns', frames=[frame1, frame2])
+    
+    # Plantilla de página normal (para la primera página)
+    normal_template = PageTemplate(id='Normal', frames=[Frame(MARGEN, MARGEN, ancho, alto, id='normal')])
+    
+    return [normal_template, two_columns_template]
+
+def reiniciar_recursos():
+    """
+    Descarta el logo decodificado (por ejemplo, tras cambiar el archivo)
+    
+    Los párrafos analizados, los bloques dibujados y las alturas medidas no se
+    tocan; para descartarlos están reiniciar_cache_parrafos() y reiniciar_maquetacion().
+    """
+    global _logo
+    with _lock:
+        _logo = None
@@ -10,6 +10,7 @@ con preguntas y alternativas en orden aleatorio.
 import os
 import sys
 import tkinter as tk
+from controller.examen_generator import ExamenGenerator
 from view.gui import ExamenGeneratorGUI
 from view.splash_screen import SplashScreen
 
@@ -21,12 +22,15 @@ def main():
     if not os.path.exists('Examenes'):
         os.makedirs('Examenes')
     
+    # El generador se prepara durante la pantalla de carga y lo usa la interfaz
+    examen_generator = ExamenGenerator()
+    
     # Crear una ventana raíz temporal para mostrar el splash screen
     root = tk.Tk()
     root.withdraw()  # Ocultar ventana raíz temporal
     
     # Mostrar pantalla de carga
-    splash = SplashScreen(root)
+    splash = SplashScreen(root, examen_generator)
     
     # Esperar a que se cierre la pantalla de carga
     root.wait_window(splash)
@@ -35,7 +39,7 @@ def main():
     root.destroy()
     
     # Iniciar la interfaz gráfica principal
-    app = ExamenGeneratorGUI()
+    app = ExamenGeneratorGUI(examen_generator)
     app.mainloop()
 
 if __name__ == "__main__":
@@ -0,0 +1,99 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Módulo que mantiene una instantánea en memoria del banco de preguntas
+"""
+
+from model.pregunta_dao import PreguntaDAO
+from model.snapshot_banco import SnapshotBanco
+
+class BancoPreguntas:
+    """
+    Instantánea en memoria del banco de preguntas.
+    
+    Las preguntas se leen de la base de datos una sola vez y se reutilizan
+    para generar todas las versiones de un lote; solo se vuelven a consultar
+    cuando se llama explícitamente a refrescar(). Si se indica un archivo
+    exportado con exportar_snapshot(), se mapea en memoria en lugar de consultar
+    la base de datos.
+    """
+    
+    def __init__(self, pregunta_dao=None, ruta_snapshot=None):
+        """
+        Constructor de la clase BancoPreguntas
+        
+        Args:
+            pregunta_dao (PreguntaDAO): Objeto de acceso a datos usado para cargar las preguntas
+            ruta_snapshot (str): Archivo binario del banco; si se indica, reemplaza a la base de datos
+        """
+        self.pregunta_dao = pregunta_dao if pregunta_dao is not None else PreguntaDAO()
+        self.ruta_snapshot = ruta_snapshot
+        self._preguntas = None
+    
+    @classmethod
+    def desde_preguntas(cls, preguntas, pregunta_dao=None):
+        """
+        Crea un banco a partir de preguntas ya cargadas, sin consultar la base de datos
+        
+        Args:
+            preguntas (list): Preguntas que formarán la instantánea
+            pregunta_dao (PreguntaDAO): Objeto de acceso a datos usado por refrescar()
+        
+        Returns:
+            BancoPreguntas: Banco con la instantánea ya cargada
+        """
+        banco = cls(pregunta_dao)
+        if isinstance(preguntas, SnapshotBanco):
+            # Conservar el mapeo del archivo en lugar de copiar las preguntas
+            banco.ruta_snapshot = preguntas.ruta
+            banco._preguntas = preguntas
+        else:
+            banco._preguntas = tuple(preguntas)
+        return banco
+    
+    @property
+    def cargado(self):
+        """
+        Indica si la instantánea ya fue cargada
+        
+        Returns:
+            bool: True si las preguntas ya están en memoria
+        """
+        return self._preguntas is not None
+    
+    @property
+    def preguntas(self):
+        """
+        Preguntas de la instantánea; se cargan en el primer acceso
+        
+        Returns:
+            sequence: Secuencia inmutable de objetos Pregunta
+        """
+        if self._preguntas is None:
+            self.refrescar()
+        return self._preguntas
+    
+    def refrescar(self):
+        """
+        Vuelve a leer todas las preguntas y reemplaza la instantánea
+        
+        Returns:
+            sequence: Preguntas recién cargadas (tupla, o SnapshotBanco si se usa un archivo binario)
+        """
+        # Liberar el mapeo anterior (en Windows, además, impide reemplazar el archivo)
+        if isinstance(self._preguntas, SnapshotBanco):
+            self._preguntas.cerrar()
+            self._preguntas = None
+        
+        if self.ruta_snapshot:
+            self._preguntas = self.pregunta_dao.abrir_snapshot(self.ruta_snapshot)
+        else:
+            self._preguntas = tuple(self.pregunta_dao.obtener_todas_las_preguntas())
+        return self._preguntas
+    
+    def __len__(self):
+        return len(self.preguntas)
+    
+    def __iter__(self):
+        return iter(self.preguntas)
@@ -0,0 +1,130 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Módulo con el motor que reparte por igual las letras de las respuestas
+correctas dentro de cada tema y entre los temas de un lote
+"""
+
+from model.permutaciones import CANTIDAD_ALTERNATIVAS
+
+# Valor con que se marca una pregunta sin alternativa correcta
+SIN_CLAVE = -1
+
+def asignar_letras(correctas, cantidad_temas, generador):
+    """
+    Elige la letra de la respuesta correcta de cada pregunta en cada tema
+    
+    Los temas se agrupan de a cinco: cada grupo parte de un reparto al azar de las
+    letras entre las preguntas con clave (igual cantidad de cada letra) y cada tema
+    del grupo lo desplaza una letra distinta. Así cada tema usa cada letra en la
+    quinta parte de sus preguntas, cada pregunta cae en cada letra en la quinta
+    parte de los temas (con diferencia de a lo sumo uno en ambos casos) y dos temas
+    del mismo grupo nunca tienen la respuesta de una pregunta en la misma letra.
+    
+    Args:
+        correctas (array-like): Alternativa correcta (0-4) de cada pregunta del banco,
+            o SIN_CLAVE
+        cantidad_temas (int): Cantidad de temas del lote
+        generador (numpy.random.Generator): Generador de números aleatorios
+    
+    Returns:
+        ndarray: Matriz (temas, preguntas) con la letra (0-4) de la respuesta, o SIN_CLAVE
+    """
+    import numpy as np
+    
+    correctas = np.asarray(correctas)
+    con_clave = np.flatnonzero(correctas >= 0)
+    grupos = -(-cantidad_temas // CANTIDAD_ALTERNATIVAS)
+    
+    repartos = np.arange(len(con_clave)) % CANTIDAD_ALTERNATIVAS
+    repartos = repartos[np.argsort(generador.random((grupos, len(con_clave))), axis=1)]
+    desplazamientos = np.argsort(generador.random((grupos, CANTIDAD_ALTERNATIVAS)), axis=1).ravel()
+    
+    letras = np.full((cantidad_temas, len(correctas)), SIN_CLAVE, dtype=np.int64)
+    temas = np.arange(cantidad_temas)
+    letras[:, con_clave] = (repartos[temas // CANTIDAD_ALTERNATIVAS]
+                            + desplazamientos[temas, None]) % CANTIDAD_ALTERNATIVAS
+    return letras
+
+class MotorClavesBalanceadas:
+    """
+    Motor que envuelve a otro y rota las alternativas de cada pregunta para que la
+    correcta caiga en la letra elegida por asignar_letras().
+    
+    El orden de las preguntas y el orden relativo de las alternativas (leído en
+    forma circular) son los del motor envuelto; solo cambia dónde empieza la vuelta.
+    Como las letras se eligen para todo el lote de una vez, el motor se crea con la
+    cantidad de temas.
+    """
+    
+    def __init__(self, motor, correctas, cantidad_temas):
+        """
+        Constructor de la clase MotorClavesBalanceadas
+        
+        Args:
+            motor (MotorPermutaciones): Motor que decide el orden de preguntas y alternativas
+            correctas (array-like): Alternativa correcta (0-4) de cada pregunta del banco,
+                o SIN_CLAVE
+            cantidad_temas (int): Cantidad de temas del lote
+        """
+        restricciones = getattr(motor, 'restricciones', None)
+        if restricciones is not None and restricciones.coincidencias_maximas is not None:
+            raise ValueError("Las claves balanceadas fijan qué temas comparten letras de respuesta; "
+                             "no se pueden combinar con un máximo de coincidencias")
+        
+        self.motor = motor
+        self.semilla = motor.semilla
+        self.correctas = correctas
+        self.cantidad_temas = cantidad_temas
+        self._letras = None
+    
+    def letras(self):
+        """
+        Letras de la respuesta correcta de todo el lote, por pregunta del banco
+        
+        Returns:
+            ndarray: Matriz (temas, preguntas) calculada con asignar_letras()
+        """
+        import numpy as np
+        
+        if self._letras is None:
+            generador = np.random.default_rng([self.semilla, self.cantidad_temas, len(self.correctas), 1])
+            self._letras = asignar_letras(self.correctas, self.cantidad_temas, generador)
+        return self._letras
+    
+    def permutacion_tema(self, numero_tema, cantidad_preguntas):
+        """
+        Calcula las permutaciones de un solo tema del lote
+        
+        Returns:
+            tuple: (orden_preguntas, orden_alternativas), como en MotorPermutaciones
+        """
+        ordenes_preguntas, ordenes_alternativas = self.permutaciones_lote(1, cantidad_preguntas, numero_tema)
+        return ordenes_preguntas[0], ordenes_alternativas[0]
+    
+    def permutaciones_lote(self, cantidad_temas, cantidad_preguntas, primer_tema=1):
+        """
+        Devuelve las permutaciones de varios temas consecutivos del lote
+        
+        Returns:
+            tuple: Matrices (temas, n) con el orden de preguntas y (temas, n, 5) con
+                el orden de alternativas
+        """
+        import numpy as np
+        
+        if primer_tema < 1 or primer_tema + cantidad_temas - 1 > self.cantidad_temas:
+            raise ValueError(f"El lote solo tiene los temas 1 a {self.cantidad_temas}")
+        if cantidad_preguntas != len(self.correctas):
+            raise ValueError("La cantidad de preguntas no coincide con la del banco")
+        
+        ordenes_preguntas, ordenes_alternativas = self.motor.permutaciones_lote(
+            cantidad_temas, cantidad_preguntas, primer_tema)
+        letras = self.letras()[primer_tema - 1:primer_tema - 1 + cantidad_temas]
+        
+        # Girar cada pregunta con clave desde la letra actual de la correcta hasta la elegida
+        correctas = np.maximum(np.asarray(self.correctas), 0)
+        actuales = np.argmax(ordenes_alternativas == correctas[None, :, None], axis=2)
+        giros = np.where(letras >= 0, letras - actuales, 0)
+        indices = (np.arange(CANTIDAD_ALTERNATIVAS)[None, None, :] - giros[:, :, None]) % CANTIDAD_ALTERNATIVAS
+        return ordenes_preguntas, np.take_along_axis(ordenes_alternativas, indices, axis=2)
@@ -2,72 +2,201 @@
 # -*- coding: utf-8 -*-
 
 """
-Módulo para la conexión a la base de datos MySQL
+Módulo para la conexión a la base de datos MySQL y la selección del backend
 """
 
 import os
+import time
+import threading
 import configparser
-import mysql.connector
-from mysql.connector import Error
+from contextlib import contextmanager
+from model.sqlite_database import SQLiteConnection, RUTA_SQLITE_POR_DEFECTO
+
+# Cantidad de conexiones del pool si config/database.ini no indica pool_size
+TAMANO_POOL_POR_DEFECTO = 5
+
+# Segundos que un hilo espera por una conexión libre antes de fallar
+ESPERA_MAXIMA_CONEXION = 10
+
+# Ruta del archivo de configuración de la base de datos
+RUTA_CONFIGURACION = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'config', 'database.ini')
+
+_configuracion = None
+
+def leer_configuracion():
+    """
+    Lee config/database.ini una sola vez y devuelve el resultado en caché
+    
+    Returns:
+        configparser.ConfigParser: Configuración de la base de datos
+    """
+    global _configuracion
+    if _configuracion is None:
+        if not os.path.exists(RUTA_CONFIGURACION):
+            raise FileNotFoundError(f"No se encontró el archivo de configuración: {RUTA_CONFIGURACION}")
+        
+        config = configparser.ConfigParser()
+        config.read(RUTA_CONFIGURACION, encoding='utf-8')
+        _configuracion = config
+    
+    return _configuracion
+
+def crear_fuente_configurada():
+    """
+    Crea la fuente de datos indicada en la sección [general] de config/database.ini
+    
+    Con "backend = sqlite" se usa el archivo de la sección [sqlite]; en cualquier
+    otro caso se usa el pool de MySQL.
+    
+    Returns:
+        object: Objeto con un método conexion() que entrega conexiones DB-API
+    """
+    config = leer_configuracion()
+    backend = config.get('general', 'backend', fallback='mysql').strip().lower()
+    
+    if backend == 'sqlite':
+        ruta = config.get('sqlite', 'ruta', fallback=RUTA_SQLITE_POR_DEFECTO)
+        if not os.path.isabs(ruta):
+            ruta = os.path.join(os.path.dirname(os.path.dirname(__file__)), ruta)
+        return SQLiteConnection(ruta)
+    
+    return DatabaseConnection
 
 class DatabaseConnection:
     """
-    Clase para manejar la conexión a la base de datos MySQL
+    Clase para manejar el pool de conexiones a la base de datos MySQL
+    
+    La configuración se lee una sola vez y las conexiones se reparten desde un
+    pool compartido: cada hilo toma su propia conexión y la devuelve al cerrarla,
+    de modo que varios trabajos pueden consultar la base de datos a la vez.
     """
-    _connection = None
+    _pool = None
+    _config = None
+    _lock = threading.Lock()
+    
+    @staticmethod
+    def obtener_configuracion():
+        """
+        Lee config/database.ini la primera vez y devuelve la configuración en caché
+        
+        Returns:
+            dict: Parámetros de la sección [mysql]
+        """
+        if DatabaseConnection._config is None:
+            DatabaseConnection._config = dict(leer_configuracion()['mysql'])
+        
+        return DatabaseConnection._config
+    
+    @staticmethod
+    def inicializar_pool(pool_size=None):
+        """
+        Crea el pool de conexiones si todavía no existe
+        
+        Args:
+            pool_size (int): Cantidad de conexiones. Si se omite se usa el valor
+                pool_size de config/database.ini o TAMANO_POOL_POR_DEFECTO
+        
+        Returns:
+            mysql.connector.pooling.MySQLConnectionPool: Pool de conexiones
+        """
+        # mysql.connector se carga con la primera conexión, no al iniciar la aplicación
+        from mysql.connector import Error, pooling
+        
+        with DatabaseConnection._lock:
+            if DatabaseConnection._pool is None:
+                try:
+                    config = DatabaseConnection.obtener_configuracion()
+                    
+                    if pool_size is None:
+                        pool_size = int(config.get('pool_size', TAMANO_POOL_POR_DEFECTO))
+                    
+                    # Establecer el pool con las credenciales
+                    DatabaseConnection._pool = pooling.MySQLConnectionPool(
+                        pool_name=config.get('pool_name', 'examenes'),
+                        pool_size=pool_size,
+                        pool_reset_session=True,
+                        host=config['host'],
+                        database=config['database'],
+                        user=config['user'],
+                        password=config['password']
+                    )
+                    
+                    print(f"Pool de conexiones a MySQL creado ({pool_size} conexiones)")
+                
+                except Error as e:
+                    print(f"Error al conectar a MySQL: {e}")
+                    raise
+                except FileNotFoundError as e:
+                    print(e)
+                    raise
+                except Exception as e:
+                    print(f"Error inesperado: {e}")
+                    raise
+            
+            return DatabaseConnection._pool
     
     @staticmethod
     def get_connection():
         """
-        Obtiene una conexión a la base de datos
+        Toma una conexión del pool, verificando que siga viva
+        
+        La conexión debe cerrarse con close() para devolverla al pool; conexion()
+        lo hace automáticamente.
         
         Returns:
-            mysql.connector.connection.MySQLConnection: Objeto de conexión a MySQL
+            mysql.connector.pooling.PooledMySQLConnection: Conexión tomada del pool
         """
-        if DatabaseConnection._connection is None or not DatabaseConnection._connection.is_connected():
+        from mysql.connector import Error
+        from mysql.connector.errors import PoolError
+        
+        pool = DatabaseConnection.inicializar_pool()
+        limite = time.monotonic() + ESPERA_MAXIMA_CONEXION
+        
+        while True:
             try:
-                # Cargar configuración desde archivo
-                config = configparser.ConfigParser()
-                config_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'config', 'database.ini')
-                
-                if not os.path.exists(config_path):
-                    raise FileNotFoundError(f"No se encontró el archivo de configuración: {config_path}")
-                
-                config.read(config_path)
-                
-                # Obtener credenciales
-                host = config['mysql']['host']
-                database = config['mysql']['database']
-                user = config['mysql']['user']
-                password = config['mysql']['password']
-                
-                # Establecer conexión
-                DatabaseConnection._connection = mysql.connector.connect(
-                    host=host,
-                    database=database,
-                    user=user,
-                    password=password
-                )
-                
-                print("Conexión a MySQL establecida correctamente")
-                
-            except Error as e:
-                print(f"Error al conectar a MySQL: {e}")
-                raise
-            except FileNotFoundError as e:
-                print(e)
-                raise
-            except Exception as e:
-                print(f"Error inesperado: {e}")
-                raise
-                
-        return DatabaseConnection._connection
+                conn = pool.get_connection()
+                break
+            except PoolError:
+                # Todas las conexiones están ocupadas por otros hilos
+                if time.monotonic() >= limite:
+                    raise
+                time.sleep(0.05)
+        
+        # Verificar la salud de la conexión y reconectar si el servidor la cerró
+        try:
+            conn.ping(reconnect=True, attempts=3, delay=1)
+        except Error:
+            conn.close()
+            raise
+        
+        return conn
+    
+    @staticmethod
+    @contextmanager
+    def conexion():
+        """
+        Administrador de contexto que toma una conexión del pool y la devuelve al salir
+        
+        Yields:
+            mysql.connector.pooling.PooledMySQLConnection: Conexión tomada del pool
+        """
+        conn = DatabaseConnection.get_connection()
+        try:
+            yield conn
+        finally:
+            conn.close()
     
     @staticmethod
     def close_connection():
         """
-        Cierra la conexión a la base de datos
+        Descarta el pool de conexiones
+        
+        mysql.connector no ofrece una forma pública de cerrar las conexiones libres
+        del pool, así que solo se suelta la referencia: las conexiones libres se
+        cierran cuando el pool se libera, y las que otros hilos todavía usan vuelven
+        al pool descartado al cerrarlas. La próxima conexión crea un pool nuevo.
         """
-        if DatabaseConnection._connection and DatabaseConnection._connection.is_connected():
-            DatabaseConnection._connection.close()
-            print("Conexión a MySQL cerrada")
\ No newline at end of file
+        with DatabaseConnection._lock:
+            if DatabaseConnection._pool is not None:
+                DatabaseConnection._pool = None
+                print("Conexiones a MySQL cerradas")
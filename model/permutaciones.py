@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Módulo con el motor de permutaciones deterministas para las versiones de examen
+"""
+
+import secrets
+
+# Cantidad de alternativas por pregunta (a, b, c, d, e)
+CANTIDAD_ALTERNATIVAS = 5
+
+class MotorPermutaciones:
+    """
+    Motor que deriva el orden de preguntas y alternativas de cada tema a partir
+    de la pareja (semilla del lote, número de tema).
+    
+    Cada tema usa su propio generador, por lo que cualquier versión puede
+    regenerarse de forma independiente, en otro hilo o en otro proceso, sin
+    almacenarla y sin depender del estado global del módulo random.
+    """
+    
+    def __init__(self, semilla=None):
+        """
+        Constructor de la clase MotorPermutaciones
+        
+        Args:
+            semilla (int): Semilla del lote (entero no negativo). Si se omite se elige al azar
+        """
+        if semilla is None:
+            semilla = secrets.randbits(63)
+        
+        semilla = int(semilla)
+        if semilla < 0:
+            raise ValueError("La semilla debe ser un entero no negativo")
+        
+        self.semilla = semilla
+    
+    def _claves(self, numero_tema, cantidad_preguntas):
+        """
+        Genera las claves aleatorias de un tema; ordenarlas produce sus permutaciones
+        
+        Returns:
+            tuple: Claves de las preguntas (n,) y de las alternativas (n, 5)
+        """
+        # NumPy se carga con el primer lote, no al iniciar la aplicación
+        import numpy as np
+        
+        generador = np.random.default_rng([self.semilla, numero_tema])
+        claves_preguntas = generador.random(cantidad_preguntas)
+        claves_alternativas = generador.random((cantidad_preguntas, CANTIDAD_ALTERNATIVAS))
+        return claves_preguntas, claves_alternativas
+    
+    def permutacion_tema(self, numero_tema, cantidad_preguntas):
+        """
+        Calcula las permutaciones de un solo tema
+        
+        Args:
+            numero_tema (int): Número del tema (1, 2, 3, ...)
+            cantidad_preguntas (int): Cantidad de preguntas del banco
+        
+        Returns:
+            tuple: (orden_preguntas, orden_alternativas). orden_preguntas[i] es el índice
+                en el banco de la pregunta que va en la posición i; orden_alternativas[j]
+                indica, para la pregunta j del banco, qué alternativa original va en cada letra
+        """
+        import numpy as np
+        
+        claves_preguntas, claves_alternativas = self._claves(numero_tema, cantidad_preguntas)
+        return (
+            np.argsort(claves_preguntas, kind='stable'),
+            np.argsort(claves_alternativas, axis=1, kind='stable')
+        )
+    
+    def permutaciones_lote(self, cantidad_temas, cantidad_preguntas, primer_tema=1):
+        """
+        Calcula las permutaciones de todo un lote con un único argsort vectorizado
+        
+        El resultado de cada fila es idéntico al de permutacion_tema para ese tema.
+        
+        Args:
+            cantidad_temas (int): Cantidad de temas del lote
+            cantidad_preguntas (int): Cantidad de preguntas del banco
+            primer_tema (int): Número del primer tema del lote
+        
+        Returns:
+            tuple: Matrices (temas, n) con el orden de preguntas y (temas, n, 5) con
+                el orden de alternativas
+        """
+        import numpy as np
+        
+        claves_preguntas = np.empty((cantidad_temas, cantidad_preguntas))
+        claves_alternativas = np.empty((cantidad_temas, cantidad_preguntas, CANTIDAD_ALTERNATIVAS))
+        
+        for fila in range(cantidad_temas):
+            claves_preguntas[fila], claves_alternativas[fila] = self._claves(
+                primer_tema + fila, cantidad_preguntas)
+        
+        return (
+            np.argsort(claves_preguntas, axis=1, kind='stable'),
+            np.argsort(claves_alternativas, axis=2, kind='stable')
+        )
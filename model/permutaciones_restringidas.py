@@ -0,0 +1,315 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Módulo con el motor de permutaciones que garantiza una distancia mínima entre
+todos los temas de un lote, para que dos postulantes sentados uno al lado del
+otro no reciban exámenes parecidos
+"""
+
+from collections import namedtuple
+from model.permutaciones import MotorPermutaciones, CANTIDAD_ALTERNATIVAS
+
+# Restricciones entre cada par de temas del lote:
+# - distancia_minima: fracción mínima de pares de preguntas que los dos temas
+#   ordenan al revés (distancia de Kendall normalizada; dos órdenes al azar
+#   quedan alrededor de 0.5)
+# - coincidencias_maximas: fracción máxima de las preguntas cuya respuesta
+#   quedaría en la misma letra en los dos temas, o None para aceptar la que
+#   garantiza la construcción
+Restricciones = namedtuple('Restricciones', ['distancia_minima', 'coincidencias_maximas'],
+                           defaults=(0.3, None))
+
+# Cantidad de órdenes al azar que se prueban para cada tema antes de desistir
+INTENTOS_POR_TEMA = 200
+
+# Franjas en que se agrupan las posiciones para acotar la distancia de Kendall
+# sin compararla pregunta por pregunta
+_FRANJAS = 32
+
+# Comparaciones que se hacen a la vez al contar inversiones
+_BLOQUE_COMPARACIONES = 1 << 22
+
+def distancia_kendall(orden_a, orden_b):
+    """
+    Distancia de Kendall normalizada entre dos órdenes de las mismas preguntas
+    
+    Args:
+        orden_a (array-like): Índice en el banco de la pregunta de cada posición
+        orden_b (array-like): Otro orden de las mismas preguntas
+    
+    Returns:
+        float: Fracción de pares de preguntas que los dos órdenes ponen al revés (0 a 1)
+    """
+    import numpy as np
+    
+    orden_a = np.asarray(orden_a)
+    cantidad = len(orden_a)
+    if cantidad < 2:
+        return 0.0
+    
+    posiciones_b = np.empty(cantidad, dtype=np.int64)
+    posiciones_b[np.asarray(orden_b)] = np.arange(cantidad)
+    return _inversiones(posiciones_b[orden_a]) / (cantidad * (cantidad - 1) // 2)
+
+def coincidencias_alternativas(ordenes_alternativas):
+    """
+    Cuenta, para cada par de temas, cuántas respuestas quedarían en la misma letra
+    
+    Como el motor no conoce la clave, se cuentan las alternativas que los dos temas
+    ponen en la misma letra divididas entre CANTIDAD_ALTERNATIVAS: es la cantidad
+    esperada de preguntas con la respuesta en la misma letra si la correcta
+    pudiera ser cualquiera.
+    
+    Args:
+        ordenes_alternativas (ndarray): Matriz (temas, preguntas, 5) como la de
+            MotorPermutaciones.permutaciones_lote()
+    
+    Returns:
+        ndarray: Matriz simétrica (temas, temas); la diagonal es la cantidad de preguntas
+    """
+    import numpy as np
+    
+    ordenes = np.asarray(ordenes_alternativas)
+    temas, cantidad, _ = ordenes.shape
+    
+    # Letra de cada alternativa original, en una columna por (pregunta, alternativa, letra)
+    letras = np.argsort(ordenes, axis=2)
+    marcas = np.zeros((temas, cantidad * CANTIDAD_ALTERNATIVAS, CANTIDAD_ALTERNATIVAS), dtype=np.float32)
+    np.put_along_axis(marcas, letras.reshape(temas, -1, 1), 1, axis=2)
+    marcas = marcas.reshape(temas, -1)
+    return (marcas @ marcas.T) / CANTIDAD_ALTERNATIVAS
+
+def _inversiones(secuencias):
+    """
+    Cuenta los pares (i < j) con secuencia[i] > secuencia[j] de cada secuencia
+    
+    Args:
+        secuencias (ndarray): Una secuencia o una matriz con una secuencia por fila
+    
+    Returns:
+        int o ndarray: Cantidad de inversiones de cada secuencia
+    """
+    import numpy as np
+    
+    secuencias = np.asarray(secuencias)
+    cantidad = secuencias.shape[-1]
+    filas = max(1, _BLOQUE_COMPARACIONES // max(secuencias.size, 1))
+    total = np.zeros(secuencias.shape[:-1], dtype=np.int64)
+    for inicio in range(0, cantidad, filas):
+        bloque = secuencias[..., inicio:inicio + filas]
+        mayores = bloque[..., :, None] > secuencias[..., None, inicio:]
+        total += np.count_nonzero(np.triu(mayores, 1), axis=(-2, -1))
+    return int(total) if total.ndim == 0 else total
+
+def _cota_discordancias(franjas, franjas_anteriores, cantidad_franjas):
+    """
+    Cota inferior de los pares de preguntas que un orden pone al revés que otros
+    
+    Dos preguntas que están en franjas distintas en ambos órdenes, y en sentido
+    contrario, seguro quedan al revés; las que comparten franja en alguno de los
+    dos no se cuentan.
+    
+    Args:
+        franjas (ndarray): Franja (0 a cantidad_franjas - 1) de cada pregunta del banco
+        franjas_anteriores (ndarray): Matriz (temas, preguntas) con las franjas de otros temas
+        cantidad_franjas (int): Cantidad de franjas
+    
+    Returns:
+        ndarray: Cota para cada uno de los otros temas
+    """
+    import numpy as np
+    
+    temas = len(franjas_anteriores)
+    celdas = cantidad_franjas * cantidad_franjas
+    codigos = (np.arange(temas)[:, None] * celdas + franjas[None, :] * cantidad_franjas + franjas_anteriores)
+    conteo = np.bincount(codigos.ravel(), minlength=temas * celdas).reshape(
+        temas, cantidad_franjas, cantidad_franjas)
+    
+    # Preguntas con franja posterior en este orden y anterior en el otro, por celda
+    posteriores = conteo.sum(axis=1, keepdims=True) - conteo.cumsum(axis=1)
+    contrarias = posteriores.cumsum(axis=2) - posteriores
+    return (conteo * contrarias).sum(axis=(1, 2))
+
+class MotorRestringido(MotorPermutaciones):
+    """
+    Motor que deriva todo un lote de una vez y garantiza, entre cada par de temas,
+    una distancia mínima en el orden de las preguntas y un máximo de respuestas en
+    la misma letra.
+    
+    Las alternativas de cada pregunta se rotan sobre un orden base: dos temas con
+    distinta rotación no ponen ninguna alternativa en la misma letra. Las rotaciones
+    de cada tema son las palabras de un código lineal sobre GF(5) cuyas columnas
+    recorren por igual todas las direcciones (un código símplex, que forma un arreglo
+    ortogonal), así que todo par de temas coincide en la misma fracción de preguntas:
+    ninguna con hasta 5 temas, 1/6 con hasta 25 y 24/124 con hasta 125, casi el
+    mínimo posible. El orden de las preguntas se sortea y se vuelve a sortear
+    mientras quede demasiado cerca del de algún tema anterior.
+    
+    Con la misma semilla, la misma cantidad de temas y de preguntas y las mismas
+    restricciones se obtiene siempre el mismo lote.
+    """
+    
+    def __init__(self, semilla=None, cantidad_temas=1, restricciones=None):
+        """
+        Constructor de la clase MotorRestringido
+        
+        Args:
+            semilla (int): Semilla del lote (entero no negativo). Si se omite se elige al azar
+            cantidad_temas (int): Cantidad de temas del lote
+            restricciones (Restricciones): Restricciones entre cada par de temas;
+                por defecto Restricciones()
+        """
+        super().__init__(semilla)
+        if cantidad_temas < 1:
+            raise ValueError("El lote debe tener al menos un tema")
+        
+        self.cantidad_temas = cantidad_temas
+        self.restricciones = restricciones if restricciones is not None else Restricciones()
+        self._lotes = {}
+    
+    def permutacion_tema(self, numero_tema, cantidad_preguntas):
+        """
+        Calcula las permutaciones de un solo tema del lote
+        
+        Args:
+            numero_tema (int): Número del tema (1 a cantidad_temas)
+            cantidad_preguntas (int): Cantidad de preguntas del banco
+        
+        Returns:
+            tuple: (orden_preguntas, orden_alternativas), como en MotorPermutaciones
+        """
+        ordenes_preguntas, ordenes_alternativas = self.permutaciones_lote(1, cantidad_preguntas, numero_tema)
+        return ordenes_preguntas[0], ordenes_alternativas[0]
+    
+    def permutaciones_lote(self, cantidad_temas, cantidad_preguntas, primer_tema=1):
+        """
+        Devuelve las permutaciones de varios temas consecutivos del lote
+        
+        Args:
+            cantidad_temas (int): Cantidad de temas
+            cantidad_preguntas (int): Cantidad de preguntas del banco
+            primer_tema (int): Número del primer tema
+        
+        Returns:
+            tuple: Matrices (temas, n) con el orden de preguntas y (temas, n, 5) con
+                el orden de alternativas
+        """
+        if primer_tema < 1 or primer_tema + cantidad_temas - 1 > self.cantidad_temas:
+            raise ValueError(f"El lote solo tiene los temas 1 a {self.cantidad_temas}")
+        
+        if cantidad_preguntas not in self._lotes:
+            self._lotes[cantidad_preguntas] = self._construir_lote(cantidad_preguntas)
+        ordenes_preguntas, ordenes_alternativas = self._lotes[cantidad_preguntas]
+        
+        filas = slice(primer_tema - 1, primer_tema - 1 + cantidad_temas)
+        return ordenes_preguntas[filas].copy(), ordenes_alternativas[filas].copy()
+    
+    def _construir_lote(self, cantidad_preguntas):
+        """
+        Construye las permutaciones de todos los temas del lote
+        
+        Returns:
+            tuple: Matrices de orden de preguntas y de alternativas de todo el lote
+        """
+        import numpy as np
+        
+        generador = np.random.default_rng([self.semilla, self.cantidad_temas, cantidad_preguntas])
+        rotaciones = self._rotaciones(generador, cantidad_preguntas)
+        
+        # Cada tema rota el orden base de las alternativas de cada pregunta
+        base = np.argsort(generador.random((cantidad_preguntas, CANTIDAD_ALTERNATIVAS)), axis=1)
+        indices = (np.arange(CANTIDAD_ALTERNATIVAS)[None, None, :] - rotaciones[:, :, None]) % CANTIDAD_ALTERNATIVAS
+        ordenes_alternativas = np.take_along_axis(
+            np.broadcast_to(base, rotaciones.shape + (CANTIDAD_ALTERNATIVAS,)), indices, axis=2)
+        
+        return self._ordenes_preguntas(generador, cantidad_preguntas), ordenes_alternativas
+    
+    def _rotaciones(self, generador, cantidad_preguntas):
+        """
+        Elige la rotación de las alternativas de cada pregunta en cada tema
+        
+        Returns:
+            ndarray: Matriz (temas, preguntas) con rotaciones de 0 a 4
+        """
+        import numpy as np
+        
+        base = CANTIDAD_ALTERNATIVAS
+        dimension = 1
+        while base ** dimension < self.cantidad_temas:
+            dimension += 1
+        
+        # Cada tema es un vector distinto de GF(5)^dimension
+        digitos = base ** np.arange(dimension)
+        mensajes = generador.choice(base ** dimension, self.cantidad_temas, replace=False)
+        mensajes = (mensajes[:, None] // digitos) % base
+        
+        # Direcciones de GF(5)^dimension (vectores cuyo primer valor distinto de 0 es 1)
+        vectores = (np.arange(1, base ** dimension)[:, None] // digitos[::-1]) % base
+        primeros = vectores[np.arange(len(vectores)), np.argmax(vectores != 0, axis=1)]
+        direcciones = vectores[primeros == 1]
+        
+        limite = self.restricciones.coincidencias_maximas
+        for _ in range(INTENTOS_POR_TEMA):
+            # Las columnas recorren todas las direcciones por igual; el desplazamiento
+            # de cada pregunta no cambia en qué preguntas coinciden dos temas
+            columnas = np.resize(generador.permutation(len(direcciones)), cantidad_preguntas)
+            columnas = direcciones[generador.permutation(columnas)]
+            desplazamientos = generador.integers(base, size=cantidad_preguntas)
+            rotaciones = (mensajes @ columnas.T + desplazamientos) % base
+            
+            if limite is None or self.cantidad_temas < 2:
+                return rotaciones
+            iguales = (rotaciones[:, None, :] == rotaciones[None, :, :]).sum(axis=2)
+            np.fill_diagonal(iguales, 0)
+            if iguales.max() <= limite * cantidad_preguntas:
+                return rotaciones
+        
+        raise ValueError(
+            f"No se pudo limitar las respuestas en la misma letra a {limite:.0%} de las preguntas "
+            f"con {self.cantidad_temas} temas; el mínimo garantizado es "
+            f"{(base ** (dimension - 1) - 1) / (base ** dimension - 1):.0%}")
+    
+    def _ordenes_preguntas(self, generador, cantidad_preguntas):
+        """
+        Sortea el orden de las preguntas de cada tema respetando la distancia mínima
+        
+        Returns:
+            ndarray: Matriz (temas, preguntas) con el orden de las preguntas
+        """
+        import numpy as np
+        
+        ordenes = np.empty((self.cantidad_temas, cantidad_preguntas), dtype=np.int64)
+        minima = self.restricciones.distancia_minima
+        pares = cantidad_preguntas * (cantidad_preguntas - 1) // 2
+        if not minima or pares == 0:
+            for tema in range(self.cantidad_temas):
+                ordenes[tema] = generador.permutation(cantidad_preguntas)
+            return ordenes
+        
+        cantidad_franjas = min(cantidad_preguntas, _FRANJAS)
+        posiciones = np.empty_like(ordenes)
+        franjas = np.empty_like(ordenes)
+        necesarias = minima * pares
+        
+        for tema in range(self.cantidad_temas):
+            for _ in range(INTENTOS_POR_TEMA):
+                orden = generador.permutation(cantidad_preguntas)
+                posiciones[tema, orden] = np.arange(cantidad_preguntas)
+                franjas[tema] = posiciones[tema] * cantidad_franjas // cantidad_preguntas
+                
+                # Con pocas preguntas se cuenta exacto; si no, la cota descarta casi
+                # todos los pares y solo los dudosos se cuentan exactos
+                if cantidad_preguntas <= 2 * _FRANJAS:
+                    dudosos = np.arange(tema)
+                else:
+                    cotas = _cota_discordancias(franjas[tema], franjas[:tema], cantidad_franjas)
+                    dudosos = np.flatnonzero(cotas < necesarias)
+                if np.all(_inversiones(posiciones[tema][ordenes[dudosos]]) >= necesarias):
+                    ordenes[tema] = orden
+                    break
+            else:
+                raise ValueError(
+                    f"No se encontró un orden para el tema {tema + 1} a distancia {minima} de los "
+                    f"anteriores; con {cantidad_preguntas} preguntas pruebe una distancia mínima menor")
+        return ordenes
@@ -5,13 +5,55 @@
 Módulo que define la clase Pregunta para el modelo de datos
 """
 
-class Pregunta:
+from operator import itemgetter
+
+# Letras con las que se imprimen las alternativas, en orden
+LETRAS_ALTERNATIVAS = ('a', 'b', 'c', 'd', 'e')
+
+def indice_alternativa(alternativa):
+    """
+    Normaliza una alternativa indicada por letra o por índice
+    
+    Args:
+        alternativa (int | str): Índice (0-4) o letra ('a'-'e', sin distinguir mayúsculas)
+    
+    Returns:
+        int: Índice de la alternativa, o None si no se indicó
+    """
+    if alternativa is None or alternativa == "":
+        return None
+    if isinstance(alternativa, str):
+        letra = alternativa.strip().lower()
+        if letra not in LETRAS_ALTERNATIVAS:
+            raise ValueError(f"Alternativa no válida: {alternativa!r}")
+        return LETRAS_ALTERNATIVAS.index(letra)
+    
+    indice = int(alternativa)
+    if not 0 <= indice < len(LETRAS_ALTERNATIVAS):
+        raise ValueError(f"Alternativa no válida: {alternativa!r}")
+    return indice
+
+class Pregunta(tuple):
     """
     Clase modelo que representa una pregunta del examen con sus alternativas
+    
+    Es un registro inmutable al estilo NamedTuple (id, enunciado, a, b, c, d, e,
+    correcta): no tiene __dict__ por instancia y las alternativas se recorren como
+    una tupla con el atributo alternativas. Los atributos alternativa_a a
+    alternativa_e se mantienen como propiedades de solo lectura.
+    
+    Como toda tupla, se compara por valor: dos preguntas son iguales (y tienen el
+    mismo hash) si coinciden todos sus campos, y distintas si cambia cualquier
+    texto aunque tengan el mismo id. len() y la iteración recorren los ocho campos
+    del registro, no las alternativas. Para buscar una pregunta del banco por su
+    identificador compare el atributo id.
     """
     
-    def __init__(self, id=None, enunciado=None, alternativa_a=None, alternativa_b=None, 
-                 alternativa_c=None, alternativa_d=None, alternativa_e=None):
+    __slots__ = ()
+    
+    def __new__(cls, id=None, enunciado=None, alternativa_a=None, alternativa_b=None,
+                alternativa_c=None, alternativa_d=None, alternativa_e=None, alternativas=None,
+                alternativa_correcta=None):
         """
         Constructor de la clase Pregunta
         
@@ -23,14 +65,59 @@ class Pregunta:
             alternativa_c (str): Texto de la alternativa C
             alternativa_d (str): Texto de la alternativa D
             alternativa_e (str): Texto de la alternativa E
+            alternativas (iterable): Las cinco alternativas juntas; si se indica
+                reemplaza a alternativa_a..alternativa_e
+            alternativa_correcta (int | str): Alternativa correcta, como índice (0-4)
+                o como letra ('a'-'e'); None si la pregunta no tiene clave
+        """
+        if alternativas is None:
+            alternativas = (alternativa_a, alternativa_b, alternativa_c, alternativa_d, alternativa_e)
+        else:
+            alternativas = tuple(alternativas)
+        
+        if len(alternativas) != len(LETRAS_ALTERNATIVAS):
+            raise ValueError(f"Una pregunta debe tener {len(LETRAS_ALTERNATIVAS)} alternativas")
+        
+        return tuple.__new__(cls, (id, enunciado) + alternativas + (indice_alternativa(alternativa_correcta),))
+    
+    def __getnewargs__(self):
+        # Permite copiar la pregunta con pickle (por ejemplo, hacia un pool de procesos)
+        return tuple(self[:7]) + (None, self[7])
+    
+    id = property(itemgetter(0), doc="Identificador único de la pregunta")
+    enunciado = property(itemgetter(1), doc="Texto de la pregunta")
+    alternativa_a = property(itemgetter(2), doc="Texto de la alternativa A")
+    alternativa_b = property(itemgetter(3), doc="Texto de la alternativa B")
+    alternativa_c = property(itemgetter(4), doc="Texto de la alternativa C")
+    alternativa_d = property(itemgetter(5), doc="Texto de la alternativa D")
+    alternativa_e = property(itemgetter(6), doc="Texto de la alternativa E")
+    alternativa_correcta = property(itemgetter(7), doc="Índice (0-4) de la alternativa correcta, o None")
+    
+    @property
+    def alternativas(self):
+        """
+        Las cinco alternativas en su orden original
+        
+        Returns:
+            tuple: Textos de las alternativas a..e
         """
-        self.id = id
-        self.enunciado = enunciado
-        self.alternativa_a = alternativa_a
-        self.alternativa_b = alternativa_b
-        self.alternativa_c = alternativa_c
-        self.alternativa_d = alternativa_d
-        self.alternativa_e = alternativa_e
+        return self[2:7]
+    
+    @property
+    def letra_correcta(self):
+        """
+        Letra de la alternativa correcta en el orden original
+        
+        Returns:
+            str: Letra 'a'-'e', o None si la pregunta no tiene clave
+        """
+        if self.alternativa_correcta is None:
+            return None
+        return LETRAS_ALTERNATIVAS[self.alternativa_correcta]
+    
+    def __repr__(self):
+        return (f"Pregunta(id={self.id!r}, enunciado={self.enunciado!r}, alternativas={self.alternativas!r}, "
+                f"alternativa_correcta={self.alternativa_correcta!r})")
     
     def __str__(self):
         """
@@ -39,4 +126,4 @@ class Pregunta:
         Returns:
             str: Representación textual de la pregunta
         """
-        return f"Pregunta {self.id}: {self.enunciado}"
\ No newline at end of file
+        return f"Pregunta {self.id}: {self.enunciado}"
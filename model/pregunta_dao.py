@@ -5,108 +5,212 @@
 Módulo para el acceso a datos de las preguntas
 """
 
-import random
-from model.database import DatabaseConnection
-from model.pregunta import Pregunta
+from model.database import crear_fuente_configurada
+from model.pregunta import Pregunta, indice_alternativa
+from model.permutaciones import MotorPermutaciones
+from model.snapshot_banco import SnapshotBanco, exportar_snapshot
+
+# Columnas que tiene la tabla preguntas desde su primera versión
+_COLUMNAS = "id, enunciado, alternativa_a, alternativa_b, alternativa_c, alternativa_d, alternativa_e"
+
+def _falta_columna(error):
+    """
+    Indica si un error de la consulta se debe a una columna que la tabla no tiene
+    
+    Args:
+        error (Exception): Error de MySQL (errno 1054) o de SQLite ("no such column")
+    
+    Returns:
+        bool: True si la consulta nombró una columna inexistente
+    """
+    return getattr(error, 'errno', None) == 1054 or 'no such column' in str(error).lower()
+
+def _clave_fila(row):
+    """
+    Normaliza la alternativa correcta leída de una fila de la tabla preguntas
+    
+    Un valor que no es una letra a-e ni un índice 0-4 se trata como pregunta sin
+    clave (y se informa el id), en lugar de interrumpir la carga del banco.
+    
+    Returns:
+        int: Índice (0-4) de la alternativa correcta, o None
+    """
+    try:
+        return indice_alternativa(row[7])
+    except (TypeError, ValueError):
+        print(f"Pregunta {row[0]}: alternativa_correcta no válida ({row[7]!r}), se carga sin clave")
+        return None
 
 class PreguntaDAO:
     """
     Clase de acceso a datos para las preguntas del examen
+    
+    El almacenamiento es intercambiable: cualquier fuente con un método conexion()
+    que entregue una conexión DB-API sirve (el pool de MySQL o un archivo SQLite).
     """
     
+    def __init__(self, fuente=None):
+        """
+        Constructor de la clase PreguntaDAO
+        
+        Args:
+            fuente (object): Fuente de datos (DatabaseConnection, SQLiteConnection, ...).
+                Si se omite se usa la indicada en config/database.ini
+        """
+        self._fuente = fuente
+    
+    @property
+    def fuente(self):
+        """
+        Fuente de datos; la configurada se resuelve en el primer uso
+        """
+        if self._fuente is None:
+            self._fuente = crear_fuente_configurada()
+        return self._fuente
+    
     def obtener_todas_las_preguntas(self):
         """
         Obtiene todas las preguntas de la base de datos
         
         Returns:
-            list: Lista de objetos Pregunta
+            list: Lista de objetos Pregunta; vacía si la consulta falla (nunca
+                una parte del banco)
         """
         preguntas = []
-        sql = "SELECT id, enunciado, alternativa_a, alternativa_b, alternativa_c, alternativa_d, alternativa_e FROM preguntas"
         
         try:
-            conn = DatabaseConnection.get_connection()
-            cursor = conn.cursor()
-            cursor.execute(sql)
-            resultados = cursor.fetchall()
-            
-            for row in resultados:
-                pregunta = Pregunta(
-                    id=row[0],
-                    enunciado=row[1],
-                    alternativa_a=row[2],
-                    alternativa_b=row[3],
-                    alternativa_c=row[4],
-                    alternativa_d=row[5],
-                    alternativa_e=row[6]
-                )
-                preguntas.append(pregunta)
+            # La conexión se devuelve a la fuente al terminar la consulta
+            with self.fuente.conexion() as conn:
+                cursor = conn.cursor()
+                try:
+                    cursor.execute(f"SELECT {_COLUMNAS}, alternativa_correcta FROM preguntas")
+                except Exception as e:
+                    if not _falta_columna(e):
+                        raise
+                    # Tabla creada antes de la columna alternativa_correcta (ver README):
+                    # las preguntas se cargan sin clave y no se exportan claves
+                    cursor.close()
+                    cursor = conn.cursor()
+                    cursor.execute(f"SELECT {_COLUMNAS}, NULL FROM preguntas")
+                resultados = cursor.fetchall()
                 
-            cursor.close()
+                for row in resultados:
+                    pregunta = Pregunta(
+                        id=row[0],
+                        enunciado=row[1],
+                        alternativas=row[2:7],
+                        alternativa_correcta=_clave_fila(row)
+                    )
+                    preguntas.append(pregunta)
+                    
+                cursor.close()
             
         except Exception as e:
             print(f"Error al obtener preguntas: {e}")
+            return []
         
         return preguntas
     
-    def obtener_preguntas_aleatorias(self):
+    def exportar_snapshot(self, ruta):
+        """
+        Exporta la tabla preguntas a un archivo binario para abrirlo luego con mmap
+        
+        Args:
+            ruta (str): Ruta del archivo de destino
+            
+        Returns:
+            int: Cantidad de preguntas exportadas
+        """
+        return exportar_snapshot(self.obtener_todas_las_preguntas(), ruta)
+    
+    def abrir_snapshot(self, ruta):
+        """
+        Abre un banco exportado con exportar_snapshot() sin consultar la base de datos
+        
+        Args:
+            ruta (str): Ruta del archivo binario
+            
+        Returns:
+            SnapshotBanco: Secuencia de preguntas que se construyen al accederlas
+        """
+        return SnapshotBanco(ruta)
+    
+    def obtener_preguntas_aleatorias(self, preguntas=None, motor=None, numero_tema=1):
         """
         Obtiene todas las preguntas en orden aleatorio
         
+        Args:
+            preguntas (list): Preguntas ya cargadas en memoria. Si se omite,
+                se consultan todas las preguntas de la base de datos
+            motor (MotorPermutaciones): Motor que fija el orden. Si se omite se usa uno con semilla al azar
+            numero_tema (int): Número del tema cuyo orden se desea
+        
         Returns:
             list: Lista de objetos Pregunta en orden aleatorio
         """
-        preguntas = self.obtener_todas_las_preguntas()
+        if preguntas is None:
+            preguntas = self.obtener_todas_las_preguntas()
+        if motor is None:
+            motor = MotorPermutaciones()
         
-        # Mezclar el orden de las preguntas
-        random.shuffle(preguntas)
+        orden_preguntas, _ = motor.permutacion_tema(numero_tema, len(preguntas))
         
-        return preguntas
+        return [preguntas[i] for i in orden_preguntas]
     
-    def reorganizar_alternativas(self, pregunta):
+    def reorganizar_alternativas(self, pregunta, orden=None):
         """
-        Reorganiza aleatoriamente las alternativas de una pregunta
+        Reorganiza las alternativas de una pregunta
         
         Args:
             pregunta (Pregunta): La pregunta cuyas alternativas se reorganizarán
+            orden (sequence): Índice de la alternativa original que va en cada letra.
+                Si se omite se usa un orden al azar
             
         Returns:
-            Pregunta: Una nueva pregunta con las alternativas reorganizadas
+            Pregunta: Una nueva pregunta con las alternativas reorganizadas; su
+                alternativa_correcta indica dónde quedó la correcta
         """
-        # Crear una lista con las alternativas
-        alternativas = [
-            pregunta.alternativa_a,
-            pregunta.alternativa_b,
-            pregunta.alternativa_c,
-            pregunta.alternativa_d,
-            pregunta.alternativa_e
-        ]
+        if orden is None:
+            _, orden_alternativas = MotorPermutaciones().permutacion_tema(1, 1)
+            orden = orden_alternativas[0]
         
-        # Mezclar las alternativas
-        random.shuffle(alternativas)
+        orden = [int(i) for i in orden]
+        correcta = pregunta.alternativa_correcta
         
         # Crear una nueva pregunta con las alternativas reorganizadas
         return Pregunta(
             id=pregunta.id,
             enunciado=pregunta.enunciado,
-            alternativa_a=alternativas[0],
-            alternativa_b=alternativas[1],
-            alternativa_c=alternativas[2],
-            alternativa_d=alternativas[3],
-            alternativa_e=alternativas[4]
+            alternativas=[pregunta.alternativas[i] for i in orden],
+            alternativa_correcta=orden.index(correcta) if correcta is not None else None
         )
     
-    def generar_examen_aleatorio(self):
+    def generar_examen_aleatorio(self, preguntas=None, motor=None, numero_tema=1):
         """
         Genera un conjunto de preguntas con alternativas reorganizadas para un tema específico
         
+        El orden de preguntas y alternativas se deriva de (semilla del motor, número de
+        tema), de modo que el mismo tema siempre produce el mismo examen.
+        
+        Args:
+            preguntas (list): Preguntas ya cargadas en memoria (por ejemplo, la
+                instantánea de un BancoPreguntas). Si se omite, se consultan a la base de datos
+            motor (MotorPermutaciones): Motor de permutaciones del lote. Si se omite se usa uno con semilla al azar
+            numero_tema (int): Número del tema a generar (1, 2, 3, ...)
+        
         Returns:
             list: Lista de preguntas con alternativas reorganizadas
         """
-        preguntas_originales = self.obtener_preguntas_aleatorias()
+        if preguntas is None:
+            preguntas = self.obtener_todas_las_preguntas()
+        if motor is None:
+            motor = MotorPermutaciones()
+        
+        orden_preguntas, orden_alternativas = motor.permutacion_tema(numero_tema, len(preguntas))
         preguntas_reorganizadas = []
         
-        for pregunta in preguntas_originales:
-            preguntas_reorganizadas.append(self.reorganizar_alternativas(pregunta))
+        for i in orden_preguntas:
+            preguntas_reorganizadas.append(
+                self.reorganizar_alternativas(preguntas[i], orden_alternativas[i]))
         
         return preguntas_reorganizadas
\ No newline at end of file
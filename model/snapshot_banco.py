@@ -0,0 +1,197 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Módulo para exportar el banco de preguntas a un archivo binario versionado
+y abrirlo mediante mmap
+"""
+
+import os
+import sys
+import mmap
+import struct
+import hashlib
+from collections.abc import Sequence
+from model.pregunta import Pregunta
+
+# Identificador y versión del formato del archivo
+FIRMA = b'EXBP'
+VERSION_FORMATO = 2
+
+# Cabecera: firma, versión, reservado, cantidad de preguntas
+_CABECERA = struct.Struct('<4sHHI')
+
+# Índice por pregunta según la versión del formato: id, 7 desplazamientos dentro
+# del bloque de textos (inicio del enunciado, inicio de cada alternativa y fin de
+# la última) y, desde la versión 2, el índice de la alternativa correcta (-1 si no tiene)
+_INDICES = {
+    1: struct.Struct('<q7I'),
+    2: struct.Struct('<q7Ib'),
+}
+_INDICE = _INDICES[VERSION_FORMATO]
+
+def exportar_snapshot(preguntas, ruta):
+    """
+    Escribe las preguntas en un archivo binario con índice de desplazamientos y textos UTF-8
+    
+    El archivo se escribe primero con otro nombre y luego se reemplaza, por lo que
+    quien lo tenga abierto nunca ve un archivo a medias.
+    
+    Args:
+        preguntas (iterable): Preguntas a exportar
+        ruta (str): Ruta del archivo de destino
+    
+    Returns:
+        int: Cantidad de preguntas exportadas
+    """
+    indice = bytearray()
+    textos = bytearray()
+    cantidad = 0
+    
+    for pregunta in preguntas:
+        desplazamientos = []
+        for texto in (pregunta.enunciado,) + tuple(pregunta.alternativas):
+            desplazamientos.append(len(textos))
+            textos += (texto or "").encode('utf-8')
+        desplazamientos.append(len(textos))
+        
+        correcta = pregunta.alternativa_correcta
+        indice += _INDICE.pack(pregunta.id if pregunta.id is not None else -1, *desplazamientos,
+                               correcta if correcta is not None else -1)
+        cantidad += 1
+    
+    ruta_temporal = ruta + '.tmp'
+    with open(ruta_temporal, 'wb') as archivo:
+        archivo.write(_CABECERA.pack(FIRMA, VERSION_FORMATO, 0, cantidad))
+        archivo.write(indice)
+        archivo.write(textos)
+    os.replace(ruta_temporal, ruta)
+    
+    return cantidad
+
+class SnapshotBanco(Sequence):
+    """
+    Banco de preguntas de solo lectura respaldado por un archivo mapeado en memoria
+    
+    Abrir el archivo solo lee la cabecera; cada Pregunta se construye la primera
+    vez que se accede a ella. Al enviarse a otro proceso solo viajan la ruta y la
+    huella del contenido, y cada proceso mapea el mismo archivo, compartiendo la
+    caché de páginas del sistema; si el archivo fue reemplazado entretanto, el
+    proceso receptor lo rechaza en lugar de leer otro banco.
+    """
+    
+    def __init__(self, ruta, huella=None):
+        """
+        Constructor de la clase SnapshotBanco
+        
+        Args:
+            ruta (str): Ruta del archivo generado con exportar_snapshot()
+            huella (str): Huella que debe tener el archivo (ver huella); si no
+                coincide se lanza ValueError
+        """
+        self.ruta = ruta
+        self._huella = None
+        
+        with open(ruta, 'rb') as archivo:
+            self._mapa = mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_READ)
+        self._vista = memoryview(self._mapa)
+        
+        try:
+            if huella is not None and self.huella != huella:
+                raise ValueError(f"El archivo del banco cambió desde que se abrió: {ruta}")
+            
+            try:
+                firma, version, _, cantidad = _CABECERA.unpack_from(self._mapa)
+            except struct.error:
+                firma = version = cantidad = None
+            if firma != FIRMA:
+                raise ValueError(f"El archivo no es un banco de preguntas: {ruta}")
+            if version not in _INDICES:
+                raise ValueError(f"Versión de banco no soportada ({version}): {ruta}")
+        except ValueError:
+            # Un archivo rechazado no debe quedar mapeado (en Windows, además, bloqueado)
+            self.cerrar()
+            raise
+        
+        # Los archivos de la versión 1 se siguen leyendo, sin clave de respuestas
+        self._indice = _INDICES[version]
+        self._cantidad = cantidad
+        self._inicio_textos = _CABECERA.size + cantidad * self._indice.size
+        self._preguntas = [None] * cantidad
+    
+    def _leer(self, posicion):
+        """
+        Construye la Pregunta de una posición a partir del archivo
+        
+        Returns:
+            Pregunta: Pregunta leída
+        """
+        id_pregunta, *desplazamientos = self._indice.unpack_from(
+            self._mapa, _CABECERA.size + posicion * self._indice.size)
+        correcta = desplazamientos.pop() if len(desplazamientos) > 7 else -1
+        
+        base = self._inicio_textos
+        # Decodificar directamente desde la vista, sin copias intermedias
+        textos = [
+            str(self._vista[base + inicio:base + fin], 'utf-8')
+            for inicio, fin in zip(desplazamientos, desplazamientos[1:])
+        ]
+        
+        return Pregunta(
+            id=id_pregunta if id_pregunta >= 0 else None,
+            enunciado=textos[0],
+            alternativas=textos[1:],
+            alternativa_correcta=correcta if correcta >= 0 else None
+        )
+    
+    def __getitem__(self, posicion):
+        if isinstance(posicion, slice):
+            return [self[i] for i in range(*posicion.indices(self._cantidad))]
+        
+        if posicion < 0:
+            posicion += self._cantidad
+        if not 0 <= posicion < self._cantidad:
+            raise IndexError("Posición fuera del banco de preguntas")
+        
+        pregunta = self._preguntas[posicion]
+        if pregunta is None:
+            pregunta = self._preguntas[posicion] = self._leer(posicion)
+        return pregunta
+    
+    def __len__(self):
+        return self._cantidad
+    
+    @property
+    def huella(self):
+        """
+        Huella SHA-256 del contenido del archivo, calculada la primera vez que se pide
+        
+        Returns:
+            str: Huella en hexadecimal
+        """
+        if self._huella is None:
+            self._huella = hashlib.sha256(self._mapa).hexdigest()
+        return self._huella
+    
+    def __reduce__(self):
+        # Se envían la ruta y la huella; el proceso receptor mapea el mismo archivo
+        # y verifica que no haya sido reemplazado
+        return (SnapshotBanco, (self.ruta, self.huella))
+    
+    def cerrar(self):
+        """
+        Libera el mapeo del archivo
+        """
+        self._vista.release()
+        self._mapa.close()
+
+if __name__ == "__main__":
+    # Uso: python -m model.snapshot_banco ruta_destino
+    from model.pregunta_dao import PreguntaDAO
+    
+    if len(sys.argv) < 2:
+        print("Uso: python -m model.snapshot_banco ruta_destino")
+        sys.exit(1)
+    
+    cantidad = exportar_snapshot(PreguntaDAO().obtener_todas_las_preguntas(), sys.argv[1])
+    print(f"Se exportaron {cantidad} preguntas en {sys.argv[1]}")
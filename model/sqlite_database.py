@@ -0,0 +1,146 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Módulo para el banco de preguntas embebido en SQLite y su importador desde db.txt
+"""
+
+import os
+import sys
+import sqlite3
+from contextlib import contextmanager
+
+# Archivo SQLite usado si config/database.ini no indica otra ruta
+RUTA_SQLITE_POR_DEFECTO = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'config', 'examen_db.sqlite')
+
+# Misma estructura que la tabla preguntas de MySQL (ver README)
+SQL_CREAR_TABLA = """
+CREATE TABLE IF NOT EXISTS preguntas (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    enunciado TEXT NOT NULL,
+    alternativa_a TEXT NOT NULL,
+    alternativa_b TEXT NOT NULL,
+    alternativa_c TEXT NOT NULL,
+    alternativa_d TEXT NOT NULL,
+    alternativa_e TEXT NOT NULL,
+    alternativa_correcta TEXT DEFAULT NULL
+)
+"""
+
+# Columna agregada a la tabla después de su primera versión
+SQL_AGREGAR_CORRECTA = "ALTER TABLE preguntas ADD COLUMN alternativa_correcta TEXT DEFAULT NULL"
+
+class SQLiteConnection:
+    """
+    Fuente de datos embebida: el banco de preguntas en un archivo SQLite
+    
+    Expone la misma interfaz conexion() que DatabaseConnection, de modo que
+    PreguntaDAO funciona igual con ambos backends. Cada uso abre su propia
+    conexión (es barato en SQLite), así que puede usarse desde varios hilos.
+    """
+    
+    def __init__(self, ruta=RUTA_SQLITE_POR_DEFECTO):
+        """
+        Constructor de la clase SQLiteConnection
+        
+        Args:
+            ruta (str): Ruta del archivo SQLite
+        """
+        self.ruta = ruta
+    
+    @contextmanager
+    def conexion(self):
+        """
+        Administrador de contexto que abre una conexión al archivo y la cierra al salir
+        
+        Yields:
+            sqlite3.Connection: Conexión al banco de preguntas
+        """
+        if not os.path.exists(self.ruta):
+            raise FileNotFoundError(f"No se encontró el banco de preguntas SQLite: {self.ruta}")
+        
+        conn = sqlite3.connect(self.ruta)
+        try:
+            yield conn
+        finally:
+            conn.close()
+    
+    def crear_tabla(self):
+        """
+        Crea el archivo y la tabla preguntas si no existen, en modo WAL
+        
+        A una tabla creada antes de la clave de respuestas se le agrega la
+        columna alternativa_correcta.
+        """
+        directorio = os.path.dirname(self.ruta)
+        if directorio and not os.path.exists(directorio):
+            os.makedirs(directorio)
+        
+        conn = sqlite3.connect(self.ruta)
+        try:
+            # WAL permite leer el banco mientras otro proceso escribe en él
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(SQL_CREAR_TABLA)
+            columnas = [fila[1] for fila in conn.execute("PRAGMA table_info(preguntas)")]
+            if 'alternativa_correcta' not in columnas:
+                conn.execute(SQL_AGREGAR_CORRECTA)
+            conn.commit()
+        finally:
+            conn.close()
+
+def _sentencias_sql(ruta_txt):
+    """
+    Recorre las sentencias completas de un volcado SQL
+    
+    Yields:
+        str: Cada sentencia del archivo
+    """
+    sentencia = ""
+    with open(ruta_txt, encoding='utf-8') as archivo:
+        for linea in archivo:
+            sentencia += linea
+            if sqlite3.complete_statement(sentencia):
+                yield sentencia
+                sentencia = ""
+    
+    if sentencia.strip():
+        yield sentencia
+
+def importar_db_txt(ruta_txt, ruta_sqlite=RUTA_SQLITE_POR_DEFECTO, reemplazar=False):
+    """
+    Carga el volcado db.txt (INSERT de MySQL) en el banco SQLite en una sola transacción
+    
+    Args:
+        ruta_txt (str): Ruta del volcado con las sentencias INSERT
+        ruta_sqlite (str): Ruta del archivo SQLite de destino
+        reemplazar (bool): Si es True, borra las preguntas existentes antes de importar
+    
+    Returns:
+        int: Cantidad de preguntas importadas
+    """
+    fuente = SQLiteConnection(ruta_sqlite)
+    fuente.crear_tabla()
+    
+    conn = sqlite3.connect(ruta_sqlite)
+    try:
+        # Todo el volcado se aplica o se descarta completo
+        with conn:
+            if reemplazar:
+                conn.execute("DELETE FROM preguntas")
+            
+            antes = conn.execute("SELECT COUNT(*) FROM preguntas").fetchone()[0]
+            for sentencia in _sentencias_sql(ruta_txt):
+                conn.execute(sentencia)
+            despues = conn.execute("SELECT COUNT(*) FROM preguntas").fetchone()[0]
+    finally:
+        conn.close()
+    
+    return despues - antes
+
+if __name__ == "__main__":
+    # Uso: python -m model.sqlite_database [db.txt] [ruta_sqlite]
+    ruta_txt = sys.argv[1] if len(sys.argv) > 1 else os.path.join(os.path.dirname(os.path.dirname(__file__)), 'db.txt')
+    ruta_sqlite = sys.argv[2] if len(sys.argv) > 2 else RUTA_SQLITE_POR_DEFECTO
+    
+    cantidad = importar_db_txt(ruta_txt, ruta_sqlite, reemplazar=True)
+    print(f"Se importaron {cantidad} preguntas en {ruta_sqlite}")
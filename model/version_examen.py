@@ -0,0 +1,242 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Módulo que define la representación compacta de una versión (tema) de examen
+"""
+
+import struct
+import itertools
+from array import array
+from model.permutaciones import CANTIDAD_ALTERNATIVAS
+
+# Las 120 permutaciones de 5 alternativas en orden lexicográfico; el índice de
+# cada permutación en esta tupla es su código (cabe en un byte)
+PERMUTACIONES_ALTERNATIVAS = tuple(itertools.permutations(range(CANTIDAD_ALTERNATIVAS)))
+
+# Inversa de cada permutación: letra (0-4) en que queda cada alternativa original
+POSICIONES_ALTERNATIVAS = tuple(
+    tuple(permutacion.index(original) for original in range(CANTIDAD_ALTERNATIVAS))
+    for permutacion in PERMUTACIONES_ALTERNATIVAS
+)
+
+# Peso de cada posición en el código de Lehmer: 4!, 3!, 2!, 1!, 0!
+_PESOS_LEHMER = (24, 6, 2, 1, 1)
+
+# Cabecera de la serialización: número de tema y cantidad de preguntas
+_CABECERA = struct.Struct('<HH')
+
+# Mayor cantidad de preguntas que admite una versión: los índices del banco se
+# guardan en uint16 y la cabecera guarda la cantidad en 16 bits
+MAXIMO_PREGUNTAS = 0xFFFF
+
+def codificar_permutaciones(ordenes):
+    """
+    Convierte permutaciones de alternativas en sus códigos de 0 a 119
+    
+    Args:
+        ordenes (array-like): Matriz (n, 5) con una permutación por fila
+    
+    Returns:
+        bytes: Un byte por permutación con su índice en PERMUTACIONES_ALTERNATIVAS
+    """
+    # NumPy se carga con el primer lote, no al iniciar la aplicación
+    import numpy as np
+    
+    ordenes = np.asarray(ordenes).reshape(-1, CANTIDAD_ALTERNATIVAS)
+    
+    # Código de Lehmer: por cada posición, cuántos elementos posteriores son menores
+    posteriores = np.triu(np.ones((CANTIDAD_ALTERNATIVAS, CANTIDAD_ALTERNATIVAS), dtype=bool), 1)
+    menores = (ordenes[:, :, None] > ordenes[:, None, :]) & posteriores
+    codigos = menores.sum(axis=2) @ _PESOS_LEHMER
+    
+    return codigos.astype(np.uint8).tobytes()
+
+def _verificar_cantidad(cantidad):
+    """
+    Rechaza los bancos cuyos índices no caben en uint16, en lugar de truncarlos
+    
+    Args:
+        cantidad (int): Cantidad de preguntas de la versión
+    """
+    if cantidad > MAXIMO_PREGUNTAS:
+        raise ValueError(f"Una versión admite hasta {MAXIMO_PREGUNTAS} preguntas; "
+                         f"el banco tiene {cantidad}")
+
+class VersionExamen:
+    """
+    Versión de examen guardada solo como permutaciones sobre el banco compartido.
+    
+    En lugar de copiar objetos Pregunta, la versión almacena dos arreglos compactos:
+    el orden de las preguntas (uint16 con índices del banco) y, para cada posición,
+    el código de la permutación de sus alternativas (un byte). El texto se resuelve
+    contra el banco en el momento de renderizar.
+    """
+    
+    __slots__ = ('numero_tema', 'orden_preguntas', 'codigos_alternativas')
+    
+    def __init__(self, numero_tema, orden_preguntas, codigos_alternativas):
+        """
+        Constructor de la clase VersionExamen
+        
+        Args:
+            numero_tema (int): Número del tema (1, 2, 3, ...)
+            orden_preguntas (iterable): Índice en el banco de la pregunta de cada posición
+            codigos_alternativas (bytes): Código de permutación de alternativas por posición
+        """
+        self.numero_tema = numero_tema
+        _verificar_cantidad(len(orden_preguntas))
+        self.orden_preguntas = array('H', orden_preguntas)
+        self.codigos_alternativas = bytes(codigos_alternativas)
+        
+        if len(self.orden_preguntas) != len(self.codigos_alternativas):
+            raise ValueError("Cada pregunta debe tener un código de alternativas")
+    
+    @classmethod
+    def desde_permutaciones(cls, numero_tema, orden_preguntas, orden_alternativas):
+        """
+        Crea una versión a partir de las permutaciones de MotorPermutaciones
+        
+        Args:
+            numero_tema (int): Número del tema
+            orden_preguntas (ndarray): Orden de preguntas (n,)
+            orden_alternativas (ndarray): Orden de alternativas por pregunta del banco (n, 5)
+        
+        Returns:
+            VersionExamen: Versión compacta
+        """
+        import numpy as np
+        
+        orden_preguntas = np.asarray(orden_preguntas)
+        _verificar_cantidad(len(orden_preguntas))
+        codigos = codificar_permutaciones(np.asarray(orden_alternativas)[orden_preguntas])
+        
+        orden = array('H')
+        orden.frombytes(orden_preguntas.astype(np.uint16).tobytes())
+        return cls(numero_tema, orden, codigos)
+    
+    @classmethod
+    def desde_motor(cls, motor, numero_tema, cantidad_preguntas):
+        """
+        Deriva la versión de un tema a partir del motor de permutaciones
+        
+        Returns:
+            VersionExamen: Versión del tema indicado
+        """
+        orden_preguntas, orden_alternativas = motor.permutacion_tema(numero_tema, cantidad_preguntas)
+        return cls.desde_permutaciones(numero_tema, orden_preguntas, orden_alternativas)
+    
+    @classmethod
+    def lote_desde_motor(cls, motor, cantidad_temas, cantidad_preguntas):
+        """
+        Deriva todas las versiones de un lote con las permutaciones vectorizadas del motor
+        
+        Returns:
+            list: Una VersionExamen por tema, en orden
+        """
+        ordenes_preguntas, ordenes_alternativas = motor.permutaciones_lote(cantidad_temas, cantidad_preguntas)
+        return [
+            cls.desde_permutaciones(i+1, ordenes_preguntas[i], ordenes_alternativas[i])
+            for i in range(cantidad_temas)
+        ]
+    
+    @classmethod
+    def desde_bytes(cls, datos):
+        """
+        Reconstruye una versión serializada con a_bytes()
+        
+        Args:
+            datos (bytes): Datos serializados
+        
+        Returns:
+            VersionExamen: Versión reconstruida
+        """
+        numero_tema, cantidad = _CABECERA.unpack_from(datos)
+        inicio = _CABECERA.size
+        orden_preguntas = array('H')
+        orden_preguntas.frombytes(datos[inicio:inicio + 2 * cantidad])
+        return cls(numero_tema, orden_preguntas, datos[inicio + 2 * cantidad:inicio + 3 * cantidad])
+    
+    def a_bytes(self):
+        """
+        Serializa la versión en 4 + 3n bytes
+        
+        Returns:
+            bytes: Representación binaria de la versión
+        """
+        return (_CABECERA.pack(self.numero_tema, len(self))
+                + self.orden_preguntas.tobytes()
+                + self.codigos_alternativas)
+    
+    @property
+    def letra(self):
+        """
+        Letra del tema (A, B, C, ...)
+        """
+        return chr(64 + self.numero_tema)  # 65 es el código ASCII de 'A'
+    
+    def orden_alternativas(self, posicion):
+        """
+        Orden de las alternativas de la pregunta en una posición del examen
+        
+        Args:
+            posicion (int): Posición de la pregunta en esta versión
+        
+        Returns:
+            tuple: Índice de la alternativa original que va en cada letra (a..e)
+        """
+        return PERMUTACIONES_ALTERNATIVAS[self.codigos_alternativas[posicion]]
+    
+    def clave(self, preguntas):
+        """
+        Clave de respuestas de la versión: dónde quedó la alternativa correcta de cada pregunta
+        
+        Args:
+            preguntas (sequence): Preguntas del banco
+        
+        Returns:
+            list: Índice (0-4) de la letra correcta en cada posición del examen, o
+                None en las preguntas sin clave
+        """
+        clave = []
+        for indice, codigo in zip(self.orden_preguntas, self.codigos_alternativas):
+            correcta = preguntas[indice].alternativa_correcta
+            clave.append(POSICIONES_ALTERNATIVAS[codigo][correcta] if correcta is not None else None)
+        return clave
+    
+    def resolver(self, preguntas):
+        """
+        Recorre la versión resolviendo el texto contra el banco compartido
+        
+        Args:
+            preguntas (sequence): Preguntas del banco
+        
+        Yields:
+            tuple: (pregunta, alternativas) con las alternativas ya en el orden de la versión
+        """
+        for indice, codigo in zip(self.orden_preguntas, self.codigos_alternativas):
+            pregunta = preguntas[indice]
+            originales = pregunta.alternativas
+            yield pregunta, tuple(originales[i] for i in PERMUTACIONES_ALTERNATIVAS[codigo])
+    
+    def __len__(self):
+        return len(self.orden_preguntas)
+    
+    def __eq__(self, otra):
+        if not isinstance(otra, VersionExamen):
+            return NotImplemented
+        return (self.numero_tema == otra.numero_tema
+                and self.orden_preguntas == otra.orden_preguntas
+                and self.codigos_alternativas == otra.codigos_alternativas)
+    
+    def __getstate__(self):
+        return self.a_bytes()
+    
+    def __setstate__(self, estado):
+        otra = VersionExamen.desde_bytes(estado)
+        self.numero_tema = otra.numero_tema
+        self.orden_preguntas = otra.orden_preguntas
+        self.codigos_alternativas = otra.codigos_alternativas
+    
+    def __str__(self):
+        return f"Tema {self.letra}: {len(self)} preguntas"
@@ -0,0 +1,121 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Script de prueba que mide cuántos párrafos se dibujan al reutilizar los bloques
+ya dibujados entre versiones y verifica que los PDF no cambian
+"""
+
+import os
+import time
+import random
+import sqlite3
+import tempfile
+import threading
+from reportlab import rl_config
+from reportlab.platypus import Paragraph
+from controller.examen_generator import ExamenGenerator
+from controller import cache_parrafos
+from controller.cache_bloques import (
+    reiniciar_cache_bloques, configurar_disco, guardar_bloque, guardar_disco
+)
+from model.pregunta import Pregunta
+
+CANTIDAD_VERSIONES = 30
+
+# Sin fecha de creación ni identificadores al azar, para comparar los archivos
+rl_config.invariant = 1
+
+preguntas = [
+    Pregunta(id=i, enunciado=f'Un móvil recorre {i} m en {i + 1} s con g=10m/s<super>2</super>. '
+                             f'¿Cuál es su rapidez v<sub>m</sub>?',
+             alternativas=[f'{i + k} m/s' for k in range(5)])
+    for i in range(1, 61)
+]
+
+# Contar los párrafos que se dibujan de verdad
+dibujos = 0
+draw_original = Paragraph.draw
+
+def draw_contado(self):
+    global dibujos
+    dibujos += 1
+    return draw_original(self)
+
+Paragraph.draw = draw_contado
+
+def generar_lote(directorio, reutilizar, ruta_cache=None):
+    """
+    Genera las versiones y devuelve el tiempo total, los dibujos y el contenido de cada PDF
+    """
+    global dibujos
+    dibujos = 0
+    reiniciar_cache_bloques()
+    generador = ExamenGenerator(directorio, ruta_cache_bloques=ruta_cache)
+    azar = random.Random(1)
+    contenidos = []
+    
+    inicio = time.perf_counter()
+    for version in range(CANTIDAD_VERSIONES):
+        if not reutilizar:
+            reiniciar_cache_bloques()
+        orden = preguntas[:]
+        azar.shuffle(orden)
+        ruta = os.path.join(directorio, f'Examen_Bloques_{version}.pdf')
+        generador.generar_pdf([(p, azar.sample(p.alternativas, 5)) for p in orden], ruta, 'Tema A')
+        with open(ruta, 'rb') as archivo:
+            contenidos.append(archivo.read())
+    return time.perf_counter() - inicio, dibujos, contenidos
+
+directorio = tempfile.mkdtemp(prefix='examenes_')
+ruta_cache = os.path.join(directorio, 'bloques.db')
+
+tiempo_sin, dibujos_sin, pdf_sin = generar_lote(directorio, False)
+tiempo_con, dibujos_con, pdf_con = generar_lote(directorio, True)
+assert pdf_con == pdf_sin, "Los PDF cambiaron al reutilizar los bloques"
+
+# Con la caché en disco, un proceso nuevo (simulado vaciando la memoria) parte con los bloques ya dibujados
+generar_lote(directorio, True, ruta_cache)
+tiempo_disco, dibujos_disco, pdf_disco = generar_lote(directorio, True, ruta_cache)
+configurar_disco(None)
+assert pdf_disco == pdf_sin, "Los PDF cambiaron al leer los bloques del disco"
+
+# El archivo guarda solo texto; una entrada alterada se ignora y el párrafo se vuelve a dibujar
+with sqlite3.connect(ruta_cache) as conexion:
+    assert conexion.execute("SELECT COUNT(*) FROM bloques_json WHERE typeof(datos) != 'text'").fetchone()[0] == 0
+    conexion.execute("UPDATE bloques_json SET datos = ?", ('[{"objeto": 1}, []]',))
+_, dibujos_alterados, pdf_alterado = generar_lote(directorio, True, ruta_cache)
+configurar_disco(None)
+assert pdf_alterado == pdf_sin and dibujos_alterados == dibujos_con
+
+# Con una versión de ReportLab no probada se dibuja siempre de la forma habitual
+versiones_probadas = cache_parrafos.VERSIONES_REPORTLAB_PROBADAS
+cache_parrafos.VERSIONES_REPORTLAB_PROBADAS = ('99.',)
+_, dibujos_otra_version, pdf_otra_version = generar_lote(directorio, True)
+cache_parrafos.VERSIONES_REPORTLAB_PROBADAS = versiones_probadas
+assert pdf_otra_version == pdf_sin and dibujos_otra_version >= dibujos_sin
+
+# Varios hilos agregando entradas a la vez no pierden ninguna al escribirlas
+ruta_hilos = os.path.join(directorio, 'hilos.db')
+configurar_disco(ruta_hilos)
+
+def agregar_entradas(hilo):
+    for i in range(2000):
+        guardar_bloque(f'{hilo}-{i}', ['BT ET'], [])
+
+hilos = [threading.Thread(target=agregar_entradas, args=(hilo,)) for hilo in range(8)]
+for hilo in hilos:
+    hilo.start()
+for hilo in hilos:
+    hilo.join()
+guardar_disco()
+configurar_disco(None)
+with sqlite3.connect(ruta_hilos) as conexion:
+    assert conexion.execute("SELECT COUNT(*) FROM bloques_json").fetchone()[0] == 8 * 2000
+
+print(f'{CANTIDAD_VERSIONES} versiones de {len(preguntas)} preguntas')
+print(f'Sin reutilizar:   {dibujos_sin} párrafos dibujados, {tiempo_sin / CANTIDAD_VERSIONES * 1000:.1f} ms por versión')
+print(f'Reutilizando:     {dibujos_con} párrafos dibujados, {tiempo_con / CANTIDAD_VERSIONES * 1000:.1f} ms por versión')
+print(f'Caché en disco:   {dibujos_disco} párrafos dibujados, {tiempo_disco / CANTIDAD_VERSIONES * 1000:.1f} ms por versión')
+
+print('\nPrueba completada.')
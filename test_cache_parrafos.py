@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Script de prueba que mide cuántas veces se analiza el marcado de los textos y
+cuánto tarda cada versión al reutilizar el análisis entre versiones
+"""
+
+import os
+import time
+import random
+from reportlab.platypus.paraparser import ParaParser
+from controller.examen_generator import ExamenGenerator
+from controller.cache_parrafos import reiniciar_cache_parrafos
+from model.pregunta import Pregunta
+
+CANTIDAD_VERSIONES = 20
+
+# Crear la carpeta de pruebas
+if not os.path.exists('Examenes'):
+    os.makedirs('Examenes')
+
+# Preguntas con fórmulas y marcado, como las de física del banco
+preguntas = [
+    Pregunta(id=i, enunciado=f'Un bloque de {i} kg parte del reposo con g=10m/s<super>2</super>. '
+                             f'¿Qué velocidad v<sub>f</sub> alcanza tras recorrer {i} m?',
+             alternativas=[f'{i + k} m/s' for k in range(5)])
+    for i in range(1, 81)
+]
+
+# Contar los análisis de marcado
+analisis = 0
+parse_original = ParaParser.parse
+
+def parse_contado(self, *args, **kwargs):
+    global analisis
+    analisis += 1
+    return parse_original(self, *args, **kwargs)
+
+ParaParser.parse = parse_contado
+
+def generar_lote(reutilizar):
+    """
+    Genera las versiones y devuelve el tiempo total y la cantidad de análisis
+    """
+    global analisis
+    analisis = 0
+    reiniciar_cache_parrafos()
+    generador = ExamenGenerator()
+    azar = random.Random(1)
+    
+    inicio = time.perf_counter()
+    for version in range(CANTIDAD_VERSIONES):
+        if not reutilizar:
+            reiniciar_cache_parrafos()
+        orden = preguntas[:]
+        azar.shuffle(orden)
+        ruta = os.path.join('Examenes', f'Examen_Cache_{version}.pdf')
+        generador.generar_pdf([(p, azar.sample(p.alternativas, 5)) for p in orden], ruta, 'Tema A')
+    return time.perf_counter() - inicio, analisis
+
+tiempo_sin, analisis_sin = generar_lote(False)
+tiempo_con, analisis_con = generar_lote(True)
+
+print(f'{CANTIDAD_VERSIONES} versiones de {len(preguntas)} preguntas')
+print(f'Sin reutilizar: {analisis_sin} análisis, {tiempo_sin / CANTIDAD_VERSIONES * 1000:.1f} ms por versión')
+print(f'Reutilizando:   {analisis_con} análisis, {tiempo_con / CANTIDAD_VERSIONES * 1000:.1f} ms por versión')
+
+print('\nPrueba completada.')
@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Script de prueba que califica un lote masivo de hojas de respuestas y mide cuánto tarda
+"""
+
+import os
+import time
+import tempfile
+import numpy as np
+from controller.claves import SIN_CLAVE, exportar_claves
+from controller.calificador import (calificar, calificar_archivos, leer_respuestas,
+                                    exportar_respuestas, exportar_resultados,
+                                    RESPUESTA_BLANCO, RESPUESTA_INVALIDA)
+
+POSTULANTES = 100000
+PREGUNTAS = 100
+TEMAS = 100
+
+generador = np.random.default_rng(7)
+claves = generador.integers(0, 5, size=(TEMAS, PREGUNTAS), dtype=np.int8)
+claves[:, -1] = SIN_CLAVE
+
+temas = generador.integers(1, TEMAS + 1, size=POSTULANTES, dtype=np.int16)
+respuestas = generador.integers(0, 5, size=(POSTULANTES, PREGUNTAS), dtype=np.int8)
+respuestas[generador.random((POSTULANTES, PREGUNTAS)) < 0.1] = RESPUESTA_BLANCO
+respuestas[generador.random((POSTULANTES, PREGUNTAS)) < 0.01] = RESPUESTA_INVALIDA
+
+# Calificación de referencia con un recorrido simple, sobre una muestra
+def calificar_uno(tema, fila):
+    correctas = incorrectas = blancas = 0
+    for clave, respuesta in zip(claves[tema - 1], fila):
+        if clave == SIN_CLAVE:
+            continue
+        if respuesta == RESPUESTA_BLANCO:
+            blancas += 1
+        elif respuesta == clave:
+            correctas += 1
+        else:
+            incorrectas += 1
+    return correctas, incorrectas, blancas
+
+inicio = time.perf_counter()
+resultado = calificar(claves, temas, respuestas, puntaje_correcta=4, puntaje_incorrecta=-1)
+segundos = time.perf_counter() - inicio
+print(f"Calificación en memoria: {POSTULANTES} postulantes x {PREGUNTAS} preguntas en {segundos:.3f} s")
+assert segundos < 5
+
+for i in generador.integers(0, POSTULANTES, size=500):
+    esperado = calificar_uno(temas[i], respuestas[i])
+    obtenido = (resultado.correctas[i], resultado.incorrectas[i], resultado.blancas[i])
+    assert obtenido == esperado, (i, obtenido, esperado)
+    assert resultado.puntajes[i] == 4 * esperado[0] - esperado[1]
+assert (resultado.correctas + resultado.incorrectas + resultado.blancas == PREGUNTAS - 1).all()
+
+# Desde archivos, en ambos formatos
+directorio = tempfile.mkdtemp(prefix='calificador_')
+ruta_claves = exportar_claves(claves, os.path.join(directorio, 'claves.csv'))
+for nombre in ('respuestas.npy', 'respuestas.csv'):
+    ruta = exportar_respuestas(temas, respuestas, os.path.join(directorio, nombre))
+    inicio = time.perf_counter()
+    desde_archivo = calificar_archivos(ruta_claves, ruta, puntaje_correcta=4, puntaje_incorrecta=-1)
+    print(f"Desde {nombre} ({os.path.getsize(ruta) // 1024} KB): {time.perf_counter() - inicio:.3f} s")
+    assert (desde_archivo.puntajes == resultado.puntajes).all()
+    assert (desde_archivo.temas == temas).all()
+
+# Marcas escritas a mano en el CSV
+ruta = os.path.join(directorio, 'manual.csv')
+with open(ruta, 'w', encoding='utf-8') as archivo:
+    archivo.write('postulante,tema,1,2,3,4\n' 'P-001,B,a,,ab,E\n' 'P-002,1, ,c,ñ,*\n')
+postulantes, temas_manual, respuestas_manual = leer_respuestas(ruta)
+assert list(postulantes) == ['P-001', 'P-002']
+assert list(temas_manual) == [2, 1]
+assert respuestas_manual.tolist() == [[0, -1, 5, 4], [-1, 2, 5, 5]]
+
+# La letra del tema se acepta en minúscula; cualquier otro texto es un error, no otro tema
+with open(ruta, 'w', encoding='utf-8') as archivo:
+    archivo.write('postulante,tema,1\n' 'P-001,c,a\n')
+assert list(leer_respuestas(ruta)[1]) == [3]
+for tema in ('[', 'AB', '', 'ñ'):
+    with open(ruta, 'w', encoding='utf-8') as archivo:
+        archivo.write(f'postulante,tema,1\nP-001,{tema},a\n')
+    try:
+        leer_respuestas(ruta)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError(f"Se aceptó el tema {tema!r}")
+
+ruta_resultados = exportar_resultados(resultado, os.path.join(directorio, 'resultados.csv'))
+with open(ruta_resultados, encoding='utf-8') as archivo:
+    print(archivo.readline().strip())
+    print(archivo.readline().strip())
+
+print("\nPrueba completada.")
@@ -0,0 +1,106 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Script de prueba que verifica que las respuestas correctas quedan repartidas por
+igual entre las letras de cada tema y entre los temas, y mide cuánto tarda
+"""
+
+import os
+import time
+import tempfile
+import numpy as np
+from model.pregunta import Pregunta
+from model.permutaciones import MotorPermutaciones
+from model.permutaciones_restringidas import MotorRestringido, Restricciones
+from model.claves_balanceadas import MotorClavesBalanceadas
+from model.version_examen import VersionExamen
+from controller.claves import (correctas_banco, matriz_claves, estadisticas_claves,
+                               exportar_estadisticas, SIN_CLAVE)
+
+CANTIDAD_TEMAS = 37
+
+# Casi todas las preguntas tienen la correcta en la "a"; tres quedan sin clave
+preguntas = [
+    Pregunta(id=i, enunciado=f'Pregunta {i}',
+             alternativas=[f'Correcta {i}'] + [f'Incorrecta {i}.{k}' for k in range(4)],
+             alternativa_correcta=0 if i % 31 else None)
+    for i in range(1, 101)
+]
+con_clave = sum(p.alternativa_correcta is not None for p in preguntas)
+correctas = correctas_banco(preguntas)
+
+def lote(motor):
+    versiones = VersionExamen.lote_desde_motor(motor, CANTIDAD_TEMAS, len(preguntas))
+    return versiones, estadisticas_claves(versiones, preguntas)
+
+def resumen(nombre, estadisticas):
+    print(f"{nombre}: letra más usada {max(e.fraccion_maxima for e in estadisticas):.0%}, "
+          f"racha {max(e.racha_maxima for e in estadisticas)}, "
+          f"coincidencias con otro tema hasta {max(e.coincidencias_maximas for e in estadisticas)}")
+
+_, estadisticas = lote(MotorPermutaciones(3))
+resumen("Barajadas por separado", estadisticas)
+
+versiones, estadisticas = lote(MotorClavesBalanceadas(MotorPermutaciones(3), correctas, CANTIDAD_TEMAS))
+resumen("Balanceadas", estadisticas)
+
+# Dentro de cada tema, cada letra en la quinta parte de las preguntas con clave
+for estadistica in estadisticas:
+    assert estadistica.preguntas_con_clave == con_clave
+    assert max(estadistica.por_letra) - min(estadistica.por_letra) <= 1
+
+# Entre temas, cada pregunta cae en cada letra en la quinta parte de los temas
+matriz = matriz_claves(versiones, preguntas)
+ordenes = np.array([v.orden_preguntas for v in versiones])
+por_pregunta = np.full_like(matriz, SIN_CLAVE)
+np.put_along_axis(por_pregunta, ordenes, matriz, axis=1)
+conteos = (por_pregunta[:, :, None] == np.arange(5)).sum(axis=0)
+conteos = conteos[correctas >= 0]
+assert (conteos.max(axis=1) - conteos.min(axis=1) <= 1).all()
+assert (por_pregunta[:, correctas < 0] == SIN_CLAVE).all()
+
+# La clave sigue apuntando a la alternativa correcta y el orden de preguntas no cambia
+for version, fila in zip(versiones, matriz):
+    for (pregunta, alternativas), correcta in zip(version.resolver(preguntas), fila):
+        if correcta != SIN_CLAVE:
+            assert alternativas[correcta] == f'Correcta {pregunta.id}'
+sueltas = VersionExamen.lote_desde_motor(MotorPermutaciones(3), CANTIDAD_TEMAS, len(preguntas))
+assert all(a.orden_preguntas == b.orden_preguntas for a, b in zip(versiones, sueltas))
+
+# Un tema pedido por separado es el mismo que en el lote
+motor = MotorClavesBalanceadas(MotorPermutaciones(3), correctas, CANTIDAD_TEMAS)
+assert VersionExamen.desde_motor(motor, 12, len(preguntas)) == versiones[11]
+
+# Sobre el motor restringido se mantiene la distancia entre órdenes de preguntas
+restringido = MotorRestringido(3, CANTIDAD_TEMAS, Restricciones(distancia_minima=0.3))
+_, estadisticas = lote(MotorClavesBalanceadas(restringido, correctas, CANTIDAD_TEMAS))
+resumen("Balanceadas sobre el motor restringido", estadisticas)
+assert max(e.fraccion_maxima for e in estadisticas) <= (-(-con_clave // 5)) / con_clave
+try:
+    MotorClavesBalanceadas(MotorRestringido(3, CANTIDAD_TEMAS, Restricciones(coincidencias_maximas=0.2)),
+                           correctas, CANTIDAD_TEMAS)
+except ValueError as e:
+    print(f"Error esperado: {e}")
+else:
+    raise AssertionError("Se esperaba un error al combinar con un máximo de coincidencias")
+
+# El reparto de todo un lote grande cuesta mucho menos que maquetar un solo tema
+grandes = np.random.default_rng(5).integers(0, 5, size=1000)
+inicio = time.perf_counter()
+motor = MotorClavesBalanceadas(MotorPermutaciones(8), grandes, 100)
+grandes_versiones = VersionExamen.lote_desde_motor(motor, 100, 1000)
+segundos = time.perf_counter() - inicio
+sin_balancear = time.perf_counter()
+VersionExamen.lote_desde_motor(MotorPermutaciones(8), 100, 1000)
+sin_balancear = time.perf_counter() - sin_balancear
+print(f"100 temas x 1000 preguntas: {segundos:.3f} s balanceadas, {sin_balancear:.3f} s sin balancear")
+assert segundos - sin_balancear < 0.5
+
+# Informe por tema
+ruta = exportar_estadisticas(estadisticas, os.path.join(tempfile.mkdtemp(prefix='claves_'), 'estadisticas.csv'))
+with open(ruta, encoding='utf-8') as archivo:
+    for _ in range(3):
+        print(archivo.readline().strip())
+
+print("\nPrueba completada.")
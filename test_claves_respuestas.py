@@ -0,0 +1,139 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Script de prueba que verifica que la clave de cada versión sigue a la alternativa
+correcta a través de la permutación, y que se exporta y relee completa
+"""
+
+import os
+import pickle
+import sqlite3
+import tempfile
+import numpy as np
+from model.pregunta import Pregunta
+from model.pregunta_dao import PreguntaDAO
+from model.sqlite_database import SQLiteConnection
+from model.permutaciones import MotorPermutaciones
+from model.snapshot_banco import exportar_snapshot, SnapshotBanco
+from model.version_examen import VersionExamen
+from controller.claves import matriz_claves, exportar_claves, leer_claves, SIN_CLAVE
+from controller.examen_generator import ExamenGenerator
+from model.banco_preguntas import BancoPreguntas
+from controller.gestor_trabajos import ControlTrabajo
+
+CANTIDAD_TEMAS = 8
+
+# La alternativa correcta es siempre el texto "Correcta"; una pregunta queda sin clave
+preguntas = []
+for i in range(1, 31):
+    correcta = i % 5
+    alternativas = [f'Incorrecta {i}.{k}' for k in range(5)]
+    alternativas[correcta] = f'Correcta {i}'
+    preguntas.append(Pregunta(id=i, enunciado=f'Pregunta {i}', alternativas=alternativas,
+                              alternativa_correcta=correcta if i != 30 else None))
+
+assert pickle.loads(pickle.dumps(preguntas[0])) == preguntas[0]
+assert preguntas[3].letra_correcta == 'e'
+
+# La clave de cada versión apunta a la alternativa "Correcta" ya permutada
+motor = MotorPermutaciones(11)
+versiones = VersionExamen.lote_desde_motor(motor, CANTIDAD_TEMAS, len(preguntas))
+matriz = matriz_claves(versiones, preguntas)
+assert matriz.shape == (CANTIDAD_TEMAS, len(preguntas))
+
+for version, fila in zip(versiones, matriz):
+    assert list(fila) == [SIN_CLAVE if c is None else c for c in version.clave(preguntas)]
+    for (pregunta, alternativas), correcta in zip(version.resolver(preguntas), fila):
+        if pregunta.alternativa_correcta is None:
+            assert correcta == SIN_CLAVE
+        else:
+            assert alternativas[correcta] == f'Correcta {pregunta.id}'
+
+# Un banco con más preguntas de las que caben en uint16 se rechaza en lugar de truncarse
+grande = 70000
+try:
+    VersionExamen.desde_permutaciones(1, np.arange(grande), np.tile(np.arange(5), (grande, 1)))
+except ValueError as e:
+    print(f'Error esperado: {e}')
+else:
+    raise AssertionError('Se esperaba un error con un banco de más de 65535 preguntas')
+
+# reorganizar_alternativas también informa dónde quedó la correcta
+dao = PreguntaDAO(fuente=object())
+for pregunta in dao.generar_examen_aleatorio(preguntas[:-1], motor, 3):
+    assert pregunta.alternativas[pregunta.alternativa_correcta] == f'Correcta {pregunta.id}'
+
+# El banco binario conserva la clave
+directorio = tempfile.mkdtemp(prefix='claves_')
+ruta_banco = os.path.join(directorio, 'banco.bin')
+exportar_snapshot(preguntas, ruta_banco)
+assert list(SnapshotBanco(ruta_banco)) == preguntas
+
+# Exportar y releer en ambos formatos
+for nombre in ('claves.csv', 'claves.npy'):
+    ruta = exportar_claves(matriz, os.path.join(directorio, nombre))
+    assert (leer_claves(ruta) == matriz).all()
+    print(f'{nombre}: {os.path.getsize(ruta)} bytes para {CANTIDAD_TEMAS} temas')
+
+with open(os.path.join(directorio, 'claves.csv'), encoding='utf-8') as archivo:
+    print(archivo.readline().strip()[:40] + '...')
+    print(archivo.readline().strip()[:40] + '...')
+
+# Un banco sin ninguna clave no escribe el archivo de claves
+generador = ExamenGenerator(os.path.join(directorio, 'Examenes'))
+generador.banco = BancoPreguntas.desde_preguntas([Pregunta(id=p.id, enunciado=p.enunciado, alternativas=p.alternativas) for p in preguntas])
+ruta = os.path.join(directorio, 'Claves', 'Claves.csv')
+assert len(generador.generar_examenes(2, 'pdf', recargar_banco=False, ruta_claves=ruta)) == 2
+assert generador.ruta_claves_exportadas is None and not os.path.exists(ruta)
+generador.banco = BancoPreguntas.desde_preguntas(preguntas)
+generador.generar_examenes(2, 'pdf', recargar_banco=False, ruta_claves=ruta)
+assert generador.ruta_claves_exportadas == ruta and leer_claves(ruta).shape == (2, len(preguntas))
+
+# Solo se exportan los temas indicados; cada uno se relee en la fila de su número
+for nombre in ('parcial.csv', 'parcial.npy'):
+    ruta_parcial = exportar_claves(matriz[[0, 2]], os.path.join(directorio, nombre), temas=[1, 3])
+    releida = leer_claves(ruta_parcial)
+    assert releida.shape == (3, len(preguntas)) and (releida[[0, 2]] == matriz[[0, 2]]).all()
+    assert (releida[1] == SIN_CLAVE).all()
+
+# Más de 26 temas se exportan y releen por su número; las claves con letra siguen leyéndose
+matriz_grande = np.tile(matriz, (4, 1))
+ruta_grande = exportar_claves(matriz_grande, os.path.join(directorio, 'grande.csv'))
+assert (leer_claves(ruta_grande) == matriz_grande).all()
+ruta_letras = os.path.join(directorio, 'letras.csv')
+with open(ruta_letras, 'w', encoding='utf-8') as archivo:
+    archivo.write('tema,1,2\n' 'A,a,\n' 'c,e,b\n')
+assert leer_claves(ruta_letras).tolist() == [[0, SIN_CLAVE], [SIN_CLAVE, SIN_CLAVE], [4, 1]]
+
+# Un lote cancelado no exporta claves de temas que no llegaron a generarse
+os.remove(ruta)
+control = ControlTrabajo()
+rutas = generador.generar_examenes(4, 'pdf', recargar_banco=False, ruta_claves=ruta, incremental=False,
+                                   al_terminar_tema=lambda completados, _: control.cancelar(), control=control)
+assert len(rutas) == 1
+assert generador.ruta_claves_exportadas is None and not os.path.exists(ruta)
+
+# Una clave mal escrita en la base de datos deja esa pregunta sin clave, sin cortar el banco
+ruta_sqlite = os.path.join(directorio, 'banco.sqlite')
+fuente = SQLiteConnection(ruta_sqlite)
+fuente.crear_tabla()
+with sqlite3.connect(ruta_sqlite) as conexion:
+    conexion.executemany(
+        "INSERT INTO preguntas (enunciado, alternativa_a, alternativa_b, alternativa_c, alternativa_d, "
+        "alternativa_e, alternativa_correcta) VALUES (?, ?, ?, ?, ?, ?, ?)",
+        [(f'Pregunta {i}', 'a', 'b', 'c', 'd', 'e', clave) for i, clave in enumerate(['b', 'z', None, 'E'])])
+leidas = PreguntaDAO(fuente).obtener_todas_las_preguntas()
+assert [p.alternativa_correcta for p in leidas] == [1, None, None, 4]
+
+# Solo la falta de la columna alternativa_correcta hace repetir la consulta sin ella;
+# cualquier otro error deja el banco vacío, nunca a medias
+with sqlite3.connect(ruta_sqlite) as conexion:
+    conexion.execute("ALTER TABLE preguntas DROP COLUMN alternativa_correcta")
+leidas = PreguntaDAO(fuente).obtener_todas_las_preguntas()
+assert len(leidas) == 4 and all(p.alternativa_correcta is None for p in leidas)
+with sqlite3.connect(ruta_sqlite) as conexion:
+    conexion.execute("DROP TABLE preguntas")
+assert PreguntaDAO(fuente).obtener_todas_las_preguntas() == []
+
+print('\nPrueba completada.')
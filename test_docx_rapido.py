@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Script de prueba que compara el Word generado con python-docx frente al
+escritor rápido basado en plantilla (tiempo, memoria y contenido)
+"""
+
+import os
+import time
+import zipfile
+import tracemalloc
+from controller.examen_generator import ExamenGenerator
+from model.pregunta import Pregunta
+
+CANTIDAD_VERSIONES = 5
+
+# Crear la carpeta de pruebas
+if not os.path.exists('Examenes'):
+    os.makedirs('Examenes')
+
+preguntas = [
+    Pregunta(id=i, enunciado=f'¿Enunciado de la pregunta número {i}?',
+             alternativas=[f'Alternativa {letra} de la pregunta {i}' for letra in 'ABCDE'])
+    for i in range(1, 101)
+]
+
+def medir(generador, ruta):
+    """
+    Devuelve el tiempo medio por versión y el pico de memoria de una versión
+    """
+    # Calentar la plantilla antes de medir
+    generador.generar_word(preguntas, ruta, 'Tema A')
+    
+    inicio = time.perf_counter()
+    for _ in range(CANTIDAD_VERSIONES):
+        if not generador.generar_word(preguntas, ruta, 'Tema A'):
+            raise RuntimeError('No se pudo generar el Word de prueba')
+    tiempo = (time.perf_counter() - inicio) / CANTIDAD_VERSIONES
+    
+    tracemalloc.start()
+    generador.generar_word(preguntas, ruta, 'Tema A')
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    
+    return tiempo, pico
+
+ruta_docx = os.path.join('Examenes', 'Examen_python_docx.docx')
+ruta_rapido = os.path.join('Examenes', 'Examen_rapido.docx')
+
+tiempo_docx, pico_docx = medir(ExamenGenerator(docx_rapido=False), ruta_docx)
+tiempo_rapido, pico_rapido = medir(ExamenGenerator(docx_rapido=True), ruta_rapido)
+
+print(f'python-docx: {tiempo_docx * 1000:.1f} ms por versión, pico de {pico_docx / 1024:.0f} KB')
+print(f'Escritor rápido: {tiempo_rapido * 1000:.1f} ms por versión, pico de {pico_rapido / 1024:.0f} KB')
+print(f'Aceleración: {tiempo_docx / tiempo_rapido:.1f}x')
+
+# Ambos paquetes deben tener exactamente las mismas partes
+with zipfile.ZipFile(ruta_docx) as docx, zipfile.ZipFile(ruta_rapido) as rapido:
+    distintas = [
+        nombre for nombre in docx.namelist()
+        if nombre not in rapido.namelist() or docx.read(nombre) != rapido.read(nombre)
+    ]
+
+if distintas:
+    print(f'Error: las partes {distintas} no coinciden')
+else:
+    print('\nPrueba completada.')
@@ -8,6 +8,8 @@ Script para probar directamente la funcionalidad de generación de Word del Exam
 import os
 import sys
 from controller.examen_generator import ExamenGenerator
+from model.pregunta_dao import PreguntaDAO
+from model.sqlite_database import SQLiteConnection, importar_db_txt
 
 print('Iniciando prueba directa del ExamenGenerator...')
 
@@ -18,8 +20,13 @@ if not os.path.exists('Examenes'):
 else:
     print('El directorio Examenes ya existe')
 
+# Cargar db.txt en un banco SQLite para no depender de un servidor MySQL
+ruta_sqlite = os.path.join('Examenes', 'prueba_preguntas.sqlite')
+cantidad = importar_db_txt('db.txt', ruta_sqlite, reemplazar=True)
+print(f'Se importaron {cantidad} preguntas en {ruta_sqlite}')
+
 # Crear instancia del generador
-generador = ExamenGenerator()
+generador = ExamenGenerator(pregunta_dao=PreguntaDAO(SQLiteConnection(ruta_sqlite)))
 
 # Probar generación de Word directamente
 try:
@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Script de prueba que verifica que un lote repetido solo vuelve a generar los
+temas cuyas entradas cambiaron
+"""
+
+import os
+import time
+import tempfile
+from controller.examen_generator import ExamenGenerator
+from controller.progreso import TEMA_INICIADO
+from model.banco_preguntas import BancoPreguntas
+from model.pregunta import Pregunta
+from model.permutaciones_restringidas import Restricciones
+
+CANTIDAD_TEMAS = 6
+SEMILLA = 2024
+
+preguntas = [
+    Pregunta(id=i, enunciado=f'¿Cuánto es {i} + {i}?',
+             alternativas=[str(2 * i + k) for k in range(5)])
+    for i in range(1, 41)
+]
+
+directorio = tempfile.mkdtemp(prefix='examenes_')
+generador = ExamenGenerator(directorio)
+
+def generar(descripcion, **opciones):
+    # Generar el lote contando cuántos temas se volvieron a renderizar
+    iniciados = []
+    def al_progresar(evento):
+        if evento.tipo == TEMA_INICIADO:
+            iniciados.append(evento.numero_tema)
+    
+    inicio = time.perf_counter()
+    rutas = generador.generar_examenes(CANTIDAD_TEMAS, "pdf", recargar_banco=False,
+                                       al_progresar=al_progresar, **opciones)
+    print(f"{descripcion}: {len(iniciados)} temas generados, {len(rutas)} archivos "
+          f"({(time.perf_counter() - inicio) * 1000:.0f} ms)")
+    assert len(rutas) == CANTIDAD_TEMAS
+    return iniciados
+
+generador.banco = BancoPreguntas.desde_preguntas(preguntas)
+assert len(generar("Primer lote", semilla=SEMILLA)) == CANTIDAD_TEMAS
+assert generar("Mismo lote", semilla=SEMILLA) == []
+
+# Un archivo borrado se vuelve a generar
+os.remove(os.path.join(directorio, "Examen_Tema_C.pdf"))
+assert generar("Tema C borrado", semilla=SEMILLA) == [3]
+
+# Otra semilla o un cambio en el banco cambian las entradas de todos los temas
+assert len(generar("Otra semilla", semilla=SEMILLA + 1)) == CANTIDAD_TEMAS
+preguntas[0] = Pregunta(id=1, enunciado='¿Cuál es la suma de 1 y 1?', alternativas=['2', '3', '4', '5', '6'])
+generador.banco = BancoPreguntas.desde_preguntas(preguntas)
+assert len(generar("Banco corregido", semilla=SEMILLA + 1)) == CANTIDAD_TEMAS
+
+# Con restricciones entre temas las versiones cambian, y se repiten con la misma semilla
+restricciones = Restricciones(distancia_minima=0.3, coincidencias_maximas=0.2)
+assert len(generar("Temas restringidos", semilla=SEMILLA + 1, restricciones=restricciones)) == CANTIDAD_TEMAS
+assert generar("Mismos temas restringidos", semilla=SEMILLA + 1, restricciones=restricciones) == []
+
+# Sin modo incremental siempre se genera todo
+assert len(generar("Sin modo incremental", semilla=SEMILLA + 1, incremental=False)) == CANTIDAD_TEMAS
+
+print("\nPrueba completada.")
@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Script de prueba que compara las columnas repartidas por altura medida con las
+preguntas que fluyen de una columna a otra (PDF) o se dividen por cantidad (Word)
+"""
+
+import os
+import re
+import random
+from reportlab import rl_config
+from controller.examen_generator import ExamenGenerator
+from controller.maquetacion import Medida, alto_texto, dividir_en_dos
+from model.pregunta import Pregunta
+
+# Sin fechas ni identificadores aleatorios, para poder comparar los archivos
+rl_config.invariant = 1
+
+# Crear la carpeta de pruebas
+if not os.path.exists('Examenes'):
+    os.makedirs('Examenes')
+
+def banco(cantidad, semilla):
+    """
+    Genera un banco de prueba con enunciados de largo muy distinto, como los de física
+    """
+    azar = random.Random(semilla)
+    preguntas = []
+    for i in range(1, cantidad + 1):
+        repeticiones = azar.choice((1, 1, 2, 4, 8, 25))
+        enunciado = ' '.join(['Un bloque de masa m desciende por un plano inclinado sin rozamiento.'] * repeticiones)
+        preguntas.append(Pregunta(id=i, enunciado=f'{i}) {enunciado}',
+                                  alternativas=[f'{letra} ' * azar.randint(1, 30) for letra in 'VWXYZ']))
+    return preguntas
+
+def paginas(ruta):
+    """
+    Cuenta las páginas de un PDF generado por ReportLab
+    """
+    with open(ruta, 'rb') as archivo:
+        return len(re.findall(rb'/Type /Page\b(?!s)', archivo.read()))
+
+balanceado = ExamenGenerator(balancear_columnas=True)
+sin_balancear = ExamenGenerator(balancear_columnas=False)
+correcto = True
+
+print('PDF: páginas con las preguntas repartidas por altura y fluyendo')
+for cantidad, semilla in ((37, 1), (60, 2), (100, 3), (100, 4)):
+    preguntas = banco(cantidad, semilla)
+    ruta_balanceado = os.path.join('Examenes', 'Examen_Balanceado.pdf')
+    ruta_flujo = os.path.join('Examenes', 'Examen_Flujo.pdf')
+    if not (balanceado.generar_pdf(preguntas, ruta_balanceado, 'Tema A')
+            and sin_balancear.generar_pdf(preguntas, ruta_flujo, 'Tema A')):
+        raise RuntimeError('No se pudo generar el PDF de prueba')
+    
+    paginas_balanceado, paginas_flujo = paginas(ruta_balanceado), paginas(ruta_flujo)
+    print(f'{cantidad} preguntas: {paginas_balanceado} páginas repartidas, {paginas_flujo} fluyendo')
+    if paginas_balanceado > paginas_flujo:
+        print('Error: repartir las columnas por altura usa más páginas')
+        correcto = False
+
+# En Word, la primera mitad de las preguntas es mucho más larga que la segunda
+print('\nWord: alto estimado de cada columna')
+preguntas = sorted(banco(40, 5), key=lambda pregunta: -len(pregunta.enunciado))
+preguntas = [(pregunta, pregunta.alternativas) for pregunta in preguntas]
+altos = [Medida(0, alto_texto(pregunta.enunciado, 'Helvetica-Bold', 11, 240) + 60, 0)
+         for pregunta, _ in preguntas]
+
+def columnas(corte):
+    return sum(medida.alto for medida in altos[:corte]), sum(medida.alto for medida in altos[corte:])
+
+por_cantidad = columnas(sin_balancear._corte_word(preguntas))
+por_altura = columnas(balanceado._corte_word(preguntas))
+print(f'Por cantidad: {por_cantidad[0]:.0f} y {por_cantidad[1]:.0f} puntos')
+print(f'Por altura: {por_altura[0]:.0f} y {por_altura[1]:.0f} puntos '
+      f'(repartiendo estos altos: {max(columnas(dividir_en_dos(altos)[0])):.0f} la más alta)')
+if abs(por_altura[0] - por_altura[1]) >= abs(por_cantidad[0] - por_cantidad[1]):
+    print('Error: el Word no queda más parejo al dividirlo por altura')
+    correcto = False
+
+ruta_word = os.path.join('Examenes', 'Examen_Balanceado.docx')
+if not balanceado.generar_word(preguntas, ruta_word, 'Tema A'):
+    print('Error: no se pudo generar el Word balanceado')
+    correcto = False
+
+if correcto:
+    print('\nPrueba completada.')
@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Script de prueba que compara la memoria de la Pregunta anterior (con __dict__)
+frente a la Pregunta compacta e inmutable para un banco de 10 000 preguntas
+"""
+
+import gc
+import tracemalloc
+from model.pregunta import Pregunta
+
+CANTIDAD_PREGUNTAS = 10000
+
+class PreguntaAnterior:
+    """
+    Copia de la clase Pregunta original: siete atributos en un __dict__ por instancia
+    """
+    
+    def __init__(self, id=None, enunciado=None, alternativa_a=None, alternativa_b=None,
+                 alternativa_c=None, alternativa_d=None, alternativa_e=None):
+        self.id = id
+        self.enunciado = enunciado
+        self.alternativa_a = alternativa_a
+        self.alternativa_b = alternativa_b
+        self.alternativa_c = alternativa_c
+        self.alternativa_d = alternativa_d
+        self.alternativa_e = alternativa_e
+
+def medir(clase, filas):
+    """
+    Mide los bytes asignados al crear un objeto por fila
+    
+    Los textos se crean antes de medir y se comparten, de modo que solo se
+    cuenta el costo de la representación de cada pregunta.
+    """
+    gc.collect()
+    tracemalloc.start()
+    inicio, _ = tracemalloc.get_traced_memory()
+    banco = [clase(*fila) for fila in filas]
+    fin, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    
+    # Comprobar que ambas representaciones exponen los mismos datos
+    assert banco[-1].alternativa_e == filas[-1][6]
+    return fin - inicio
+
+print(f'Creando banco de {CANTIDAD_PREGUNTAS} preguntas...')
+filas = [
+    (i, f'Enunciado de la pregunta {i}', f'A{i}', f'B{i}', f'C{i}', f'D{i}', f'E{i}')
+    for i in range(CANTIDAD_PREGUNTAS)
+]
+
+bytes_anterior = medir(PreguntaAnterior, filas)
+bytes_compacta = medir(Pregunta, filas)
+
+print(f'Pregunta anterior (__dict__): {bytes_anterior} bytes '
+      f'({bytes_anterior / CANTIDAD_PREGUNTAS:.1f} bytes por pregunta)')
+print(f'Pregunta compacta (tupla): {bytes_compacta} bytes '
+      f'({bytes_compacta / CANTIDAD_PREGUNTAS:.1f} bytes por pregunta)')
+print(f'Ahorro: {100 * (1 - bytes_compacta / bytes_anterior):.1f}%')
+
+# La pregunta se compara por valor, como una tupla de sus ocho campos
+pregunta = Pregunta(*filas[0])
+assert pregunta == Pregunta(*filas[0]) and hash(pregunta) == hash(Pregunta(*filas[0]))
+assert pregunta != Pregunta(0, 'Otro enunciado', *filas[0][2:]) and len(pregunta) == 8
+
+if bytes_compacta >= bytes_anterior:
+    print('Error: la representación compacta no usa menos memoria')
+else:
+    print('\nPrueba completada.')
@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Script de prueba que compara el pico de memoria al generar un PDF con la lista
+completa de flowables frente al modo incremental, para bancos de distinto tamaño
+"""
+
+import os
+import tracemalloc
+from reportlab import rl_config
+from controller.examen_generator import ExamenGenerator
+from model.pregunta import Pregunta
+
+# Tamaño del banco menor; también se genera uno cuatro veces más grande
+CANTIDAD_PREGUNTAS = 300
+
+# El pico del modo incremental crece con el PDF escrito, no con los flowables:
+# al cuadruplicar el banco no debe crecer más que este factor
+FACTOR_MAXIMO_MEMORIA = 2.5
+
+# Sin fechas ni identificadores aleatorios, para poder comparar los archivos
+rl_config.invariant = 1
+
+# Crear la carpeta de pruebas
+if not os.path.exists('Examenes'):
+    os.makedirs('Examenes')
+
+def banco(cantidad):
+    """
+    Genera las preguntas de un banco de prueba sin guardarlas en una lista
+    """
+    for i in range(1, cantidad + 1):
+        yield Pregunta(id=i, enunciado=f'¿Enunciado de la pregunta número {i}?',
+                       alternativas=[f'Alternativa {letra} de la pregunta {i}' for letra in 'ABCDE'])
+
+def pico_memoria(generador, cantidad, ruta):
+    """
+    Devuelve el pico de memoria, en MB, de generar un PDF con el banco indicado
+    """
+    tracemalloc.start()
+    if not generador.generar_pdf(banco(cantidad), ruta, 'Tema A'):
+        raise RuntimeError('No se pudo generar el PDF de prueba')
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return pico / 1024 / 1024
+
+ruta_lista = os.path.join('Examenes', 'Examen_Lista.pdf')
+ruta_incremental = os.path.join('Examenes', 'Examen_Incremental.pdf')
+iguales = True
+picos_incremental = []
+
+for cantidad in (CANTIDAD_PREGUNTAS, 4 * CANTIDAD_PREGUNTAS):
+    # El modo incremental no balancea las columnas; se compara con el PDF que fluye igual
+    pico_lista = pico_memoria(ExamenGenerator(balancear_columnas=False), cantidad, ruta_lista)
+    pico_incremental = pico_memoria(ExamenGenerator(pdf_incremental=True), cantidad, ruta_incremental)
+    picos_incremental.append(pico_incremental)
+    print(f'{cantidad} preguntas: lista completa {pico_lista:.2f} MB, incremental {pico_incremental:.2f} MB')
+    
+    with open(ruta_lista, 'rb') as lista, open(ruta_incremental, 'rb') as incremental:
+        iguales = iguales and lista.read() == incremental.read()
+
+assert picos_incremental[1] < FACTOR_MAXIMO_MEMORIA * picos_incremental[0], (
+    f"El pico del modo incremental creció de {picos_incremental[0]:.2f} MB a "
+    f"{picos_incremental[1]:.2f} MB al cuadruplicar el banco")
+
+if not iguales:
+    print('Error: el modo incremental no genera el mismo PDF')
+else:
+    print('\nPrueba completada.')
@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Script de prueba que compara la generación de PDF maquetando la portada en cada
+tema frente a unir la portada precompilada, y verifica con pypdf (en modo
+estricto) que el PDF unido es válido
+"""
+
+import os
+import time
+from pypdf import PdfReader
+from controller.examen_generator import ExamenGenerator
+from controller.portada_pdf import obtener_plantilla_portada
+from model.pregunta import Pregunta
+
+CANTIDAD_VERSIONES = 10
+
+# Crear la carpeta de pruebas
+if not os.path.exists('Examenes'):
+    os.makedirs('Examenes')
+
+preguntas = [
+    Pregunta(id=i, enunciado=f'¿Enunciado de la pregunta número {i}?',
+             alternativas=[f'Alternativa {letra} de la pregunta {i}' for letra in 'ABCDE'])
+    for i in range(1, 101)
+]
+
+def medir(generador, ruta):
+    """
+    Devuelve el tiempo medio por versión y el tamaño del último PDF generado
+    """
+    # Calentar estilos, logo y plantilla antes de medir
+    generador.generar_pdf(preguntas, ruta, 'Tema A')
+    
+    inicio = time.perf_counter()
+    for i in range(CANTIDAD_VERSIONES):
+        if not generador.generar_pdf(preguntas, ruta, f'Tema {chr(65 + i)}'):
+            raise RuntimeError('No se pudo generar el PDF de prueba')
+    return (time.perf_counter() - inicio) / CANTIDAD_VERSIONES, os.path.getsize(ruta)
+
+ruta_normal = os.path.join('Examenes', 'Examen_Portada_Normal.pdf')
+ruta_precompilada = os.path.join('Examenes', 'Examen_Portada_Precompilada.pdf')
+
+tiempo_normal, bytes_normal = medir(ExamenGenerator(), ruta_normal)
+tiempo_precompilada, bytes_precompilada = medir(ExamenGenerator(portada_precompilada=True), ruta_precompilada)
+
+print(f'Portada maquetada en cada tema: {tiempo_normal * 1000:.1f} ms por versión ({bytes_normal} bytes)')
+print(f'Portada precompilada: {tiempo_precompilada * 1000:.1f} ms por versión ({bytes_precompilada} bytes)')
+print(f'Ahorro: {(tiempo_normal - tiempo_precompilada) * 1000:.1f} ms por versión')
+
+# El PDF unido debe abrirse con un lector estricto y tener las mismas páginas
+unido = PdfReader(ruta_precompilada, strict=True)
+assert len(unido.pages) == len(PdfReader(ruta_normal, strict=True).pages)
+assert 'TEMA: (J)' in unido.pages[0].extract_text(), "La portada unida no tiene la letra del tema"
+
+# Un PDF con otra estructura (aquí, uno que ya tiene una actualización incremental)
+# no se une a ciegas
+generador = ExamenGenerator(portada_precompilada=True)
+plantilla = obtener_plantilla_portada(generador)
+with open(ruta_precompilada, 'rb') as archivo:
+    datos = archivo.read()
+try:
+    plantilla.unir(datos, 'Tema K')
+except ValueError as e:
+    print(f'Estructura rechazada: {e}')
+else:
+    raise AssertionError("Se unió la portada a un PDF con una estructura no soportada")
+
+# Si la unión falla, el tema se maqueta completo con su portada
+def unir_fallida(datos, titulo_examen):
+    raise ValueError('estructura de prueba')
+
+plantilla.unir = unir_fallida
+assert generador.generar_pdf(preguntas, ruta_precompilada, 'Tema K')
+del plantilla.unir
+completo = PdfReader(ruta_precompilada, strict=True)
+assert len(completo.pages) == len(unido.pages)
+assert 'TEMA: (K)' in completo.pages[0].extract_text()
+
+print('\nPrueba completada.')
@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Script de prueba que mide cuánto ahorra por versión decodificar el logo una sola
+vez por proceso al generar varios temas en PDF, y verifica que los PDF no cambian
+"""
+
+import os
+import time
+import statistics
+from reportlab import rl_config
+from controller.examen_generator import ExamenGenerator
+from controller.recursos_render import reiniciar_recursos, obtener_logo
+from model.pregunta import Pregunta
+
+CANTIDAD_VERSIONES = 20
+
+# Sin fecha de creación ni identificadores al azar, para comparar los archivos
+rl_config.invariant = 1
+
+# Crear la carpeta de pruebas
+if not os.path.exists('Examenes'):
+    os.makedirs('Examenes')
+
+generador = ExamenGenerator()
+preguntas = [
+    Pregunta(id=i, enunciado=f'¿Enunciado de la pregunta número {i}?',
+             alternativas=[f'Alternativa {letra} de la pregunta {i}' for letra in 'ABCDE'])
+    for i in range(1, 101)
+]
+ruta = os.path.join('Examenes', 'Examen_Recursos.pdf')
+
+def generar(con_cache):
+    """
+    Devuelve lo que tarda en generarse un PDF y su contenido
+    """
+    if not con_cache:
+        # Obligar a decodificar el logo otra vez, como antes; las cachés de
+        # párrafos y alturas se conservan para medir solo el logo
+        reiniciar_recursos()
+    inicio = time.perf_counter()
+    if not generador.generar_pdf(preguntas, ruta, 'Tema A'):
+        raise RuntimeError('No se pudo generar el PDF de prueba')
+    tiempo = time.perf_counter() - inicio
+    with open(ruta, 'rb') as archivo:
+        return tiempo, archivo.read()
+
+# Calentar las importaciones, las fuentes y las cachés de párrafos antes de medir
+generador.generar_pdf(preguntas, ruta, 'Tema A')
+
+# El logo se decodifica una sola vez y se comparte entre documentos
+assert obtener_logo() is obtener_logo()
+
+# Alternar ambos casos para que el ruido del equipo los afecte por igual
+tiempos = {False: [], True: []}
+contenidos = {False: set(), True: set()}
+for _ in range(CANTIDAD_VERSIONES):
+    for con_cache in (False, True):
+        tiempo, contenido = generar(con_cache)
+        tiempos[con_cache].append(tiempo)
+        contenidos[con_cache].add(contenido)
+assert len(contenidos[True]) == 1 and contenidos[True] == contenidos[False], "El PDF cambió con el logo en caché"
+
+sin_cache = statistics.median(tiempos[False])
+con_cache = statistics.median(tiempos[True])
+
+print(f'Logo decodificado en cada tema: {sin_cache * 1000:.1f} ms por versión (mediana)')
+print(f'Logo decodificado una vez: {con_cache * 1000:.1f} ms por versión (mediana)')
+print(f'Ahorro: {(sin_cache - con_cache) * 1000:.1f} ms por versión '
+      f'({100 * (1 - con_cache / sin_cache):.1f}%)')
+
+print('\nPrueba completada.')
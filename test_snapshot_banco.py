@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Script de prueba que exporta un banco de 50 000 preguntas a un archivo binario
+y mide el tiempo de abrirlo con mmap frente a reconstruirlo desde una lista
+"""
+
+import os
+import time
+import mmap
+import pickle
+from model.pregunta import Pregunta
+from model.snapshot_banco import SnapshotBanco, exportar_snapshot
+from model.banco_preguntas import BancoPreguntas
+
+CANTIDAD_PREGUNTAS = 50000
+
+# Crear la carpeta de pruebas
+if not os.path.exists('Examenes'):
+    os.makedirs('Examenes')
+
+ruta = os.path.join('Examenes', 'banco_prueba.bin')
+
+print(f'Creando banco de {CANTIDAD_PREGUNTAS} preguntas...')
+preguntas = [
+    Pregunta(id=i, enunciado=f'¿Enunciado de la pregunta número {i}?',
+             alternativas=[f'Alternativa {letra} de la pregunta {i}' for letra in 'ABCDE'])
+    for i in range(1, CANTIDAD_PREGUNTAS + 1)
+]
+
+inicio = time.perf_counter()
+exportar_snapshot(preguntas, ruta)
+print(f'Exportación: {time.perf_counter() - inicio:.3f} s '
+      f'({os.path.getsize(ruta) / 1024 / 1024:.1f} MB)')
+
+inicio = time.perf_counter()
+banco = SnapshotBanco(ruta)
+print(f'Apertura con mmap: {(time.perf_counter() - inicio) * 1000:.2f} ms')
+
+# Referencia: lo que recibe cada proceso si se le envía el banco completo
+copia = pickle.dumps(preguntas)
+inicio = time.perf_counter()
+pickle.loads(copia)
+print(f'Copia con pickle: {(time.perf_counter() - inicio) * 1000:.2f} ms '
+      f'({len(copia) / 1024 / 1024:.1f} MB por proceso)')
+print(f'SnapshotBanco con pickle: {len(pickle.dumps(banco))} bytes por proceso')
+
+# Comprobar que el archivo reproduce exactamente las preguntas
+errores = [i for i in (0, 1, CANTIDAD_PREGUNTAS // 2, -1) if banco[i] != preguntas[i]]
+if len(banco) != len(preguntas) or errores:
+    print(f'Error: el banco leído no coincide en las posiciones {errores}')
+    raise SystemExit(1)
+banco.cerrar()
+
+# Al refrescar el banco se libera el mapeo anterior
+banco_preguntas = BancoPreguntas(ruta_snapshot=ruta)
+anterior = banco_preguntas.preguntas
+banco_preguntas.refrescar()
+assert anterior._mapa.closed, "El mapeo anterior quedó abierto"
+
+# Si el archivo se reemplaza durante el lote, un proceso que lo vuelve a abrir lo rechaza
+enviado = pickle.dumps(banco_preguntas.preguntas)
+exportar_snapshot(preguntas[:10], ruta)
+try:
+    pickle.loads(enviado)
+except ValueError as e:
+    print(f'Archivo reemplazado: {e}')
+else:
+    raise AssertionError("Se abrió un banco distinto al del proceso principal")
+banco_preguntas.preguntas.cerrar()
+assert pickle.loads(pickle.dumps(SnapshotBanco(ruta)))[9] == preguntas[9]
+
+# Un archivo rechazado (otra huella o que no es un banco) no queda mapeado
+mapas = []
+mmap_original = mmap.mmap
+
+def mmap_registrado(*args, **kwargs):
+    mapa = mmap_original(*args, **kwargs)
+    mapas.append(mapa)
+    return mapa
+
+mmap.mmap = mmap_registrado
+ruta_invalida = os.path.join('Examenes', 'banco_invalido.bin')
+with open(ruta_invalida, 'wb') as archivo:
+    archivo.write(b'No es un banco de preguntas')
+for argumentos in ((ruta, 'otra huella'), (ruta_invalida,)):
+    try:
+        SnapshotBanco(*argumentos)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError(f"Se aceptó el archivo {argumentos}")
+mmap.mmap = mmap_original
+assert len(mapas) == 2 and all(mapa.closed for mapa in mapas), "Un archivo rechazado quedó mapeado"
+
+print('\nPrueba completada.')
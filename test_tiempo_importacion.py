@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Script de prueba que mide con -X importtime el arranque en frío del generador
+y falla si supera el presupuesto o si carga backends pesados antes de usarlos
+"""
+
+import sys
+import statistics
+import subprocess
+
+# Tiempo máximo de importación, en milisegundos (antes de la carga diferida: ~370 ms)
+PRESUPUESTO_MS = 150
+
+# Repeticiones de cada medición; se usa la mediana
+REPETICIONES = 5
+
+# Módulos que solo deben cargarse al generar un PDF o un Word o al consultar MySQL
+MODULOS_PESADOS = ('reportlab', 'docx', 'mysql', 'numpy', 'PIL', 'tkinter', 'lxml')
+
+# Módulos de entrada sin interfaz gráfica
+MODULOS_ENTRADA = ('controller.examen_generator', 'controller.cli')
+
+def medir_importacion(modulo):
+    """
+    Importa un módulo en un intérprete nuevo
+    
+    Returns:
+        tuple: (tiempo acumulado en ms, nombres de los paquetes cargados)
+    """
+    resultado = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {modulo}'],
+        capture_output=True, text=True, check=True
+    )
+    
+    tiempo = 0
+    paquetes = set()
+    for linea in resultado.stderr.splitlines():
+        if not linea.startswith('import time:') or 'cumulative' in linea:
+            continue
+        _, acumulado, nombre = linea[len('import time:'):].split('|')
+        nombre = nombre.strip()
+        paquetes.add(nombre.split('.')[0])
+        if nombre == modulo:
+            tiempo = int(acumulado) / 1000
+    
+    return tiempo, paquetes
+
+fallos = []
+
+for modulo in MODULOS_ENTRADA:
+    mediciones = [medir_importacion(modulo) for _ in range(REPETICIONES)]
+    tiempo = statistics.median(medicion[0] for medicion in mediciones)
+    cargados = sorted(set(MODULOS_PESADOS) & mediciones[0][1])
+    
+    print(f'{modulo}: {tiempo:.1f} ms (presupuesto {PRESUPUESTO_MS} ms)')
+    if tiempo > PRESUPUESTO_MS:
+        fallos.append(f'{modulo} tarda {tiempo:.1f} ms en importarse')
+    if cargados:
+        fallos.append(f'{modulo} carga al importarse: {", ".join(cargados)}')
+
+if fallos:
+    for fallo in fallos:
+        print(f'Error: {fallo}')
+    sys.exit(1)
+
+print('\nPrueba completada.')
@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Script de prueba que verifica las distancias garantizadas entre los temas de un
+lote restringido y mide cuánto tarda en armarse
+"""
+
+import time
+import numpy as np
+from model.permutaciones import MotorPermutaciones
+from model.permutaciones_restringidas import (MotorRestringido, Restricciones, distancia_kendall,
+                                              coincidencias_alternativas)
+
+TEMAS = 100
+PREGUNTAS = 1000
+
+def peor_par(ordenes_preguntas, ordenes_alternativas):
+    """
+    Devuelve la menor distancia de Kendall y la mayor fracción de coincidencias entre pares de temas
+    """
+    temas, cantidad = ordenes_preguntas.shape
+    distancias = [distancia_kendall(ordenes_preguntas[i], ordenes_preguntas[j])
+                  for i in range(temas) for j in range(i)]
+    coincidencias = coincidencias_alternativas(ordenes_alternativas)
+    np.fill_diagonal(coincidencias, 0)
+    return min(distancias), coincidencias.max() / cantidad
+
+inicio = time.perf_counter()
+motor = MotorRestringido(2024, TEMAS, Restricciones(distancia_minima=0.3, coincidencias_maximas=0.2))
+ordenes_preguntas, ordenes_alternativas = motor.permutaciones_lote(TEMAS, PREGUNTAS)
+segundos = time.perf_counter() - inicio
+# El tiempo solo se informa; depende del equipo y no decide si la prueba pasa
+print(f"Lote restringido: {TEMAS} temas x {PREGUNTAS} preguntas en {segundos:.3f} s")
+
+# Todo son permutaciones válidas
+assert (np.sort(ordenes_preguntas, axis=1) == np.arange(PREGUNTAS)).all()
+assert (np.sort(ordenes_alternativas, axis=2) == np.arange(5)).all()
+
+# Las coincidencias de todos los pares, y la distancia de una muestra de temas
+coincidencias = coincidencias_alternativas(ordenes_alternativas)
+np.fill_diagonal(coincidencias, 0)
+muestra = np.random.default_rng(1).choice(TEMAS, 25, replace=False)
+distancia, _ = peor_par(ordenes_preguntas[muestra], ordenes_alternativas[muestra])
+print(f"Peor par: distancia {distancia:.3f}, respuestas en la misma letra {coincidencias.max() / PREGUNTAS:.1%}")
+assert distancia >= 0.3
+assert coincidencias.max() <= 0.2 * PREGUNTAS
+
+# Comparado con barajar cada tema por separado, en un lote más chico revisado por completo
+for nombre, motor in (("Por separado", MotorPermutaciones(2024)),
+                      ("Restringido", MotorRestringido(2024, 40, Restricciones(distancia_minima=0.4)))):
+    distancia, coincidencia = peor_par(*motor.permutaciones_lote(40, 60))
+    print(f"{nombre}, 40 temas x 60 preguntas: distancia {distancia:.3f}, "
+          f"respuestas en la misma letra {coincidencia:.1%}")
+assert distancia >= 0.4 and coincidencia < 0.25
+
+# Con pocos temas ninguna alternativa queda en la misma letra
+_, coincidencia = peor_par(*MotorRestringido(5, 5).permutaciones_lote(5, 30))
+assert coincidencia == 0
+
+# El lote es reproducible y cada tema se puede pedir por separado
+otro = MotorRestringido(2024, TEMAS, Restricciones(distancia_minima=0.3, coincidencias_maximas=0.2))
+orden_preguntas, orden_alternativas = otro.permutacion_tema(37, PREGUNTAS)
+assert (orden_preguntas == ordenes_preguntas[36]).all()
+assert (orden_alternativas == ordenes_alternativas[36]).all()
+
+# Restricciones imposibles
+for restricciones, temas, cantidad in ((Restricciones(coincidencias_maximas=0.1), 100, 50),
+                                       (Restricciones(distancia_minima=0.8), 10, 20)):
+    try:
+        MotorRestringido(1, temas, restricciones).permutaciones_lote(1, cantidad)
+    except ValueError as e:
+        print(f"Error esperado: {e}")
+    else:
+        raise AssertionError("Se esperaba un error con restricciones imposibles")
+
+print("\nPrueba completada.")
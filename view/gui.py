@@ -8,17 +8,34 @@ Módulo para la interfaz gráfica del generador de exámenes
 import os
 import tkinter as tk
 from tkinter import ttk, messagebox
-import threading
+import queue
 import subprocess
 from PIL import Image, ImageTk
 from controller.examen_generator import ExamenGenerator
+from controller.gestor_trabajos import GestorTrabajos, TERMINADO, CANCELADO
+from controller.progreso import (
+    EventoProgreso, TEMA_INICIADO, PAGINAS_MAQUETADAS, BYTES_ESCRITOS, TEMA_TERMINADO
+)
+
+# Milisegundos entre actualizaciones de la pantalla de carga durante la generación
+INTERVALO_ACTUALIZACION = 100
+
+# Carpeta de las claves de respuestas, separada de la de exámenes que se reparte
+DIRECTORIO_CLAVES = "Claves"
 
 class ExamenGeneratorGUI(tk.Tk):
     """
     Clase para la interfaz gráfica del generador de exámenes
     """
     
-    def __init__(self):
+    def __init__(self, examen_generator=None):
+        """
+        Constructor de la clase ExamenGeneratorGUI
+        
+        Args:
+            examen_generator (ExamenGenerator): Generador ya preparado por la pantalla
+                de carga; si se omite se crea uno nuevo
+        """
         super().__init__()
         
         # Configurar la ventana principal
@@ -50,7 +67,13 @@ class ExamenGeneratorGUI(tk.Tk):
                            darkcolor='#FF0000')
         
         # Inicializar el controlador
-        self.examen_generator = ExamenGenerator()
+        self.examen_generator = examen_generator if examen_generator is not None else ExamenGenerator()
+        self.gestor_trabajos = GestorTrabajos(self.examen_generator)
+        self.trabajo_actual = None
+        
+        # El primer lote usa el banco que dejó cargado la pantalla de carga
+        banco = self.examen_generator.banco
+        self._banco_precargado = banco.cargado and len(banco) > 0
         
         # Crear los componentes de la interfaz
         self._crear_componentes()
@@ -147,6 +170,18 @@ class ExamenGeneratorGUI(tk.Tk):
         vcmd = (self.register(validate_input), '%P')
         self.temas_spinner.configure(validate='key', validatecommand=vcmd)
         
+        # Las claves solo se exportan si se piden, en su propia carpeta
+        self.exportar_claves_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(
+            content_frame,
+            text=f"Exportar claves de respuestas (carpeta '{DIRECTORIO_CLAVES}')",
+            variable=self.exportar_claves_var,
+            font=("Arial", 12),
+            fg="#333333",
+            bg='#fcf3ea',
+            activebackground='#fcf3ea'
+        ).pack(pady=(10, 0))
+        
         # Botones con efectos hover y estilo mejorado
         button_frame = tk.Frame(content_frame, bg='#fcf3ea')
         button_frame.pack(pady=30)
@@ -300,7 +335,7 @@ class ExamenGeneratorGUI(tk.Tk):
         # Crear ventana de carga
         self.loading_window = tk.Toplevel(self)
         self.loading_window.title("Generando Exámenes")
-        self.loading_window.geometry("500x300")
+        self.loading_window.geometry("500x360")
         self.loading_window.resizable(False, False)
         self.loading_window.transient(self)  # Hacer que sea una ventana hija
         self.loading_window.grab_set()  # Bloquear interacción con ventana principal
@@ -366,6 +401,37 @@ class ExamenGeneratorGUI(tk.Tk):
             bg='#fcf3ea'
         )
         self.loading_dots_label.pack(pady=10)
+        
+        # Botones para pausar o cancelar el lote
+        botones_frame = tk.Frame(self.loading_window, bg='#fcf3ea')
+        botones_frame.pack(pady=5)
+        
+        self.pausar_button = tk.Button(
+            botones_frame,
+            text="PAUSAR",
+            command=self._pausar_generacion,
+            font=("Arial", 11, "bold"),
+            bg="#666666",
+            fg="white",
+            relief=tk.FLAT,
+            width=12
+        )
+        self.pausar_button.pack(side=tk.LEFT, padx=10)
+        
+        self.cancelar_button = tk.Button(
+            botones_frame,
+            text="CANCELAR",
+            command=self._cancelar_generacion,
+            font=("Arial", 11, "bold"),
+            bg="#FF0000",
+            fg="white",
+            relief=tk.FLAT,
+            width=12
+        )
+        self.cancelar_button.pack(side=tk.LEFT, padx=10)
+        
+        # Cerrar la ventana equivale a cancelar
+        self.loading_window.protocol("WM_DELETE_WINDOW", self._cancelar_generacion)
         self._animar_puntos()
     
     def _animar_puntos(self):
@@ -403,6 +469,26 @@ class ExamenGeneratorGUI(tk.Tk):
         """
         Genera los exámenes en formato PDF según la cantidad de temas especificada
         """
+        self._generar_examenes("pdf", "PDF")
+        
+    def _generar_examenes_word(self):
+        """
+        Genera los exámenes en formato Word según la cantidad de temas especificada
+        """
+        self._generar_examenes("word", "Word")
+    
+    def _generar_examenes(self, formato, nombre_formato):
+        """
+        Genera los exámenes en un hilo aparte mostrando su avance real
+        
+        El hilo de generación solo deja los eventos de avance en una cola; la
+        interfaz la revisa cada INTERVALO_ACTUALIZACION milisegundos y muestra
+        el estado más reciente.
+        
+        Args:
+            formato (str): Formato de los exámenes ("pdf" o "word")
+            nombre_formato (str): Nombre del formato para los mensajes
+        """
         # Obtener la cantidad de temas
         cantidad_temas = self.temas_var.get()
         
@@ -413,113 +499,150 @@ class ExamenGeneratorGUI(tk.Tk):
         
         # Reiniciar barra de progreso
         self.progreso_var.set(0)
-        self.estado_var.set("Generando exámenes en PDF...")
+        self.estado_var.set(f"Generando exámenes en {nombre_formato}...")
         
         # Mostrar pantalla de carga
         self._crear_pantalla_carga()
+        self._actualizar_pantalla_carga(
+            f"Iniciando generación de exámenes en {nombre_formato}...", 0, 0)
+        
+        # Avance del lote según los eventos recibidos
+        self.eventos_generacion = queue.Queue()
+        self.avance_generacion = {
+            'total': cantidad_temas,
+            'terminados': 0,
+            'paginas': {},            # Páginas maquetadas de cada tema en curso
+            'paginas_por_tema': None,  # Páginas de un tema ya terminado
+            'mensaje': f"Generando exámenes en {nombre_formato}..."
+        }
+        
+        def al_terminar(trabajo):
+            # Se llama desde el hilo del gestor: solo dejar el resultado en la cola
+            if trabajo.estado == TERMINADO:
+                self.eventos_generacion.put(("FIN", trabajo.rutas))
+            elif trabajo.estado == CANCELADO:
+                self.eventos_generacion.put(("CANCELADO", None))
+            else:
+                self.eventos_generacion.put(("ERROR", str(trabajo.error)))
+        
+        # Generar los exámenes en segundo plano, un proceso por núcleo
+        self.trabajo_actual = self.gestor_trabajos.enviar(
+            cantidad_temas, formato,
+            al_progresar=self.eventos_generacion.put,
+            al_terminar=al_terminar,
+            procesos=None,
+            recargar_banco=self._recargar_banco(),
+            ruta_claves=os.path.join(DIRECTORIO_CLAVES, "Claves.csv") if self.exportar_claves_var.get() else None
+        )
+        self.after(INTERVALO_ACTUALIZACION, lambda: self._procesar_eventos(nombre_formato))
+    
+    def _procesar_eventos(self, nombre_formato):
+        """
+        Aplica los eventos de avance pendientes y actualiza la pantalla una sola vez
         
-        # Crear un hilo para generar los exámenes sin bloquear la interfaz
-        def generar_en_hilo():
-            try:
-                # Generar exámenes con actualización de progreso
-                temas_completados = 0
-                
-                # Actualizar mensaje inicial
-                self.after(0, lambda: self._actualizar_pantalla_carga(
-                    "Iniciando generación de exámenes en PDF...", 5, temas_completados))
-                
-                # Simular progreso de carga inicial (preparación)
-                for i in range(1, 6):
-                    self.after(i * 200, lambda p=i*4: self._actualizar_pantalla_carga(
-                        "Preparando datos...", p, temas_completados))
-                
-                # Generar exámenes
-                rutas_archivos = []
-                for i in range(cantidad_temas):
-                    # Actualizar progreso
-                    progreso = 20 + (i / cantidad_temas) * 80
-                    temas_completados = i
-                    self.after(0, lambda p=progreso, t=temas_completados, i=i+1: 
-                              self._actualizar_pantalla_carga(f"Generando tema {i} en PDF...", p, t))
-                    
-                    # Generar un tema en PDF
-                    ruta = self.examen_generator.generar_examen_pdf(i+1)
-                    rutas_archivos.append(ruta)
-                
-                # Actualizar progreso final
-                self.after(0, lambda: self._actualizar_pantalla_carga(
-                    "¡Exámenes en PDF generados correctamente!", 100, cantidad_temas))
+        Args:
+            nombre_formato (str): Nombre del formato para los mensajes
+        """
+        avance = self.avance_generacion
+        try:
+            while True:
+                evento = self.eventos_generacion.get_nowait()
                 
-                # Pequeña pausa para mostrar el mensaje de finalización
-                self.after(1500, lambda: self._mostrar_resultado(rutas_archivos))
+                if not isinstance(evento, EventoProgreso):
+                    # Fin del lote: mostrar el resultado sin esperas adicionales
+                    tipo, dato = evento
+                    self.trabajo_actual = None
+                    if tipo == "FIN":
+                        self._actualizar_pantalla_carga(
+                            f"¡Exámenes en {nombre_formato} generados correctamente!", 100, avance['total'])
+                        self._mostrar_resultado(dato)
+                    elif tipo == "CANCELADO":
+                        self._mostrar_cancelacion()
+                    else:
+                        self._mostrar_error(dato)
+                    return
                 
-            except Exception as e:
-                # Mostrar error en el hilo principal
-                self.after(0, lambda: self._mostrar_error(str(e)))
-        
-        # Iniciar el hilo
-        threading.Thread(target=generar_en_hilo).start()
+                self._registrar_evento(evento)
+        except queue.Empty:
+            pass
+        
+        # Los temas en curso cuentan según las páginas que ya tienen maquetadas
+        completado = avance['terminados']
+        if avance['paginas_por_tema']:
+            for paginas in avance['paginas'].values():
+                completado += min(paginas / avance['paginas_por_tema'], 0.99)
+        
+        self._actualizar_pantalla_carga(
+            avance['mensaje'], completado / avance['total'] * 100, avance['terminados'])
+        self.after(INTERVALO_ACTUALIZACION, lambda: self._procesar_eventos(nombre_formato))
+    
+    def _registrar_evento(self, evento):
+        """
+        Actualiza el avance del lote con un evento de ExamenGenerator
         
-    def _generar_examenes_word(self):
+        Args:
+            evento (EventoProgreso): Evento recibido
         """
-        Genera los exámenes en formato Word según la cantidad de temas especificada
+        avance = self.avance_generacion
+        letra = chr(64 + evento.numero_tema)  # 65 es el código ASCII de 'A'
+        
+        if evento.tipo == TEMA_INICIADO:
+            avance['paginas'][evento.numero_tema] = 0
+            avance['mensaje'] = f"Generando tema {letra}..."
+        elif evento.tipo == PAGINAS_MAQUETADAS:
+            avance['paginas'][evento.numero_tema] = evento.valor
+            avance['mensaje'] = f"Tema {letra}: página {evento.valor} maquetada"
+        elif evento.tipo == BYTES_ESCRITOS:
+            avance['mensaje'] = f"Tema {letra}: {evento.valor / 1024:.0f} KB escritos"
+        elif evento.tipo == TEMA_TERMINADO:
+            paginas = avance['paginas'].pop(evento.numero_tema, 0)
+            if paginas:
+                avance['paginas_por_tema'] = paginas
+            avance['terminados'] += 1
+            if evento.valor is None:
+                avance['mensaje'] = f"No se pudo generar el tema {letra}"
+    
+    def _pausar_generacion(self):
         """
-        # Obtener la cantidad de temas
-        cantidad_temas = self.temas_var.get()
+        Pausa o reanuda el lote en curso; los temas que ya empezaron se terminan
+        """
+        trabajo = self.trabajo_actual
+        if trabajo is None:
+            return
         
-        # Deshabilitar botones durante la generación
-        self.generar_pdf_button.config(state=tk.DISABLED)
-        self.generar_word_button.config(state=tk.DISABLED)
-        self.ver_button.config(state=tk.DISABLED)
+        if trabajo.control.pausado:
+            self.gestor_trabajos.reanudar(trabajo.id)
+            self.pausar_button.config(text="PAUSAR")
+            self.avance_generacion['mensaje'] = "Reanudando generación..."
+        elif self.gestor_trabajos.pausar(trabajo.id):
+            self.pausar_button.config(text="REANUDAR")
+            self.avance_generacion['mensaje'] = "Pausado: terminando los temas en curso..."
+    
+    def _cancelar_generacion(self):
+        """
+        Cancela el lote en curso; se borran los exámenes que alcanzó a generar
+        """
+        trabajo = self.trabajo_actual
+        if trabajo is None or not self.gestor_trabajos.cancelar(trabajo.id):
+            return
         
-        # Reiniciar barra de progreso
-        self.progreso_var.set(0)
-        self.estado_var.set("Generando exámenes en Word...")
+        self.pausar_button.config(state=tk.DISABLED)
+        self.cancelar_button.config(state=tk.DISABLED)
+        self.avance_generacion['mensaje'] = "Cancelando: terminando los temas en curso..."
+    
+    def _recargar_banco(self):
+        """
+        Indica si el lote debe volver a leer el banco de preguntas
         
-        # Mostrar pantalla de carga
-        self._crear_pantalla_carga()
+        Solo el primer lote reutiliza el banco precargado; los siguientes lo
+        vuelven a leer para incluir los cambios de la base de datos.
         
-        # Crear un hilo para generar los exámenes sin bloquear la interfaz
-        def generar_en_hilo():
-            try:
-                # Generar exámenes con actualización de progreso
-                temas_completados = 0
-                
-                # Actualizar mensaje inicial
-                self.after(0, lambda: self._actualizar_pantalla_carga(
-                    "Iniciando generación de exámenes en Word...", 5, temas_completados))
-                
-                # Simular progreso de carga inicial (preparación)
-                for i in range(1, 6):
-                    self.after(i * 200, lambda p=i*4: self._actualizar_pantalla_carga(
-                        "Preparando datos...", p, temas_completados))
-                
-                # Generar exámenes
-                rutas_archivos = []
-                for i in range(cantidad_temas):
-                    # Actualizar progreso
-                    progreso = 20 + (i / cantidad_temas) * 80
-                    temas_completados = i
-                    self.after(0, lambda p=progreso, t=temas_completados, i=i+1: 
-                              self._actualizar_pantalla_carga(f"Generando tema {i} en Word...", p, t))
-                    
-                    # Generar un tema en Word
-                    ruta = self.examen_generator.generar_examen_word(i+1)
-                    rutas_archivos.append(ruta)
-                
-                # Actualizar progreso final
-                self.after(0, lambda: self._actualizar_pantalla_carga(
-                    "¡Exámenes en Word generados correctamente!", 100, cantidad_temas))
-                
-                # Pequeña pausa para mostrar el mensaje de finalización
-                self.after(1500, lambda: self._mostrar_resultado(rutas_archivos))
-                
-            except Exception as e:
-                # Mostrar error en el hilo principal
-                self.after(0, lambda: self._mostrar_error(str(e)))
-        
-        # Iniciar el hilo
-        threading.Thread(target=generar_en_hilo).start()
+        Returns:
+            bool: True si hay que recargar el banco
+        """
+        recargar = not self._banco_precargado
+        self._banco_precargado = False
+        return recargar
     
     def _mostrar_resultado(self, rutas_archivos):
         """
@@ -543,9 +666,30 @@ class ExamenGeneratorGUI(tk.Tk):
         # Mostrar mensaje de éxito
         mensaje = f"Se han generado {len(rutas_archivos)} exámenes correctamente.\n\n"
         mensaje += "Los archivos se encuentran en la carpeta 'Examenes'."
+        ruta_claves = self.examen_generator.ruta_claves_exportadas
+        if ruta_claves:
+            mensaje += f"\n\nLas claves de respuestas de todos los temas están en '{ruta_claves}'."
+        elif self.exportar_claves_var.get():
+            mensaje += "\n\nNo se exportaron claves: ninguna pregunta del banco tiene alternativa correcta."
         
         messagebox.showinfo("Generación Exitosa", mensaje)
     
+    def _mostrar_cancelacion(self):
+        """
+        Vuelve a habilitar la interfaz después de cancelar un lote
+        """
+        # Cerrar pantalla de carga
+        self._cerrar_pantalla_carga()
+        
+        # Actualizar estado
+        self.progreso_var.set(0)
+        self.estado_var.set("Generación cancelada")
+        
+        # Habilitar botones
+        self.generar_pdf_button.config(state=tk.NORMAL)
+        self.generar_word_button.config(state=tk.NORMAL)
+        self.ver_button.config(state=tk.NORMAL)
+    
     def _mostrar_error(self, mensaje_error):
         """
         Muestra un mensaje de error
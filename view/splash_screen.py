@@ -6,20 +6,31 @@ Módulo para la pantalla de carga inicial del generador de exámenes
 """
 
 import os
-import time
 import threading
 import queue
 import tkinter as tk
 from tkinter import ttk
 from PIL import Image, ImageTk
+from controller.precarga import precargar
 
 class SplashScreen(tk.Toplevel):
     """
     Clase para la pantalla de carga inicial
+    
+    Mientras se muestra, prepara el generador (banco de preguntas, bibliotecas,
+    estilos y plantillas) y se cierra apenas termina.
     """
     
-    def __init__(self, parent):
+    def __init__(self, parent, examen_generator):
+        """
+        Constructor de la clase SplashScreen
+        
+        Args:
+            parent (tk.Tk): Ventana raíz
+            examen_generator (ExamenGenerator): Generador que se prepara durante la carga
+        """
         super().__init__(parent)
+        self.examen_generator = examen_generator
         
         # Configurar la ventana de carga
         self.title("Iniciando Generador de Exámenes")
@@ -39,11 +50,11 @@ class SplashScreen(tk.Toplevel):
         # Crear los componentes
         self._crear_componentes()
         
-        # Iniciar proceso de carga
-        self.after(100, self._iniciar_carga)
+        # Iniciar la carga apenas se dibuje la ventana
+        self.after_idle(self._iniciar_carga)
         
         # Iniciar procesamiento de la cola
-        self.after(100, self._procesar_cola)
+        self.after(50, self._procesar_cola)
     
     def _centrar_ventana(self):
         """
@@ -149,30 +160,17 @@ class SplashScreen(tk.Toplevel):
     
     def _iniciar_carga(self):
         """
-        Inicia el proceso de carga simulado
+        Inicia la precarga real del generador en un hilo aparte
         """
-        def simular_carga():
-            # Simular carga de recursos
-            self.queue.put(("Conectando a la base de datos...", 10))
-            time.sleep(0.5)
-            
-            self.queue.put(("Cargando banco de preguntas...", 30))
-            time.sleep(0.8)
-            
-            self.queue.put(("Inicializando generador de exámenes...", 60))
-            time.sleep(0.7)
-            
-            self.queue.put(("Preparando interfaz gráfica...", 80))
-            time.sleep(0.6)
-            
-            self.queue.put(("¡Listo para comenzar!", 100))
-            time.sleep(0.5)
+        def cargar():
+            # Cada paso informa al terminar; todos corren a la vez
+            precargar(self.examen_generator, lambda mensaje, progreso: self.queue.put((mensaje, progreso)))
             
             # Señal para cerrar la ventana
             self.queue.put(("CLOSE", None))
         
         # Iniciar hilo de carga
-        threading.Thread(target=simular_carga, daemon=True).start()
+        threading.Thread(target=cargar, daemon=True).start()
     
     def _actualizar_carga(self, mensaje, progreso):
         """
@@ -202,4 +200,4 @@ class SplashScreen(tk.Toplevel):
         except queue.Empty:
             # Si la cola está vacía, programar la próxima verificación
             if self.winfo_exists():
-                self.after(100, self._procesar_cola)
\ No newline at end of file
+                self.after(50, self._procesar_cola)
\ No newline at end of file